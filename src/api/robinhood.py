@@ -1,8 +1,10 @@
 import os
 from dotenv import load_dotenv
 from src.api.trading_utils import error, debug
+from src.blocking_calls import BlockingCallRunner
+from src.market_data import BarCache
 from my_robin_stocks_extensions.robin_stocks import robinhood as r
-from typing import Optional
+from typing import Dict, List, Optional
 
 load_dotenv()
 
@@ -65,15 +67,28 @@ async def get_account_info() -> dict:
     return await client.get_account_info()
 
 class RobinhoodClient:
-    def __init__(self):
+    def __init__(self, max_workers: int = 4, timeout: float = 30.0, bar_cache: Optional[BarCache] = None):
+        """
+        Args:
+            max_workers: Threads running blocking robin_stocks calls
+            timeout: Seconds before a robin_stocks call is abandoned
+            bar_cache: Historical bars kept across calls (in memory if None)
+        """
         self.email = os.getenv('EMAIL')
         self.password = os.getenv('PASSWORD')
         self.session = None
+        # robin_stocks is synchronous; its calls run here instead of on the event loop
+        self.calls = BlockingCallRunner(max_workers=max_workers, timeout=timeout)
+        self.bars = bar_cache if bar_cache is not None else BarCache()
     
     async def login(self, username, password, mfa_code=None, by_sms=False):
         try:
             # Create a custom pickle name to avoid conflicts with other applications
-            login_info = r.login(
+            login_info = await self.calls.call(
+                "login",
+                r.login,
+                # An SMS challenge waits for the user to enter the code
+                timeout=float("inf") if by_sms else None,
                 username=username,
                 password=password,
                 store_session=True,
@@ -105,7 +120,7 @@ class RobinhoodClient:
             if self.session:
                 try:
                     # Test if the session is still valid
-                    account_info = r.account.build_user_profile()
+                    account_info = await self.calls.call("build_user_profile", r.account.build_user_profile)
                     debug("Using existing authenticated session")
                     return True
                 except Exception as session_error:
@@ -138,7 +153,7 @@ class RobinhoodClient:
             
             try:
                 # First try to get user profile
-                account_info = r.account.build_user_profile()
+                account_info = await self.calls.call("build_user_profile", r.account.build_user_profile)
                 debug(f"Retrieved account profile successfully")
             except Exception as profile_error:
                 # If that fails, try to re-authenticate and try again
@@ -146,11 +161,11 @@ class RobinhoodClient:
                 authenticated = await self.authenticate()
                 if not authenticated:
                     return {}
-                account_info = r.account.build_user_profile()
+                account_info = await self.calls.call("build_user_profile", r.account.build_user_profile)
             
             # Enrich with additional account information
             try:
-                account_details = r.account.load_account_profile()
+                account_details = await self.calls.call("load_account_profile", r.account.load_account_profile)
                 if account_details:
                     account_info['account_details'] = account_details
             except Exception as details_error:
@@ -161,3 +176,59 @@ class RobinhoodClient:
         except Exception as e:
             error(f"Failed to get account info: {str(e)}")
             return {}
+
+    async def get_historical_data(self, symbol: str, interval: str = "5minute", span: str = "week"):
+        """Get historical bars, fetching only what changed since the last call
+        
+        The first call for a symbol fetches the full ``span``; later calls fetch
+        the shortest span reaching back to the last cached bar and append the
+        newer bars to the cached history.
+        
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval ("5minute", "10minute", "hour", "day", "week")
+            span: History to keep on the first fetch ("day" ... "5year")
+            
+        Returns:
+            pd.DataFrame: open/high/low/close/volume bars indexed by bar start;
+            the same object is returned until new bars arrive
+        """
+        fetch_span = self.bars.fetch_span(symbol, interval, span)
+        records = await self.calls.call(
+            "get_stock_historicals",
+            r.stocks.get_stock_historicals,
+            symbol,
+            interval=interval,
+            span=fetch_span
+        )
+        debug(f"Fetched {len(records or [])} {interval} bars ({fetch_span}) for {symbol}")
+        return self.bars.update(symbol, interval, records)
+
+    async def get_quotes(self, symbols: List[str]) -> Dict[str, dict]:
+        """Get quotes for several symbols in one request
+        
+        Args:
+            symbols: Stock symbols
+            
+        Returns:
+            dict: ``{symbol: quote}`` with ``last_price``, ``bid_price``,
+            ``ask_price`` and ``updated_at``; unknown symbols are left out
+        """
+        if not symbols:
+            return {}
+        records = await self.calls.call("get_quotes", r.stocks.get_quotes, list(symbols))
+        quotes = {}
+        for record in records or []:
+            if not record or not record.get("last_trade_price"):
+                continue
+            quotes[record["symbol"]] = {
+                "last_price": float(record["last_trade_price"]),
+                "bid_price": float(record.get("bid_price") or 0.0),
+                "ask_price": float(record.get("ask_price") or 0.0),
+                "updated_at": record.get("updated_at")
+            }
+        return quotes
+
+    async def get_quote(self, symbol: str) -> dict:
+        """Get a single symbol's quote (see ``get_quotes``); empty if unavailable"""
+        return (await self.get_quotes([symbol])).get(symbol, {})
@@ -0,0 +1,194 @@
+"""
+Array-based performance metrics for backtest results.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Optional, Union
+
+
+# Bars per year for each BacktestParameters.data_frequency
+PERIODS_PER_YEAR: Dict[str, float] = {
+    "minute": 252 * 390,
+    "hourly": 252 * 6.5,
+    "daily": 252,
+    "weekly": 52,
+    "monthly": 12,
+}
+
+
+def periods_per_year(data_frequency: Union[str, float]) -> float:
+    """Annualization factor for a data frequency name (or a number of bars per year)"""
+    if isinstance(data_frequency, (int, float)):
+        return float(data_frequency)
+    try:
+        return PERIODS_PER_YEAR[data_frequency]
+    except KeyError:
+        raise ValueError(
+            f"Unknown data frequency '{data_frequency}', expected one of {list(PERIODS_PER_YEAR)}"
+        )
+
+
+def trade_arrays(trades: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """Column arrays of the fields metrics need from a list of trade dicts"""
+    n = len(trades)
+    return {
+        "pnl": np.fromiter((t["pnl"] for t in trades), dtype=np.float64, count=n),
+        "notional": np.fromiter(
+            (t["quantity"] * (t["entry_price"] + t["exit_price"]) for t in trades),
+            dtype=np.float64, count=n
+        ),
+        "entry_date": np.array([t["entry_date"] for t in trades], dtype="datetime64[ns]"),
+        "exit_date": np.array([t["exit_date"] for t in trades], dtype="datetime64[ns]"),
+    }
+
+
+def rolling_sharpe(
+    returns: np.ndarray,
+    window: int,
+    data_frequency: Union[str, float] = "daily",
+    risk_free_rate: float = 0.0
+) -> np.ndarray:
+    """Annualized Sharpe ratio over a trailing window (NaN until the window fills)"""
+    returns = np.asarray(returns, dtype=np.float64)
+    factor = periods_per_year(data_frequency)
+    result = np.full(len(returns), np.nan)
+    if window <= 1 or len(returns) < window:
+        return result
+
+    excess = returns - risk_free_rate / factor
+    # Windowed sums from cumulative sums: O(n) for any window length
+    csum = np.concatenate(([0.0], np.cumsum(returns)))
+    csum_sq = np.concatenate(([0.0], np.cumsum(returns * returns)))
+    cexcess = np.concatenate(([0.0], np.cumsum(excess)))
+
+    total = csum[window:] - csum[:-window]
+    total_sq = csum_sq[window:] - csum_sq[:-window]
+    variance = np.maximum(total_sq / window - (total / window) ** 2, 0.0)
+    volatility = np.sqrt(variance)
+    mean_excess = (cexcess[window:] - cexcess[:-window]) / window
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result[window - 1:] = np.where(
+            volatility > 1e-12, mean_excess / volatility * np.sqrt(factor), 0.0
+        )
+    return result
+
+
+def calculate_metrics(
+    equity_curve: Union[List[float], np.ndarray],
+    trades: Union[List[Dict[str, Any]], Dict[str, np.ndarray]],
+    drawdowns: Optional[Union[List[float], np.ndarray]] = None,
+    dates: Optional[Union[List[Any], np.ndarray]] = None,
+    data_frequency: Union[str, float] = "daily",
+    risk_free_rate: float = 0.02
+) -> Dict[str, float]:
+    """
+    Performance metrics of a backtest, computed on arrays.
+
+    Args:
+        equity_curve: Equity per bar, starting with the initial capital
+        trades: Closed trades, as trade dicts or ``trade_arrays`` output
+        drawdowns: Drawdown per bar as recorded by the engine (derived from
+            the equity curve if omitted)
+        dates: Bar dates aligned with ``equity_curve``; needed for exposure
+        data_frequency: Bar frequency name or bars per year, for annualization
+        risk_free_rate: Annual risk-free rate
+
+    Returns:
+        Metric name to value
+    """
+    equity = np.asarray(equity_curve, dtype=np.float64)
+    if len(equity) < 2:
+        return {}
+
+    total_return = equity[-1] / equity[0] - 1
+    if not isinstance(trades, dict):
+        trades = trade_arrays(trades)
+    pnl = trades["pnl"]
+    total_trades = len(pnl)
+    if total_trades == 0:
+        return {
+            "total_return": total_return,
+            "total_trades": 0
+        }
+
+    factor = periods_per_year(data_frequency)
+    returns = equity[1:] / equity[:-1] - 1
+    n_periods = len(returns)
+
+    annualized_return = (1 + total_return) ** (factor / n_periods) - 1
+
+    # Volatility, Sharpe and Sortino ratios
+    volatility = returns.std()
+    annualized_volatility = volatility * np.sqrt(factor)
+    excess = returns - risk_free_rate / factor
+    mean_excess = excess.mean()
+    sharpe_ratio = mean_excess / volatility * np.sqrt(factor) if volatility > 0 else 0
+    downside_deviation = np.sqrt(np.mean(np.minimum(excess, 0.0) ** 2))
+    sortino_ratio = mean_excess / downside_deviation * np.sqrt(factor) if downside_deviation > 0 else 0
+
+    # Drawdown based metrics
+    peaks = np.maximum.accumulate(equity)
+    equity_drawdowns = (peaks - equity) / peaks
+    if drawdowns is not None and len(drawdowns):
+        max_drawdown = float(np.max(drawdowns))
+    else:
+        max_drawdown = float(equity_drawdowns.max())
+    calmar_ratio = annualized_return / max_drawdown if max_drawdown > 0 else 0
+    ulcer_index = float(np.sqrt(np.mean(equity_drawdowns ** 2)))
+
+    # Trade statistics
+    wins = pnl > 0
+    losses = pnl < 0
+    winning_trades = int(wins.sum())
+    losing_trades = int(losses.sum())
+    total_profit = pnl[wins].sum()
+    total_loss = -pnl[losses].sum()
+    profit_factor = total_profit / total_loss if total_loss > 0 else float('inf')
+
+    # Annualized traded notional relative to average equity
+    years = n_periods / factor
+    turnover = trades["notional"].sum() / equity.mean() / years if years > 0 else 0.0
+
+    metrics = {
+        "total_return": total_return,
+        "annualized_return": annualized_return,
+        "annualized_volatility": annualized_volatility,
+        "sharpe_ratio": sharpe_ratio,
+        "sortino_ratio": sortino_ratio,
+        "calmar_ratio": calmar_ratio,
+        "max_drawdown": max_drawdown,
+        "ulcer_index": ulcer_index,
+        "win_rate": winning_trades / total_trades,
+        "profit_factor": profit_factor,
+        "turnover": turnover,
+        "total_trades": total_trades,
+        "winning_trades": winning_trades,
+        "losing_trades": losing_trades,
+        "avg_profit": total_profit / winning_trades if winning_trades > 0 else 0,
+        "avg_loss": total_loss / losing_trades if losing_trades > 0 else 0,
+        "avg_trade": pnl.sum() / total_trades
+    }
+
+    if dates is not None and len(dates) == len(equity):
+        metrics["exposure"] = _exposure(
+            np.asarray(pd.to_datetime(np.asarray(dates)), dtype="datetime64[ns]"),
+            trades["entry_date"], trades["exit_date"]
+        )
+
+    return metrics
+
+
+def _exposure(dates: np.ndarray, entries: np.ndarray, exits: np.ndarray) -> float:
+    """Fraction of bars (after the initial one) with at least one open position"""
+    bars = dates[1:]
+    if len(bars) == 0:
+        return 0.0
+    # +1 where a holding period starts, -1 after it ends; a running sum counts open positions
+    starts = np.searchsorted(bars, entries, side='left')
+    stops = np.searchsorted(bars, exits, side='left')
+    delta = np.zeros(len(bars) + 1, dtype=np.int64)
+    np.add.at(delta, starts, 1)
+    np.add.at(delta, stops, -1)
+    open_positions = np.cumsum(delta[:-1])
+    return float(np.mean(open_positions > 0))
@@ -7,11 +7,23 @@ import matplotlib.pyplot as plt
 from typing import Dict, List, Any, Optional, Tuple, Union, Callable
 from datetime import datetime, timedelta
 import os
+import copy
+import tempfile
 import json
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
 from dataclasses import dataclass, field
 
 from src.strategy_framework import Strategy, Signal, SignalType, StrategyRegistry
 from src.risk_management import RiskManager, RiskParameters, PositionSizing
+from src.price_cube import FIELDS, PriceCube, SharedPriceCube
+from src.cost_models import CostModel, make_cost_model
+from src.backtest_metrics import calculate_metrics, periods_per_year, rolling_sharpe
+from src.results_store import (
+    BAR_DTYPE, SIGNAL_DTYPE, TRADE_DTYPE, ColumnBuffer, LabelTable, ParquetSpill
+)
+from src.data_cache import CACHE_DIR_NAME, load_cached_frame, save_cached_frame
+from src.resampling import REBALANCE_PERIODS, period_starts, resample_to_frequency
 
 
 @dataclass
@@ -23,10 +35,19 @@ class BacktestParameters:
     enable_short_selling: bool = True
     max_positions: int = 10
     risk_free_rate: float = 0.02  # 2% annual risk-free rate
-    data_frequency: str = "daily"  # daily, hourly, minute
-    rebalance_frequency: str = "daily"  # daily, weekly, monthly
+    data_frequency: str = "daily"  # daily, hourly, minute; finer input bars are resampled
+    rebalance_frequency: str = "daily"  # minute, hourly, daily, weekly, monthly
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
+    results_spill_dir: Optional[str] = None  # stream results to Parquet chunks in a per-engine subdirectory here
+    results_chunk_size: int = 100_000  # records per spilled chunk
+    fill_model: str = "close"  # close, or ohlc for intrabar stop/target fills with gaps
+    cost_model: Union[str, CostModel] = "flat"  # flat (slippage_pct), spread, volume, sqrt or a CostModel
+
+
+# Exit reason codes used by BacktestEngine._exit_fills
+EXIT_NONE, EXIT_STOPPED, EXIT_TARGET = 0, 1, 2
+EXIT_REASONS = {EXIT_STOPPED: "stopped", EXIT_TARGET: "target_reached"}
 
 
 @dataclass
@@ -46,93 +67,258 @@ class BacktestPosition:
     status: str = "open"  # open, closed, stopped, target_reached
 
 
-@dataclass
 class BacktestResults:
-    """Results of a backtest"""
-    equity_curve: List[float] = field(default_factory=list)
-    dates: List[datetime] = field(default_factory=list)
-    trades: List[Dict[str, Any]] = field(default_factory=list)
-    metrics: Dict[str, float] = field(default_factory=dict)
-    drawdowns: List[float] = field(default_factory=list)
-    positions_history: List[Dict[str, Any]] = field(default_factory=list)
-    signals_history: List[Dict[str, Any]] = field(default_factory=list)
+    """
+    Results of a backtest.
     
-    def calculate_metrics(self) -> Dict[str, float]:
-        """Calculate performance metrics"""
-        if not self.equity_curve or len(self.equity_curve) < 2:
-            return {}
-        
-        # Basic metrics
-        initial_equity = self.equity_curve[0]
-        final_equity = self.equity_curve[-1]
-        total_return = (final_equity / initial_equity) - 1
-        
-        # Trading metrics
-        total_trades = len(self.trades)
-        if total_trades == 0:
-            return {
-                "total_return": total_return,
-                "total_trades": 0
-            }
-        
-        winning_trades = sum(1 for trade in self.trades if trade["pnl"] > 0)
-        losing_trades = sum(1 for trade in self.trades if trade["pnl"] < 0)
-        win_rate = winning_trades / total_trades if total_trades > 0 else 0
+    Per-bar equity, cash and drawdown, closed trades and emitted signals are
+    appended to typed columnar buffers (see ``src.results_store``) rather than
+    lists of dicts. ``equity_curve``, ``drawdowns`` and ``cash`` are arrays and
+    ``dates`` a DatetimeIndex; ``trades``, ``signals_history`` and
+    ``positions_history`` build the familiar lists of dicts on access.
+    
+    With ``spill_dir`` set, every ``chunk_size`` records are streamed to
+    Parquet and dropped from memory, so memory stays bounded however long the
+    backtest runs; the accessors read spilled chunks back.
+    """
+    
+    def __init__(
+        self,
+        data_frequency: str = "daily",
+        risk_free_rate: float = 0.02,
+        spill_dir: Optional[str] = None,
+        chunk_size: int = 100_000
+    ):
+        self.metrics: Dict[str, float] = {}
+        self.data_frequency = data_frequency
+        self.risk_free_rate = risk_free_rate
+        self.chunk_size = chunk_size
         
-        # Calculate returns
-        returns = [
-            (self.equity_curve[i] / self.equity_curve[i-1]) - 1 
-            for i in range(1, len(self.equity_curve))
+        self.symbols = LabelTable()
+        self.sources = LabelTable()
+        self.reasons = LabelTable()
+        self._buffers = {
+            "bars": ColumnBuffer(BAR_DTYPE),
+            "trades": ColumnBuffer(TRADE_DTYPE),
+            "signals": ColumnBuffer(SIGNAL_DTYPE)
+        }
+        self._spill = ParquetSpill(spill_dir) if spill_dir else None
+    
+    def record_bar(self, date: datetime, equity: float, cash: float, drawdown: float) -> None:
+        """Record end-of-bar portfolio state"""
+        self._append("bars", (pd.Timestamp(date).to_datetime64(), equity, cash, drawdown))
+    
+    def record_trade(
+        self,
+        symbol: str,
+        direction: str,
+        entry_date: datetime,
+        entry_price: float,
+        exit_date: datetime,
+        exit_price: float,
+        quantity: float,
+        pnl: float,
+        return_pct: float,
+        reason: str
+    ) -> None:
+        """Record a closed trade"""
+        self._append("trades", (
+            self.symbols.code(symbol),
+            -1 if direction == "short" else 1,
+            pd.Timestamp(entry_date).to_datetime64(),
+            entry_price,
+            pd.Timestamp(exit_date).to_datetime64(),
+            exit_price,
+            quantity,
+            pnl,
+            return_pct,
+            self.reasons.code(reason)
+        ))
+    
+    def record_signal(
+        self,
+        date: datetime,
+        symbol: str,
+        signal_type: SignalType,
+        confidence: float,
+        source: str
+    ) -> None:
+        """Record a signal the engine acted on"""
+        self._append("signals", (
+            pd.Timestamp(date).to_datetime64(),
+            self.symbols.code(symbol),
+            signal_type.value,
+            confidence,
+            self.sources.code(source)
+        ))
+    
+    def _append(self, name: str, record: Tuple) -> None:
+        buffer = self._buffers[name]
+        buffer.append(record)
+        if self._spill is not None and len(buffer) >= self.chunk_size:
+            self._spill.write(name, buffer.values())
+            buffer.clear()
+    
+    def finalize(self) -> None:
+        """Flush buffered records to the spill directory (no-op without one)"""
+        if self._spill is None:
+            return
+        for name, buffer in self._buffers.items():
+            self._spill.write(name, buffer.values())
+            buffer.clear()
+        self._spill.write_labels({
+            "symbols": self.symbols, "sources": self.sources, "reasons": self.reasons
+        })
+    
+    def _records(self, name: str) -> np.ndarray:
+        buffer = self._buffers[name]
+        if self._spill is None:
+            return buffer.values()
+        return np.concatenate([self._spill.read(name, buffer.values().dtype), buffer.values()])
+    
+    @property
+    def bars(self) -> np.ndarray:
+        """Structured array of per-bar date, equity, cash and drawdown"""
+        return self._records("bars")
+    
+    @property
+    def trade_records(self) -> np.ndarray:
+        """Structured array of closed trades (symbol and reason as codes)"""
+        return self._records("trades")
+    
+    @property
+    def signal_records(self) -> np.ndarray:
+        """Structured array of signals (symbol and source as codes)"""
+        return self._records("signals")
+    
+    @property
+    def equity_curve(self) -> np.ndarray:
+        return self.bars["equity"]
+    
+    @property
+    def drawdowns(self) -> np.ndarray:
+        return self.bars["drawdown"]
+    
+    @property
+    def cash(self) -> np.ndarray:
+        return self.bars["cash"]
+    
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return pd.DatetimeIndex(self.bars["date"])
+    
+    @property
+    def trades(self) -> List[Dict[str, Any]]:
+        """Closed trades as dicts"""
+        records = self.trade_records
+        symbols = self.symbols.decode(records["symbol"])
+        reasons = self.reasons.decode(records["reason"])
+        entry_dates = pd.DatetimeIndex(records["entry_date"])
+        exit_dates = pd.DatetimeIndex(records["exit_date"])
+        return [
+            {
+                "symbol": symbols[i],
+                "direction": "short" if records["direction"][i] < 0 else "long",
+                "entry_date": entry_dates[i],
+                "entry_price": float(records["entry_price"][i]),
+                "exit_date": exit_dates[i],
+                "exit_price": float(records["exit_price"][i]),
+                "quantity": float(records["quantity"][i]),
+                "pnl": float(records["pnl"][i]),
+                "return_pct": float(records["return_pct"][i]),
+                "duration": (exit_dates[i] - entry_dates[i]).days,
+                "reason": reasons[i]
+            }
+            for i in range(len(records))
         ]
-        
-        # Annualized metrics
-        trading_days = len(returns)
-        if trading_days > 0:
-            annual_factor = 252 / trading_days  # Assuming 252 trading days per year
-            annualized_return = (1 + total_return) ** annual_factor - 1
-            
-            # Volatility and Sharpe ratio
-            daily_volatility = np.std(returns)
-            annualized_volatility = daily_volatility * np.sqrt(252)
-            
-            risk_free_daily = 0.02 / 252  # Assuming 2% annual risk-free rate
-            excess_returns = [r - risk_free_daily for r in returns]
-            sharpe_ratio = (np.mean(excess_returns) / daily_volatility) * np.sqrt(252) if daily_volatility > 0 else 0
-            
-            # Maximum drawdown
-            max_drawdown = max(self.drawdowns) if self.drawdowns else 0
-            
-            # Profit factor
-            total_profit = sum(trade["pnl"] for trade in self.trades if trade["pnl"] > 0)
-            total_loss = sum(abs(trade["pnl"]) for trade in self.trades if trade["pnl"] < 0)
-            profit_factor = total_profit / total_loss if total_loss > 0 else float('inf')
-            
-            # Average trade metrics
-            avg_profit = total_profit / winning_trades if winning_trades > 0 else 0
-            avg_loss = total_loss / losing_trades if losing_trades > 0 else 0
-            avg_trade = sum(trade["pnl"] for trade in self.trades) / total_trades
-            
-            return {
-                "total_return": total_return,
-                "annualized_return": annualized_return,
-                "annualized_volatility": annualized_volatility,
-                "sharpe_ratio": sharpe_ratio,
-                "max_drawdown": max_drawdown,
-                "win_rate": win_rate,
-                "profit_factor": profit_factor,
-                "total_trades": total_trades,
-                "winning_trades": winning_trades,
-                "losing_trades": losing_trades,
-                "avg_profit": avg_profit,
-                "avg_loss": avg_loss,
-                "avg_trade": avg_trade
+    
+    @property
+    def signals_history(self) -> List[Dict[str, Any]]:
+        """Signals as dicts"""
+        records = self.signal_records
+        symbols = self.symbols.decode(records["symbol"])
+        sources = self.sources.decode(records["source"])
+        dates = pd.DatetimeIndex(records["date"])
+        return [
+            {
+                "date": dates[i],
+                "symbol": symbols[i],
+                "signal_type": SignalType(int(records["signal_type"][i])).name,
+                "confidence": float(records["confidence"][i]),
+                "source": sources[i]
             }
+            for i in range(len(records))
+        ]
+    
+    @property
+    def positions_history(self) -> List[Dict[str, Any]]:
+        """Open and close events derived from the trades, in date order"""
+        events = []
+        for trade in self.trades:
+            events.append({
+                "date": trade["entry_date"],
+                "symbol": trade["symbol"],
+                "action": "open",
+                "quantity": trade["quantity"],
+                "price": trade["entry_price"],
+                "direction": trade["direction"]
+            })
+            events.append({
+                "date": trade["exit_date"],
+                "symbol": trade["symbol"],
+                "action": "close",
+                "quantity": trade["quantity"],
+                "price": trade["exit_price"],
+                "pnl": trade["pnl"],
+                "return_pct": trade["return_pct"],
+                "reason": trade["reason"]
+            })
+        events.sort(key=lambda event: event["date"])
+        return events
+    
+    def to_frames(self) -> Dict[str, pd.DataFrame]:
+        """Bars, trades and signals as DataFrames with labels decoded"""
+        trades = pd.DataFrame(self.trade_records)
+        trades["symbol"] = self.symbols.decode(trades["symbol"].to_numpy())
+        trades["direction"] = np.where(trades["direction"] < 0, "short", "long")
+        trades["reason"] = self.reasons.decode(trades["reason"].to_numpy())
+        
+        signals = pd.DataFrame(self.signal_records)
+        signals["symbol"] = self.symbols.decode(signals["symbol"].to_numpy())
+        signals["signal_type"] = [SignalType(int(v)).name for v in signals["signal_type"]]
+        signals["source"] = self.sources.decode(signals["source"].to_numpy())
         
-        return {"total_return": total_return, "total_trades": total_trades}
+        return {"bars": pd.DataFrame(self.bars), "trades": trades, "signals": signals}
+    
+    def calculate_metrics(self) -> Dict[str, float]:
+        """Calculate performance metrics"""
+        records = self.trade_records
+        trades = {
+            "pnl": records["pnl"],
+            "notional": records["quantity"] * (records["entry_price"] + records["exit_price"]),
+            "entry_date": records["entry_date"],
+            "exit_date": records["exit_date"]
+        }
+        bars = self.bars
+        return calculate_metrics(
+            bars["equity"],
+            trades,
+            drawdowns=bars["drawdown"],
+            dates=bars["date"],
+            data_frequency=self.data_frequency,
+            risk_free_rate=self.risk_free_rate
+        )
+    
+    def rolling_sharpe(self, window: int = 63) -> pd.Series:
+        """Annualized Sharpe ratio over a trailing window of bars, indexed by date"""
+        equity = self.equity_curve
+        returns = equity[1:] / equity[:-1] - 1
+        values = rolling_sharpe(returns, window, self.data_frequency, self.risk_free_rate)
+        return pd.Series(values, index=self.dates[1:])
     
     def plot_equity_curve(self, save_path: Optional[str] = None) -> None:
         """Plot equity curve and drawdowns"""
-        if not self.equity_curve or len(self.equity_curve) < 2:
+        if len(self.equity_curve) < 2:
             print("Not enough data to plot equity curve")
             return
         
@@ -166,20 +352,22 @@ class BacktestResults:
             plt.show()
     
     def save_results(self, file_path: str) -> None:
-        """Save backtest results to a file"""
-        # Convert datetime objects to strings for JSON serialization
-        results_dict = {
-            "equity_curve": self.equity_curve,
-            "dates": [date.isoformat() if isinstance(date, datetime) else date for date in self.dates],
-            "trades": self.trades,
-            "metrics": self.metrics,
-            "drawdowns": self.drawdowns,
-            "positions_history": self.positions_history,
-            "signals_history": [{**s, "date": s["date"].isoformat() if isinstance(s["date"], datetime) else s["date"]} for s in self.signals_history]
-        }
+        """Save backtest results to a compact, column-oriented JSON file"""
+        results_dict = {"metrics": self.metrics}
+        for name, frame in self.to_frames().items():
+            # Datetime columns as ISO strings for JSON serialization
+            for column in frame.select_dtypes(include=["datetime64"]).columns:
+                frame[column] = frame[column].dt.strftime("%Y-%m-%dT%H:%M:%S")
+            results_dict[name] = frame.to_dict(orient="list")
         
         with open(file_path, 'w') as f:
-            json.dump(results_dict, f, indent=2)
+            json.dump(results_dict, f, separators=(",", ":"))
+    
+    def save_parquet(self, directory: str) -> None:
+        """Save bars, trades and signals as Parquet files (requires pyarrow)"""
+        os.makedirs(directory, exist_ok=True)
+        for name, frame in self.to_frames().items():
+            frame.to_parquet(os.path.join(directory, f"{name}.parquet"), index=False)
 
 
 class BacktestEngine:
@@ -195,115 +383,214 @@ class BacktestEngine:
         self.parameters = parameters or BacktestParameters()
         self.risk_manager = RiskManager(risk_parameters)
         
+        if self.parameters.fill_model not in ("close", "ohlc"):
+            raise ValueError(f"Unknown fill model: {self.parameters.fill_model}")
+        if self.parameters.rebalance_frequency not in REBALANCE_PERIODS:
+            raise ValueError(f"Unknown rebalance frequency: {self.parameters.rebalance_frequency}")
+        self.cost_model = make_cost_model(self.parameters.cost_model, self.parameters.slippage_pct)
+        
         # Backtest state
         self.current_date = None
+        self.current_row = None
+        self.cube: Optional[PriceCube] = None
+        self._signal_arrays: Optional[Dict[str, np.ndarray]] = None
+        self._rows: Optional[range] = None
+        self._next_row = 0
+        self._rebalance: Optional[np.ndarray] = None
         self.equity = self.parameters.initial_capital
         self.cash = self.parameters.initial_capital
         self.positions: Dict[str, BacktestPosition] = {}
         self.position_value = 0.0
         self.high_water_mark = self.parameters.initial_capital
         
-        # Results tracking
-        self.results = BacktestResults()
+        # Results tracking; engines sharing a spill dir (parallel runs, optimizer
+        # pools) each spill to their own subdirectory so parts never collide
+        spill_dir = self.parameters.results_spill_dir
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            spill_dir = tempfile.mkdtemp(prefix="backtest-", dir=spill_dir)
+        self.results = BacktestResults(
+            data_frequency=self.parameters.data_frequency,
+            risk_free_rate=self.parameters.risk_free_rate,
+            spill_dir=spill_dir,
+            chunk_size=self.parameters.results_chunk_size
+        )
     
     def run(
         self, 
-        data: Dict[str, pd.DataFrame],
+        data: Union[Dict[str, pd.DataFrame], PriceCube],
         start_date: Optional[datetime] = None,
-        end_date: Optional[datetime] = None
+        end_date: Optional[datetime] = None,
+        vectorized: bool = False,
+        series_cache: Optional[Dict[Tuple[str, str, str], pd.DataFrame]] = None
     ) -> BacktestResults:
-        """Run backtest on historical data"""
+        """
+        Run backtest on historical data.
+        
+        ``data`` is either ``load_data`` output or an already built ``PriceCube``
+        (reused as-is, e.g. across optimizer evaluations).
+        
+        With ``vectorized=True`` every strategy computes its whole signal series
+        once up front (see ``Strategy.generate_signal_series``) instead of being
+        re-run on each date's history; fills and accounting are unchanged, so
+        results match the event-driven run. Raises ValueError if a registered
+        strategy cannot be vectorized. Runs over the same cube can share a
+        ``series_cache`` (see ``StrategyRegistry.get_combined_signal_series``)
+        so per-strategy series are computed once across runs and date ranges.
+        
+        Frames with bars finer than ``data_frequency`` (e.g. minute bars for a
+        daily backtest) are resampled to it first. Strategies are only evaluated
+        on the first bar of each ``rebalance_frequency`` period; the bars in
+        between still mark positions to market and check stops and targets.
+        """
+        if not self.begin(data, start_date, end_date, vectorized, series_cache):
+            return self.results
+        self.advance()
+        return self.finish()
+    
+    def begin(
+        self,
+        data: Union[Dict[str, pd.DataFrame], PriceCube],
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        vectorized: bool = False,
+        series_cache: Optional[Dict[Tuple[str, str, str], pd.DataFrame]] = None
+    ) -> bool:
+        """
+        Set up a backtest to be simulated in steps (arguments as for ``run``).
+        
+        Follow with one or more ``advance`` calls and a final ``finish``; this
+        lets callers check interim results and stop or extend a run without
+        re-simulating the bars already done. Returns False if there is nothing
+        to simulate.
+        """
         if not data:
             print("No data provided for backtest")
-            return self.results
+            return False
         
         # Determine date range
         start_date = start_date or self.parameters.start_date
         end_date = end_date or self.parameters.end_date
         
-        # Get common date range across all symbols
-        all_dates = set()
-        for symbol, df in data.items():
-            if 'date' in df.columns:
-                dates = pd.to_datetime(df['date'])
-            else:
-                df = df.copy()
-                df['date'] = df.index
-                dates = pd.to_datetime(df['date'])
-            
-            if start_date:
-                dates = dates[dates >= start_date]
-            if end_date:
-                dates = dates[dates <= end_date]
-            
-            all_dates.update(dates.tolist())
-        
-        # Sort dates
-        all_dates = sorted(all_dates)
+        # Build the aligned price cube once; every lookup below is an O(1) slice
+        self.cube = data if isinstance(data, PriceCube) else PriceCube.from_frames(self._resample_input(data))
+        rows = self.cube.row_range(start_date, end_date)
         
-        if not all_dates:
+        if not rows:
             print("No dates in common date range")
-            return self.results
+            return False
+        
+        self.cost_model.prepare(self.cube)
+        self._signal_arrays = self._precompute_signals(series_cache) if vectorized else None
+        self._rows = rows
+        self._next_row = rows.start
+        self._rebalance = self._rebalance_schedule(rows)
         
         # Initialize results tracking
-        self.results.equity_curve.append(self.equity)
-        self.results.dates.append(all_dates[0])
-        self.results.drawdowns.append(0.0)
+        self.results.record_bar(self.cube.date_at(rows[0]), self.equity, self.cash, 0.0)
+        return True
+    
+    def advance(self, until: Optional[datetime] = None) -> int:
+        """
+        Simulate the run's next bars up to ``until`` (to its end if None).
+        
+        Returns:
+            Number of bars simulated by this call
+        """
+        rows = self._rows
+        stop = rows.stop if until is None else min(rows.stop, self.cube.row_for(until) + 1)
+        start = self._next_row
         
         # Run simulation for each date
-        for date in all_dates:
+        for row in range(start, stop):
+            date = self.cube.date_at(row)
             self.current_date = date
+            self.current_row = row
             
             # Update positions with latest prices
-            self._update_positions(data, date)
+            self._update_positions(row, date)
+            
+            # Strategies only run on rebalance bars
+            if not self._rebalance[row - rows.start]:
+                continue
             
             # Generate signals
-            signals = self._generate_signals(data, date)
+            signals = self._generate_signals(row, date)
             
             # Process signals
-            self._process_signals(signals, data, date)
-            
-            # Record daily state
-            self._record_daily_state()
+            self._process_signals(signals, row, date)
         
-        # Close any remaining positions at the end of the backtest
-        self._close_all_positions(data, all_dates[-1])
+        self._next_row = max(start, stop)
+        return self._next_row - start
+    
+    @property
+    def rows(self) -> Optional[range]:
+        """Cube rows of the current run (None before ``begin``)"""
+        return self._rows
+    
+    @property
+    def bars_simulated(self) -> int:
+        """Bars simulated so far in the current run"""
+        return self._next_row - self._rows.start if self._rows is not None else 0
+    
+    @property
+    def finished(self) -> bool:
+        """Whether every bar of the current run has been simulated"""
+        return self._rows is not None and self._next_row >= self._rows.stop
+    
+    def finish(self) -> BacktestResults:
+        """Close open positions at the last simulated bar and compute final metrics"""
+        if self._next_row > self._rows.start:
+            # Close any remaining positions at the end of the backtest
+            last_row = self._next_row - 1
+            self._close_all_positions(last_row, self.cube.date_at(last_row))
         
         # Calculate final metrics
+        self.results.finalize()
         self.results.metrics = self.results.calculate_metrics()
         
         return self.results
     
-    def _update_positions(self, data: Dict[str, pd.DataFrame], date: datetime) -> None:
+    def _resample_input(self, data: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Resample frames to ``data_frequency`` if their bars are finer"""
+        return resample_to_frequency(data, self.parameters.data_frequency)
+    
+    def _rebalance_schedule(self, rows: range) -> np.ndarray:
+        """Mask over ``rows`` of the bars on which strategies are evaluated"""
+        schedule = period_starts(self.cube.dates[rows.start:rows.stop], self.parameters.rebalance_frequency)
+        # Bars are never skipped when rebalancing is at least as frequent as the data
+        rebalance_ppy = periods_per_year(self.parameters.rebalance_frequency)
+        if rebalance_ppy >= periods_per_year(self.parameters.data_frequency):
+            schedule[:] = True
+        return schedule
+    
+    def _update_positions(self, row: int, date: datetime) -> None:
         """Update positions with latest prices and check stops"""
         self.position_value = 0.0
         
-        for symbol, position in list(self.positions.items()):
-            # Get latest price
-            price = self._get_price(data, symbol, date)
-            if price is None:
-                continue
+        if self.positions:
+            symbols = list(self.positions)
+            positions = [self.positions[symbol] for symbol in symbols]
+            columns = np.array([self.cube.symbol_index[symbol] for symbol in symbols])
             
-            # Calculate current value
-            direction_multiplier = -1 if position.direction == "short" else 1
-            position_value = position.quantity * price * direction_multiplier
+            bars = self.cube.values[row, columns]
+            direction = np.array([-1.0 if p.direction == "short" else 1.0 for p in positions])
+            quantity = np.array([p.quantity for p in positions])
+            stop = np.array([np.nan if p.stop_loss is None else p.stop_loss for p in positions])
+            target = np.array([np.nan if p.take_profit is None else p.take_profit for p in positions])
             
-            # Check stop loss
-            if position.stop_loss is not None:
-                if (position.direction == "long" and price <= position.stop_loss) or \
-                   (position.direction == "short" and price >= position.stop_loss):
-                    self._close_position(symbol, price, date, "stopped")
-                    continue
+            # Check stop losses and take profits for all positions at once
+            fill, reason = self._exit_fills(row, columns, bars, direction, stop, target)
             
-            # Check take profit
-            if position.take_profit is not None:
-                if (position.direction == "long" and price >= position.take_profit) or \
-                   (position.direction == "short" and price <= position.take_profit):
-                    self._close_position(symbol, price, date, "target_reached")
-                    continue
+            # Value of positions that stay open (symbols without a price are skipped)
+            close = bars[:, FIELDS.index("close")]
+            held = (reason == EXIT_NONE) & ~np.isnan(close)
+            if held.any():
+                # cumsum adds in position order, like the original running total
+                self.position_value = float(np.cumsum(quantity[held] * close[held] * direction[held])[-1])
             
-            # Update position value
-            self.position_value += position_value
+            for i in np.flatnonzero(reason != EXIT_NONE):
+                self._close_position(symbols[i], float(fill[i]), date, EXIT_REASONS[reason[i]])
         
         # Update equity
         self.equity = self.cash + self.position_value
@@ -317,65 +604,160 @@ class BacktestEngine:
             current_drawdown = (self.high_water_mark - self.equity) / self.high_water_mark
         
         # Record state
-        self.results.equity_curve.append(self.equity)
-        self.results.dates.append(date)
-        self.results.drawdowns.append(current_drawdown)
+        self.results.record_bar(date, self.equity, self.cash, current_drawdown)
+    
+    def _exit_fills(
+        self,
+        row: int,
+        columns: np.ndarray,
+        bars: np.ndarray,
+        direction: np.ndarray,
+        stop: np.ndarray,
+        target: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Stop-loss / take-profit exits for a batch of open positions.
+        
+        ``direction`` is +1 for longs and -1 for shorts; missing levels are NaN
+        and never trigger. Returns the fill price and exit reason code per
+        position (``EXIT_NONE`` where it stays open).
+        
+        With the ``close`` fill model levels are checked against the close and
+        filled there. With ``ohlc``, on a symbol's fresh bar an open beyond a
+        level fills at the open (gap), otherwise a level inside the bar's
+        range fills at the level; when both are inside the range the stop is
+        assumed to have been hit first.
+        """
+        close = bars[:, FIELDS.index("close")]
+        
+        # Comparisons against NaN are False, so positions without a level never trigger
+        stopped = direction * (close - stop) <= 0
+        targeted = ~stopped & (direction * (close - target) >= 0)
+        fill = close.copy()
+        
+        if self.parameters.fill_model == "ohlc":
+            previous = self.cube.bar_count[row - 1, columns] if row > 0 else 0
+            fresh = self.cube.bar_count[row, columns] > previous
+            
+            open_ = bars[:, FIELDS.index("open")]
+            adverse = np.where(direction < 0, bars[:, FIELDS.index("high")], bars[:, FIELDS.index("low")])
+            favorable = np.where(direction < 0, bars[:, FIELDS.index("low")], bars[:, FIELDS.index("high")])
+            
+            gap_stop = direction * (open_ - stop) <= 0
+            gap_target = ~gap_stop & (direction * (open_ - target) >= 0)
+            bar_stopped = gap_stop | (~gap_target & (direction * (adverse - stop) <= 0))
+            bar_targeted = ~bar_stopped & (gap_target | (direction * (favorable - target) >= 0))
+            bar_fill = np.where(
+                gap_stop | gap_target, open_, np.where(bar_stopped, stop, target)
+            )
+            
+            # Stale as-of bars (no new data for the symbol) keep the close check
+            stopped = np.where(fresh, bar_stopped, stopped)
+            targeted = np.where(fresh, bar_targeted, targeted)
+            fill = np.where(fresh & (bar_stopped | bar_targeted), bar_fill, fill)
+        
+        reason = np.where(stopped, EXIT_STOPPED, np.where(targeted, EXIT_TARGET, EXIT_NONE))
+        return fill, reason
     
     def _generate_signals(
         self, 
-        data: Dict[str, pd.DataFrame], 
+        row: int, 
         date: datetime
     ) -> Dict[str, Signal]:
         """Generate signals from strategies"""
-        # Prepare data for strategies
-        strategy_data = {}
-        for symbol, df in data.items():
-            # Filter data up to current date
-            if 'date' in df.columns:
-                filtered_df = df[pd.to_datetime(df['date']) <= date].copy()
-            else:
-                df = df.copy()
-                df['date'] = df.index
-                filtered_df = df[pd.to_datetime(df['date']) <= date].copy()
-            
-            if not filtered_df.empty:
-                strategy_data[symbol] = filtered_df
-        
-        # Get signals from strategy registry
-        signals = self.strategy_registry.get_combined_signals(strategy_data)
+        # Prepare data for strategies: OHLCV history up to the current row,
+        # indexed by date, sliced lazily from the price cube without copying
+        if self._signal_arrays is not None:
+            signals = self._signals_at(row)
+        else:
+            strategy_data = self.cube.snapshot(row)
+            
+            # Get signals from strategy registry
+            signals = self.strategy_registry.get_combined_signals(strategy_data)
         
         # Record signals
         for symbol, signal in signals.items():
-            self.results.signals_history.append({
-                "date": date,
-                "symbol": symbol,
-                "signal_type": signal.signal_type.name,
-                "confidence": signal.confidence,
-                "source": signal.source
-            })
+            self.results.record_signal(date, symbol, signal.signal_type, signal.confidence, signal.source)
         
         return signals
     
+    def _precompute_signals(
+        self,
+        series_cache: Optional[Dict[Tuple[str, str, str], pd.DataFrame]] = None
+    ) -> Dict[str, np.ndarray]:
+        """Compute combined signals for every (date, symbol) of the cube in one pass"""
+        last_row = len(self.cube) - 1
+        frames = {symbol: self.cube.frame(symbol, last_row) for symbol in self.cube.symbols}
+        combined = self.strategy_registry.get_combined_signal_series(frames, series_cache)
+        
+        shape = self.cube.bar_count.shape
+        arrays = {
+            "signal": np.full(shape, np.nan),
+            "confidence": np.full(shape, np.nan),
+            "weighted_value": np.full(shape, np.nan),
+            "component_signals": np.zeros(shape, dtype=np.int64),
+            "first_source": np.full(shape, -1, dtype=np.int64)
+        }
+        
+        # On each date a strategy sees the symbol's bars up to that date, so the
+        # per-date signal is the series value at the symbol's latest bar
+        for s, symbol in enumerate(self.cube.symbols):
+            series = combined.get(symbol)
+            if series is None:
+                continue
+            counts = self.cube.bar_count[:, s]
+            listed = counts > 0
+            bar_idx = counts[listed] - 1
+            for key, values in arrays.items():
+                values[listed, s] = series[key].to_numpy()[bar_idx]
+        
+        return arrays
+    
+    def _signals_at(self, row: int) -> Dict[str, Signal]:
+        """Build the per-date signal dict from precomputed signal arrays"""
+        signal_row = self._signal_arrays["signal"][row]
+        # Like get_combined_signals, only BUY/SELL combinations become signals
+        present = np.flatnonzero(~np.isnan(signal_row) & (signal_row != SignalType.HOLD.value))
+        
+        # Same symbol order as get_combined_signals: first emitting strategy, then data order
+        order = present[np.lexsort((present, self._signal_arrays["first_source"][row, present]))]
+        
+        signals: Dict[str, Signal] = {}
+        for s in order:
+            symbol = self.cube.symbols[s]
+            signals[symbol] = Signal(
+                symbol=symbol,
+                signal_type=SignalType(int(signal_row[s])),
+                confidence=self._signal_arrays["confidence"][row, s],
+                source="combined",
+                metadata={
+                    "weighted_value": self._signal_arrays["weighted_value"][row, s],
+                    "component_signals": int(self._signal_arrays["component_signals"][row, s])
+                }
+            )
+        return signals
+    
     def _process_signals(
         self, 
         signals: Dict[str, Signal],
-        data: Dict[str, pd.DataFrame],
+        row: int,
         date: datetime
     ) -> None:
         """Process trading signals"""
         # Prepare portfolio data for risk manager
-        portfolio_data = {
-            "portfolio_value": self.equity,
-            "cash": self.cash,
-            "positions": {
-                symbol: {
+        positions = {}
+        for symbol, pos in self.positions.items():
+            price = self._get_price(symbol, row)
+            if price is not None:
+                positions[symbol] = {
                     "quantity": pos.quantity,
-                    "market_value": pos.quantity * self._get_price(data, symbol, date),
+                    "market_value": pos.quantity * price,
                     "direction": pos.direction
                 }
-                for symbol, pos in self.positions.items()
-                if self._get_price(data, symbol, date) is not None
-            }
+        portfolio_data = {
+            "portfolio_value": self.equity,
+            "cash": self.cash,
+            "positions": positions
         }
         
         # Update risk manager with current portfolio
@@ -389,15 +771,15 @@ class BacktestEngine:
                 continue
             
             # Get current price
-            price = self._get_price(data, symbol, date)
+            price = self._get_price(symbol, row)
             if price is None:
                 continue
             
             # Calculate volatility
-            volatility = self._calculate_volatility(data, symbol, date)
+            volatility = self._calculate_volatility(symbol, row)
             
             # Calculate position size
-            market_data = {symbol: {"historical_prices": self._get_historical_prices(data, symbol, date)}}
+            market_data = {symbol: {"historical_prices": self._get_historical_prices(symbol, row)}}
             position_sizing = self.risk_manager.calculate_position_size(signal, price, volatility, market_data)
             
             # Validate trade
@@ -413,7 +795,7 @@ class BacktestEngine:
                 continue
             
             # Apply commission and slippage
-            execution_price = price * (1 + self.parameters.slippage_pct)
+            execution_price = price * (1 + self._slippage(symbol, row, quantity, price))
             commission = quantity * execution_price * self.parameters.commission_pct
             
             # Open position
@@ -433,12 +815,13 @@ class BacktestEngine:
         for symbol, signal in sell_signals.items():
             # Close existing long position if present
             if symbol in self.positions and self.positions[symbol].direction == "long":
-                price = self._get_price(data, symbol, date)
+                price = self._get_price(symbol, row)
                 if price is None:
                     continue
                 
                 # Apply slippage
-                execution_price = price * (1 - self.parameters.slippage_pct)
+                quantity = self.positions[symbol].quantity
+                execution_price = price * (1 - self._slippage(symbol, row, quantity, price))
                 
                 # Close position
                 self._close_position(symbol, execution_price, date, "signal")
@@ -451,15 +834,15 @@ class BacktestEngine:
             # Short sell if not already in position
             if symbol not in self.positions:
                 # Get current price
-                price = self._get_price(data, symbol, date)
+                price = self._get_price(symbol, row)
                 if price is None:
                     continue
                 
                 # Calculate volatility
-                volatility = self._calculate_volatility(data, symbol, date)
+                volatility = self._calculate_volatility(symbol, row)
                 
                 # Calculate position size
-                market_data = {symbol: {"historical_prices": self._get_historical_prices(data, symbol, date)}}
+                market_data = {symbol: {"historical_prices": self._get_historical_prices(symbol, row)}}
                 position_sizing = self.risk_manager.calculate_position_size(signal, price, volatility, market_data)
                 
                 # Validate trade
@@ -476,7 +859,7 @@ class BacktestEngine:
                     continue
                 
                 # Apply commission and slippage
-                execution_price = price * (1 - self.parameters.slippage_pct)
+                execution_price = price * (1 - self._slippage(symbol, row, quantity, price))
                 commission = quantity * execution_price * self.parameters.commission_pct
                 
                 # Open short position
@@ -523,17 +906,7 @@ class BacktestEngine:
             # Deduct from cash
             cost = quantity * price + commission
             self.cash -= cost
-            
-            # Record position update
-            self.results.positions_history.append({
-                "date": date,
-                "symbol": symbol,
-                "action": "add",
-                "quantity": quantity,
-                "price": price,
-                "direction": direction,
-                "cost": cost
-            })
+
             
         else:
             # Create new position
@@ -552,19 +925,7 @@ class BacktestEngine:
             # Deduct from cash
             cost = quantity * price + commission
             self.cash -= cost
-            
-            # Record new position
-            self.results.positions_history.append({
-                "date": date,
-                "symbol": symbol,
-                "action": "open",
-                "quantity": quantity,
-                "price": price,
-                "direction": direction,
-                "stop_loss": stop_loss,
-                "take_profit": take_profit,
-                "cost": cost
-            })
+
     
     def _close_position(
         self, 
@@ -592,158 +953,81 @@ class BacktestEngine:
         self.cash += position.quantity * price + pnl
         
         # Record trade
-        trade = {
-            "symbol": symbol,
-            "direction": position.direction,
-            "entry_date": position.entry_date,
-            "entry_price": position.entry_price,
-            "exit_date": date,
-            "exit_price": price,
-            "quantity": position.quantity,
-            "pnl": pnl,
-            "return_pct": return_pct,
-            "duration": (date - position.entry_date).days,
-            "reason": reason
-        }
-        
-        self.results.trades.append(trade)
-        
-        # Record position close
-        self.results.positions_history.append({
-            "date": date,
-            "symbol": symbol,
-            "action": "close",
-            "quantity": position.quantity,
-            "price": price,
-            "pnl": pnl,
-            "return_pct": return_pct,
-            "reason": reason
-        })
+        self.results.record_trade(
+            symbol=symbol,
+            direction=position.direction,
+            entry_date=position.entry_date,
+            entry_price=position.entry_price,
+            exit_date=date,
+            exit_price=price,
+            quantity=position.quantity,
+            pnl=pnl,
+            return_pct=return_pct,
+            reason=reason
+        )
         
         # Remove position
         del self.positions[symbol]
     
-    def _close_all_positions(self, data: Dict[str, pd.DataFrame], date: datetime) -> None:
+    def _close_all_positions(self, row: int, date: datetime) -> None:
         """Close all open positions at the end of the backtest"""
         for symbol in list(self.positions.keys()):
-            price = self._get_price(data, symbol, date)
+            price = self._get_price(symbol, row)
             if price is not None:
                 self._close_position(symbol, price, date, "end_of_backtest")
     
-    def _record_daily_state(self) -> None:
-        """Record daily portfolio state"""
-        # Record positions
-        positions_snapshot = {}
-        for symbol, position in self.positions.items():
-            positions_snapshot[symbol] = {
-                "quantity": position.quantity,
-                "entry_price": position.entry_price,
-                "direction": position.direction,
-                "entry_date": position.entry_date
-            }
-        
-        # Add to positions history
-        self.results.positions_history.append({
-            "date": self.current_date,
-            "action": "snapshot",
-            "equity": self.equity,
-            "cash": self.cash,
-            "positions": positions_snapshot
-        })
+    def _slippage(self, symbol: str, row: int, quantity: float, price: float) -> float:
+        """Slippage fraction of a fill from the cost model"""
+        return self.cost_model.slippage(row, self.cube.symbol_index[symbol], quantity, price)
     
-    def _get_price(
-        self, 
-        data: Dict[str, pd.DataFrame], 
-        symbol: str, 
-        date: datetime
-    ) -> Optional[float]:
-        """Get price for a symbol at a specific date"""
-        if symbol not in data:
-            return None
-        
-        df = data[symbol]
-        
-        # Convert date column to datetime if it's not already
-        if 'date' in df.columns:
-            date_col = pd.to_datetime(df['date'])
-        else:
-            df = df.copy()
-            df['date'] = df.index
-            date_col = pd.to_datetime(df['date'])
-        
-        # Find closest date not exceeding current date
-        mask = date_col <= date
-        if not mask.any():
-            return None
-        
-        closest_idx = mask.idxmax() if isinstance(mask, pd.Series) else mask.values.argmax()
-        
-        # Get closing price
-        if 'close' in df.columns:
-            return df.iloc[closest_idx]['close']
-        elif 'price' in df.columns:
-            return df.iloc[closest_idx]['price']
-        else:
-            return None
+    def _get_price(self, symbol: str, row: int) -> Optional[float]:
+        """Get the latest closing price for a symbol at or before a cube row"""
+        return self.cube.price(symbol, row)
     
     def _get_historical_prices(
         self, 
-        data: Dict[str, pd.DataFrame], 
         symbol: str, 
-        date: datetime,
+        row: int,
         lookback: int = 60
     ) -> List[float]:
-        """Get historical prices for a symbol up to a specific date"""
-        if symbol not in data:
-            return []
-        
-        df = data[symbol]
-        
-        # Convert date column to datetime if it's not already
-        if 'date' in df.columns:
-            date_col = pd.to_datetime(df['date'])
-        else:
-            df = df.copy()
-            df['date'] = df.index
-            date_col = pd.to_datetime(df['date'])
-        
-        # Filter data up to current date
-        mask = date_col <= date
-        filtered_df = df[mask].tail(lookback)
-        
-        # Get closing prices
-        if 'close' in filtered_df.columns:
-            return filtered_df['close'].tolist()
-        elif 'price' in filtered_df.columns:
-            return filtered_df['price'].tolist()
-        else:
-            return []
+        """Get historical closing prices for a symbol up to a cube row"""
+        return self.cube.closes(symbol, row, lookback).tolist()
     
     def _calculate_volatility(
         self, 
-        data: Dict[str, pd.DataFrame], 
         symbol: str, 
-        date: datetime,
+        row: int,
         lookback: int = 20
     ) -> float:
         """Calculate historical volatility for a symbol"""
-        prices = self._get_historical_prices(data, symbol, date, lookback)
+        prices = self.cube.closes(symbol, row, lookback)
         
         if len(prices) < 5:
             return 0.20  # Default volatility if not enough data
         
-        # Calculate daily returns
-        returns = [prices[i] / prices[i-1] - 1 for i in range(1, len(prices))]
+        # Calculate per-bar returns
+        returns = prices[1:] / prices[:-1] - 1
         
-        # Calculate annualized volatility
-        daily_volatility = np.std(returns)
-        annualized_volatility = daily_volatility * np.sqrt(252)  # Assuming 252 trading days
+        # Annualize at the bar frequency of the data
+        bar_volatility = np.std(returns)
+        annualized_volatility = bar_volatility * np.sqrt(periods_per_year(self.parameters.data_frequency))
         
         return annualized_volatility
 
 
-def load_data(data_dir: str, symbols: List[str] = None) -> Dict[str, pd.DataFrame]:
-    """Load historical data for backtesting"""
+def load_data(
+    data_dir: str,
+    symbols: List[str] = None,
+    use_cache: bool = True,
+    rebuild_cache: bool = False
+) -> Dict[str, pd.DataFrame]:
+    """
+    Load historical data for backtesting.
+    
+    Parsed CSVs are cached as memory-mapped ``.npy`` columns under
+    ``<data_dir>/.cache`` and re-parsed only when the source file's mtime or
+    size changes, or when ``rebuild_cache`` is set.
+    """
     data = {}
     
     if not os.path.exists(data_dir):
@@ -757,15 +1041,24 @@ def load_data(data_dir: str, symbols: List[str] = None) -> Dict[str, pd.DataFram
     if symbols:
         files = [f for f in files if any(s in f for s in symbols)]
     
+    cache_dir = os.path.join(data_dir, CACHE_DIR_NAME) if use_cache else None
+    
     # Load each file
     for file in files:
         try:
             file_path = os.path.join(data_dir, file)
-            df = pd.read_csv(file_path)
             
             # Extract symbol from filename
             symbol = file.split('.')[0].upper()
             
+            if cache_dir and not rebuild_cache:
+                df = load_cached_frame(file_path, cache_dir)
+                if df is not None:
+                    data[symbol] = df
+                    continue
+            
+            df = pd.read_csv(file_path)
+            
             # Ensure required columns exist
             required_cols = ['date', 'close']
             if not all(col in df.columns for col in required_cols):
@@ -780,7 +1073,85 @@ def load_data(data_dir: str, symbols: List[str] = None) -> Dict[str, pd.DataFram
             
             data[symbol] = df
             
+            if cache_dir:
+                try:
+                    save_cached_frame(file_path, cache_dir, df)
+                except OSError as e:
+                    print(f"Could not cache {file}: {str(e)}")
+            
         except Exception as e:
             print(f"Error loading {file}: {str(e)}")
     
     return data
+
+# Per-process state of run_parallel_backtests workers, set by the pool initializer
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_backtest_worker(
+    shared_cubes: Dict[str, SharedPriceCube],
+    strategy_registry: StrategyRegistry,
+    risk_parameters: Optional[RiskParameters],
+    vectorized: bool
+) -> None:
+    attached: Dict[int, PriceCube] = {}
+    cubes = {}
+    for frequency, shared_cube in shared_cubes.items():
+        # Frequencies sharing one published cube attach to it once
+        if id(shared_cube) not in attached:
+            attached[id(shared_cube)] = shared_cube.attach()
+        cubes[frequency] = attached[id(shared_cube)]
+    _worker_state.update(
+        cubes=cubes,
+        registry=strategy_registry,
+        risk_parameters=risk_parameters,
+        vectorized=vectorized
+    )
+
+
+def _run_worker_backtest(parameters: BacktestParameters) -> BacktestResults:
+    engine = BacktestEngine(
+        copy.deepcopy(_worker_state["registry"]),
+        parameters,
+        copy.deepcopy(_worker_state["risk_parameters"])
+    )
+    cube = _worker_state["cubes"][parameters.data_frequency]
+    return engine.run(cube, vectorized=_worker_state["vectorized"])
+
+
+def run_parallel_backtests(
+    strategy_registry: StrategyRegistry,
+    data: Union[Dict[str, pd.DataFrame], PriceCube],
+    param_sets: List[BacktestParameters],
+    risk_parameters: Optional[RiskParameters] = None,
+    max_workers: Optional[int] = None,
+    vectorized: bool = False
+) -> List[BacktestResults]:
+    """
+    Run one backtest per parameter set across a process pool.
+    
+    Frames are resampled to each distinct ``data_frequency`` in ``param_sets``
+    (as ``BacktestEngine.run`` would) and each resulting cube is published
+    once as a ``SharedPriceCube``; workers attach to them read-only instead of
+    receiving a pickled copy, so memory stays flat as the worker count grows.
+    A ``PriceCube`` is used as-is for every parameter set. Results are returned
+    in ``param_sets`` order.
+    """
+    with ExitStack() as stack:
+        shared_cubes: Dict[str, SharedPriceCube] = {}
+        published: Dict[Optional[str], SharedPriceCube] = {}
+        for frequency in dict.fromkeys(params.data_frequency for params in param_sets):
+            frames = data if isinstance(data, PriceCube) else resample_to_frequency(data, frequency)
+            # Frequencies that leave the input unchanged share one cube
+            key = None if frames is data else frequency
+            if key not in published:
+                cube = frames if isinstance(frames, PriceCube) else PriceCube.from_frames(frames)
+                published[key] = stack.enter_context(SharedPriceCube(cube))
+            shared_cubes[frequency] = published[key]
+        
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_backtest_worker,
+            initargs=(shared_cubes, strategy_registry, risk_parameters, vectorized)
+        ) as executor:
+            return list(executor.map(_run_worker_backtest, param_sets))
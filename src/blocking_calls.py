@@ -0,0 +1,177 @@
+"""
+Async adapter for blocking API client calls.
+
+``robin_stocks`` is synchronous: calling it from a coroutine blocks the event
+loop, and with it ingestion, analytics and every other task. ``BlockingCallRunner``
+runs such calls on a dedicated, bounded thread pool with per-call timeouts and
+records each endpoint's latency in Prometheus. ``RateLimiter`` paces calls to
+endpoints with a request budget, such as order placement.
+"""
+import asyncio
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from src.exceptions import RobinhoodAPIError
+from src.metrics import record_api_call
+
+
+class BlockingCallRunner:
+    """
+    Runs blocking calls on ``max_workers`` dedicated threads.
+
+    Calls beyond ``max_workers`` wait on the event loop, not in the pool, so a
+    caller that times out or is cancelled before its call starts never
+    occupies a thread. A call already running cannot be interrupted: on
+    timeout or cancellation its slot is freed while its thread keeps running
+    until the call returns (the result is discarded), so later calls can
+    queue inside the pool behind such stragglers.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        timeout: Optional[float] = 30.0,
+        name: str = "robinhood",
+        error: type = RobinhoodAPIError
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            max_workers: Threads (and concurrent calls) in the pool
+            timeout: Default per-call timeout in seconds, waiting included (None: no timeout)
+            name: Thread name prefix
+            error: ``APIEndpointError`` subclass raised on timeout
+        """
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.error = error
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def call(
+        self,
+        endpoint: str,
+        func: Callable[..., Any],
+        *args: Any,
+        timeout: Optional[float] = None,
+        **kwargs: Any
+    ) -> Any:
+        """
+        Run ``func(*args, **kwargs)`` in the pool and await its result.
+
+        Args:
+            endpoint: Endpoint name for metrics and errors
+            func: Blocking function
+            timeout: Overrides the default timeout (``float("inf")`` waits indefinitely)
+
+        Raises:
+            The runner's ``error`` (status 504) on timeout; errors raised by
+            ``func`` are re-raised unchanged
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self._run(func, *args, **kwargs), timeout)
+        except asyncio.TimeoutError:
+            record_api_call(endpoint, "timeout", time.perf_counter() - start)
+            raise self.error(endpoint, 504, f"no response within {timeout}s")
+        except asyncio.CancelledError:
+            record_api_call(endpoint, "cancelled", time.perf_counter() - start)
+            raise
+        except Exception:
+            record_api_call(endpoint, "error", time.perf_counter() - start)
+            raise
+        record_api_call(endpoint, "success", time.perf_counter() - start)
+        return result
+
+    async def _run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if self._slots is None:
+            # Created lazily so it binds to the running loop
+            self._slots = asyncio.Semaphore(self.max_workers)
+        async with self._slots:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the pool (running calls finish in the background unless ``wait``)"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+class RateLimiter:
+    """
+    Token bucket pacing calls to a rate-limited endpoint.
+
+    Up to ``burst`` calls go through immediately, after which calls are
+    spaced at ``rate`` per second; idle time refills the bucket, so nothing
+    waits when calls are naturally spread out. ``backoff`` pauses all callers
+    after the endpoint reports a rate limit (HTTP 429), doubling the pause on
+    consecutive reports until ``success`` is recorded.
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        burst: int = 1,
+        max_backoff: float = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Sustained calls per second
+            burst: Calls allowed back to back after an idle period
+            max_backoff: Longest pause in seconds after rate-limit errors
+            clock: Monotonic clock in seconds
+        """
+        self.rate = rate
+        self.burst = burst
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._penalty = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def delay(self) -> float:
+        """Seconds until a call may proceed (0 if one may now)"""
+        now = self.clock()
+        self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        return max(self._blocked_until - now, (1.0 - self._tokens) / self.rate, 0.0)
+
+    async def acquire(self) -> None:
+        """Wait for a slot; callers are served in arrival order"""
+        if self._lock is None:
+            # Created lazily so it binds to the running loop
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            wait = self.delay()
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self.delay()
+            self._tokens -= 1.0
+
+    def backoff(self, retry_after: Optional[float] = None) -> float:
+        """
+        Pause callers after a rate-limit response.
+
+        Args:
+            retry_after: Pause requested by the endpoint; otherwise the previous
+                pause doubled, starting at one call interval
+
+        Returns:
+            The pause in seconds
+        """
+        self._penalty = min(self.max_backoff, max(self._penalty * 2, 1.0 / self.rate))
+        pause = self._penalty if retry_after is None else min(self.max_backoff, retry_after)
+        self._blocked_until = max(self._blocked_until, self.clock() + pause)
+        return pause
+
+    def success(self) -> None:
+        """Record a call that went through, resetting the backoff"""
+        self._penalty = 0.0
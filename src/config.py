@@ -48,6 +48,21 @@ MODE = os.getenv('MODE', 'test')
 RUN_INTERVAL_SECONDS = int(os.getenv('RUN_INTERVAL_SECONDS', '60'))
 TRADING_INTERVAL_MINUTES = int(os.getenv('TRADING_INTERVAL_MINUTES', '15'))
 MAX_TRADES_PER_DAY = int(os.getenv('MAX_TRADES_PER_DAY', '10'))
+# Seconds a strategy may take per decision cycle before it is dropped from it
+STRATEGY_DEADLINE_SECONDS = float(os.getenv('STRATEGY_DEADLINE_SECONDS', '30'))
+# Maximum concurrent market data requests per trading cycle
+MARKET_DATA_CONCURRENCY = int(os.getenv('MARKET_DATA_CONCURRENCY', '8'))
+# Directory persisting fetched historical bars across restarts (memory only if empty)
+BAR_CACHE_DIR = os.getenv('BAR_CACHE_DIR', '')
+# Seconds a quote snapshot is shared by sizing, risk checks and execution
+QUOTE_TTL_SECONDS = float(os.getenv('QUOTE_TTL_SECONDS', '5'))
+# Order placement budget: sustained orders per second and back-to-back burst
+ORDER_RATE_PER_SECOND = float(os.getenv('ORDER_RATE_PER_SECOND', '1'))
+ORDER_BURST = int(os.getenv('ORDER_BURST', '1'))
+# Orders executed concurrently by the trading pipeline (one per symbol at a time)
+EXECUTION_CONCURRENCY = int(os.getenv('EXECUTION_CONCURRENCY', '4'))
+# Largest relative price move between sizing and executing an order before it is dropped
+PRICE_DRIFT_TOLERANCE = float(os.getenv('PRICE_DRIFT_TOLERANCE', '0.005'))
 
 # Robinhood config parameters
 TRADE_EXCEPTIONS = []
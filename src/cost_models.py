@@ -0,0 +1,240 @@
+"""
+Transaction cost models for the backtester.
+
+A cost model turns a fill into slippage, expressed as a fraction of the price
+paid against the trade. Market features it needs (trailing average volume,
+volatility and a high/low spread estimate) are computed once per price cube
+for all bars and symbols, so parameter sweeps over a shared cube pay for them
+only once and each fill is an O(1) lookup.
+"""
+import abc
+import weakref
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional, Union
+
+from src.price_cube import FIELDS, PriceCube
+
+
+# Corwin-Schultz constant 3 - 2 * sqrt(2)
+_CS_DENOMINATOR = 3 - 2 * np.sqrt(2)
+
+# Per-cube feature arrays, keyed by lookback; dropped with the cube
+_feature_cache: "weakref.WeakKeyDictionary[PriceCube, Dict[int, Dict[str, np.ndarray]]]" = \
+    weakref.WeakKeyDictionary()
+
+
+def high_low_spread(high: np.ndarray, low: np.ndarray) -> np.ndarray:
+    """
+    Corwin-Schultz bid-ask spread estimate from consecutive bars' high/low.
+
+    Element ``i`` uses bars ``i - 1`` and ``i`` (NaN for the first bar);
+    negative estimates are clipped to zero.
+    """
+    spread = np.full(len(high), np.nan)
+    if len(high) < 2:
+        return spread
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_range = np.log(high / low) ** 2
+        beta = log_range[1:] + log_range[:-1]
+        gamma = np.log(np.maximum(high[1:], high[:-1]) / np.minimum(low[1:], low[:-1])) ** 2
+        alpha = (np.sqrt(2 * beta) - np.sqrt(beta)) / _CS_DENOMINATOR - np.sqrt(gamma / _CS_DENOMINATOR)
+        spread[1:] = np.maximum(2 * (np.exp(alpha) - 1) / (1 + np.exp(alpha)), 0.0)
+    return spread
+
+
+def _symbol_features(bars: np.ndarray, lookback: int) -> Dict[str, np.ndarray]:
+    """Trailing features over one symbol's own bars"""
+    close = bars[:, FIELDS.index("close")]
+    returns = np.full(len(close), np.nan)
+    returns[1:] = close[1:] / close[:-1] - 1
+    spread = high_low_spread(bars[:, FIELDS.index("high")], bars[:, FIELDS.index("low")])
+
+    return {
+        "adv": pd.Series(bars[:, FIELDS.index("volume")]).rolling(lookback, min_periods=1).mean().to_numpy(),
+        "volatility": pd.Series(returns).rolling(lookback, min_periods=2).std(ddof=0).to_numpy(),
+        "spread": pd.Series(spread).rolling(lookback, min_periods=1).mean().to_numpy(),
+    }
+
+
+def market_features(cube: PriceCube, lookback: int = 20) -> Dict[str, np.ndarray]:
+    """
+    (dates x symbols) arrays of trailing average bar volume (``adv``), per-bar
+    return volatility and high/low spread, as of each cube date.
+
+    Computed on each symbol's own bars (not the forward-filled grid) and cached
+    per cube and lookback.
+    """
+    per_cube = _feature_cache.setdefault(cube, {})
+    features = per_cube.get(lookback)
+    if features is not None:
+        return features
+
+    shape = cube.bar_count.shape
+    features = {name: np.full(shape, np.nan) for name in ("adv", "volatility", "spread")}
+    for s in range(len(cube.symbols)):
+        bars = cube.bars[cube.offsets[s]:cube.offsets[s + 1]]
+        if not len(bars):
+            continue
+        counts = cube.bar_count[:, s]
+        listed = counts > 0
+        bar_idx = counts[listed] - 1
+        for name, values in _symbol_features(bars, lookback).items():
+            features[name][listed, s] = values[bar_idx]
+
+    per_cube[lookback] = features
+    return features
+
+
+class CostModel(abc.ABC):
+    """
+    Base transaction cost model.
+
+    ``slippage`` returns the fraction of the price a fill moves against the
+    trade. Where a model's features are unavailable (no volume, too little
+    history) it falls back to the flat ``fallback_pct``.
+    """
+
+    name = "base"
+
+    def __init__(self, lookback: int = 20, fallback_pct: float = 0.001):
+        self.lookback = lookback
+        self.fallback_pct = fallback_pct
+        self.features: Optional[Dict[str, np.ndarray]] = None
+
+    def prepare(self, cube: PriceCube) -> None:
+        """Compute (or fetch cached) market features for a cube before a run"""
+        self.features = market_features(cube, self.lookback)
+
+    def slippage(
+        self,
+        row: Union[int, np.ndarray],
+        column: Union[int, np.ndarray],
+        quantity: Union[float, np.ndarray],
+        price: Union[float, np.ndarray]
+    ) -> Union[float, np.ndarray]:
+        """
+        Slippage fraction for fills of ``quantity`` at ``price``.
+
+        Args:
+            row: Cube row(s) of the fill
+            column: Cube symbol column(s)
+            quantity: Filled quantity (absolute)
+            price: Reference price before costs
+        """
+        rate = self._rate(row, column, np.abs(quantity), price)
+        rate = np.where(np.isfinite(rate), rate, self.fallback_pct)
+        return float(rate) if np.ndim(rate) == 0 else rate
+
+    @abc.abstractmethod
+    def _rate(self, row, column, quantity, price) -> np.ndarray:
+        pass
+
+    def _half_spread(self, row, column) -> np.ndarray:
+        return self.features["spread"][row, column] / 2
+
+    def _participation(self, row, column, quantity) -> np.ndarray:
+        adv = self.features["adv"][row, column]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(adv > 0, quantity / adv, np.nan)
+
+    def __repr__(self) -> str:
+        params = ", ".join(f"{k}={v!r}" for k, v in vars(self).items() if k != "features")
+        return f"{self.__class__.__name__}({params})"
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Features are recomputed from the cube in each process
+        return dict(vars(self), features=None)
+
+
+class FlatCostModel(CostModel):
+    """Constant slippage on every fill (the engine's original behaviour)"""
+
+    name = "flat"
+
+    def __init__(self, slippage_pct: float = 0.001):
+        super().__init__(fallback_pct=slippage_pct)
+
+    def prepare(self, cube: PriceCube) -> None:
+        pass
+
+    def slippage(self, row, column, quantity, price):
+        if np.ndim(quantity) == 0:
+            return self.fallback_pct
+        return np.full(np.shape(quantity), self.fallback_pct)
+
+    def _rate(self, row, column, quantity, price) -> np.ndarray:
+        return np.full(np.shape(quantity), self.fallback_pct)
+
+
+class SpreadCostModel(CostModel):
+    """Half the high/low spread estimate, i.e. the cost of crossing the spread"""
+
+    name = "spread"
+
+    def _rate(self, row, column, quantity, price) -> np.ndarray:
+        return self._half_spread(row, column)
+
+
+class VolumeParticipationCostModel(CostModel):
+    """
+    Half spread plus impact linear in participation: ``impact * quantity / adv``.
+
+    ``max_participation`` caps the participation rate used for the impact.
+    """
+
+    name = "volume"
+
+    def __init__(
+        self,
+        impact: float = 0.1,
+        max_participation: float = 1.0,
+        lookback: int = 20,
+        fallback_pct: float = 0.001
+    ):
+        super().__init__(lookback, fallback_pct)
+        self.impact = impact
+        self.max_participation = max_participation
+
+    def _rate(self, row, column, quantity, price) -> np.ndarray:
+        participation = np.minimum(self._participation(row, column, quantity), self.max_participation)
+        return self._half_spread(row, column) + self.impact * participation
+
+
+class SquareRootImpactCostModel(CostModel):
+    """Half spread plus square-root impact: ``impact * volatility * sqrt(quantity / adv)``"""
+
+    name = "sqrt"
+
+    def __init__(self, impact: float = 1.0, lookback: int = 20, fallback_pct: float = 0.001):
+        super().__init__(lookback, fallback_pct)
+        self.impact = impact
+
+    def _rate(self, row, column, quantity, price) -> np.ndarray:
+        volatility = self.features["volatility"][row, column]
+        return self._half_spread(row, column) + self.impact * volatility * np.sqrt(
+            self._participation(row, column, quantity)
+        )
+
+
+COST_MODELS = {
+    model.name: model
+    for model in (FlatCostModel, SpreadCostModel, VolumeParticipationCostModel, SquareRootImpactCostModel)
+}
+
+
+def make_cost_model(spec: Union[str, CostModel], slippage_pct: float = 0.001) -> CostModel:
+    """
+    Cost model from a name in ``COST_MODELS`` or an instance (returned as-is).
+
+    ``slippage_pct`` is the flat model's slippage and the other models' fallback.
+    """
+    if isinstance(spec, CostModel):
+        return spec
+    try:
+        model_class = COST_MODELS[spec]
+    except (KeyError, TypeError):
+        raise ValueError(f"Unknown cost model '{spec}', expected one of {list(COST_MODELS)}")
+    if model_class is FlatCostModel:
+        return FlatCostModel(slippage_pct)
+    return model_class(fallback_pct=slippage_pct)
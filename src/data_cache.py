@@ -0,0 +1,87 @@
+"""
+Binary columnar cache for historical CSV data.
+
+Each parsed CSV is stored next to the data as one ``.npy`` file per column plus
+a ``meta.json`` keyed on the source file's mtime and size. Later loads
+memory-map the columns instead of re-parsing the CSV.
+"""
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, Optional
+
+
+# Cache directory created inside the data directory
+CACHE_DIR_NAME = ".cache"
+
+
+def _source_key(file_path: str) -> Dict[str, Any]:
+    stat = os.stat(file_path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def _entry_dir(file_path: str, cache_dir: str) -> str:
+    return os.path.join(cache_dir, os.path.basename(file_path))
+
+
+def load_cached_frame(file_path: str, cache_dir: str) -> Optional[pd.DataFrame]:
+    """Frame cached for ``file_path``, or None if missing or stale"""
+    entry = _entry_dir(file_path, cache_dir)
+    meta_path = os.path.join(entry, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path) as f:
+        meta = json.load(f)
+    if meta.get("source") != _source_key(file_path):
+        return None
+
+    arrays = {}
+    for i, names in enumerate(meta["blocks"]):
+        # One (n_columns, n_rows) array per dtype keeps the number of files small
+        block = np.load(os.path.join(entry, f"{i}.npy"), mmap_mode="r")
+        arrays.update(zip(names, block))
+
+    index = None
+    if meta["has_index"]:
+        index = pd.Index(np.load(os.path.join(entry, "index.npy"), mmap_mode="r"))
+    columns = {name: arrays[name] for name in meta["columns"]}
+    return pd.DataFrame(columns, index=index, copy=False)
+
+
+def save_cached_frame(file_path: str, cache_dir: str, df: pd.DataFrame) -> None:
+    """Cache a parsed frame for ``file_path``"""
+    entry = _entry_dir(file_path, cache_dir)
+    # meta.json is written last and marks the entry complete
+    shutil.rmtree(entry, ignore_errors=True)
+    os.makedirs(entry)
+
+    blocks: Dict[str, list] = {}
+    for name in df.columns:
+        values = df[name].to_numpy()
+        if values.dtype == object or isinstance(df[name].dtype, pd.StringDtype):
+            # Object arrays can't be memory-mapped; store fixed-width strings
+            values = np.asarray(df[name].astype(str), dtype=str)
+        key = "U" if values.dtype.kind == "U" else values.dtype.str
+        blocks.setdefault(key, []).append((str(name), values))
+
+    block_columns = []
+    for i, columns in enumerate(blocks.values()):
+        block = np.stack([values for _, values in columns])
+        np.save(os.path.join(entry, f"{i}.npy"), block)
+        block_columns.append([name for name, _ in columns])
+
+    has_index = not df.index.equals(pd.RangeIndex(len(df)))
+    if has_index:
+        np.save(os.path.join(entry, "index.npy"), df.index.to_numpy())
+
+    meta = {
+        "source": _source_key(file_path),
+        "columns": [str(c) for c in df.columns],
+        "blocks": block_columns,
+        "has_index": has_index,
+    }
+    with open(os.path.join(entry, "meta.json"), "w") as f:
+        json.dump(meta, f)
@@ -0,0 +1,430 @@
+"""
+Incremental (streaming) technical indicators with O(1) updates per bar.
+"""
+import functools
+import math
+import threading
+import numpy as np
+import pandas as pd
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+from src.metrics import record_cache_hit, record_cache_miss
+
+
+# Exact sums are recomputed from the window buffer after this many evictions
+# to stop floating point drift accumulating over very long streams
+RESYNC_INTERVAL = 1000
+
+# Columns recognised as bar timestamps, in order of preference
+TIMESTAMP_COLUMNS = ("date", "timestamp", "begins_at")
+
+
+class RollingWindow:
+    """
+    Rolling mean and sample variance over the last ``window`` values.
+
+    Matches ``Series.rolling(window, min_periods).mean()/.std()``: NaN inputs
+    occupy a slot in the window but are excluded from the statistics.
+    """
+
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self._values: Deque[float] = deque()
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._evictions = 0
+
+    def update(self, value: float) -> None:
+        """Add a value, evicting the oldest once the window is full"""
+        self._values.append(value)
+        if not math.isnan(value):
+            self._add(value)
+
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            if not math.isnan(old):
+                self._remove(old)
+            self._evictions += 1
+            if self._evictions % RESYNC_INTERVAL == 0:
+                self._resync()
+
+    def _add(self, value: float) -> None:
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+    def _remove(self, value: float) -> None:
+        self._count -= 1
+        if self._count == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / self._count
+        self._m2 = max(0.0, self._m2 - delta * (value - self._mean))
+
+    def _resync(self) -> None:
+        valid = [v for v in self._values if not math.isnan(v)]
+        self._count = len(valid)
+        self._mean = math.fsum(valid) / self._count if valid else 0.0
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in valid)
+
+    @property
+    def count(self) -> int:
+        return self._count
+
+    @property
+    def mean(self) -> float:
+        if self._count == 0 or self._count < self.min_periods:
+            return float('nan')
+        return self._mean
+
+    @property
+    def var(self) -> float:
+        """Sample variance (ddof=1)"""
+        if self._count < max(self.min_periods, 2):
+            return float('nan')
+        return self._m2 / (self._count - 1)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.var)
+
+
+class EWMA:
+    """Exponentially weighted moving average, as ``ewm(span, adjust=False).mean()``"""
+
+    def __init__(self, span: int):
+        self.span = span
+        self.alpha = 2.0 / (span + 1)
+        self.value = float('nan')
+
+    def update(self, value: float) -> float:
+        if math.isnan(self.value):
+            self.value = value
+        else:
+            self.value = self.alpha * value + (1 - self.alpha) * self.value
+        return self.value
+
+
+class RollingRSI:
+    """
+    RSI from simple rolling means of gains and losses.
+
+    Matches the pandas computation in ``RSIStrategy`` (the first bar has no
+    change and yields NaN).
+    """
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._gains = RollingWindow(period, min_periods=1)
+        self._losses = RollingWindow(period, min_periods=1)
+        self._prev_close: Optional[float] = None
+        self.value = float('nan')
+
+    def update(self, close: float) -> float:
+        delta = float('nan') if self._prev_close is None else close - self._prev_close
+        self._prev_close = close
+        self._gains.update(max(delta, 0.0) if not math.isnan(delta) else delta)
+        self._losses.update(-min(delta, 0.0) if not math.isnan(delta) else delta)
+
+        rs = self._gains.mean / (self._losses.mean + 1e-9)
+        self.value = 100 - (100 / (1 + rs))
+        return self.value
+
+
+class WilderRSI:
+    """RSI with Wilder's smoothing (seeded by a simple mean over the first ``period`` changes)"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self._prev_close: Optional[float] = None
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+        self._changes = 0
+        self.value = float('nan')
+
+    def update(self, close: float) -> float:
+        if self._prev_close is None:
+            self._prev_close = close
+            return self.value
+
+        delta = close - self._prev_close
+        self._prev_close = close
+        gain = max(delta, 0.0)
+        loss = -min(delta, 0.0)
+        self._changes += 1
+
+        if self._changes <= self.period:
+            self._avg_gain += (gain - self._avg_gain) / self._changes
+            self._avg_loss += (loss - self._avg_loss) / self._changes
+            if self._changes < self.period:
+                return self.value
+        else:
+            self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+            self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+
+        if self._avg_loss == 0:
+            self.value = 100.0
+        else:
+            self.value = 100 - (100 / (1 + self._avg_gain / self._avg_loss))
+        return self.value
+
+
+class MACD:
+    """MACD line, signal line and histogram from incremental EMAs"""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self._fast = EWMA(fast_period)
+        self._slow = EWMA(slow_period)
+        self._signal = EWMA(signal_period)
+
+    def update(self, close: float) -> Dict[str, float]:
+        ema_fast = self._fast.update(close)
+        ema_slow = self._slow.update(close)
+        macd = ema_fast - ema_slow
+        signal_line = self._signal.update(macd)
+        return {
+            "ema_fast": ema_fast,
+            "ema_slow": ema_slow,
+            "macd": macd,
+            "signal_line": signal_line,
+            "histogram": macd - signal_line
+        }
+
+
+class BollingerBands:
+    """Bollinger Bands from an incremental rolling mean and variance"""
+
+    def __init__(self, window: int = 20, num_std: float = 2.0):
+        self.num_std = num_std
+        self._window = RollingWindow(window)
+
+    def update(self, close: float) -> Dict[str, float]:
+        self._window.update(close)
+        middle_band = self._window.mean
+        std = self._window.std
+        upper_band = middle_band + (std * self.num_std)
+        lower_band = middle_band - (std * self.num_std)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent_b = float(np.float64(close - lower_band) / np.float64(upper_band - lower_band))
+        return {
+            "middle_band": middle_band,
+            "std": std,
+            "upper_band": upper_band,
+            "lower_band": lower_band,
+            "percent_b": percent_b
+        }
+
+
+def bar_timestamps(df: pd.DataFrame) -> Optional[np.ndarray]:
+    """Timestamps of a frame's bars (timestamp column or DatetimeIndex), if it has any"""
+    for column in TIMESTAMP_COLUMNS:
+        if column in df.columns:
+            values = df[column].values
+            if np.issubdtype(values.dtype, np.datetime64):
+                return values
+            return pd.to_datetime(df[column]).to_numpy()
+    if isinstance(df.index, pd.DatetimeIndex):
+        return df.index.values
+    return None
+
+
+class IndicatorStream:
+    """
+    Incremental indicator state for one symbol.
+
+    Remembers the last bar it consumed, so each ``consume`` call only feeds
+    bars newer than that (O(1) per new bar). If the history no longer lines up
+    with what was consumed - a gap, a revised bar or a frame without
+    timestamps - the state is rebuilt from the full frame.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        step: Callable[[Any, float], Dict[str, float]]
+    ):
+        self._factory = factory
+        self._step = step
+        self.reset()
+
+    def reset(self) -> None:
+        self.indicators = self._factory()
+        self.rows: Deque[Dict[str, float]] = deque(maxlen=2)
+        self.bars_seen = 0
+        self._last_timestamp = None
+        self._last_close: Optional[float] = None
+        self._source: Optional[pd.DataFrame] = None
+        self._source_len = 0
+
+    @property
+    def last_row(self) -> Optional[Dict[str, float]]:
+        return self.rows[-1] if self.rows else None
+
+    @property
+    def prev_row(self) -> Optional[Dict[str, float]]:
+        return self.rows[-2] if len(self.rows) > 1 else None
+
+    def consume(self, df: pd.DataFrame) -> int:
+        """Feed the bars of ``df`` not seen yet and return how many were fed"""
+        if df.empty:
+            return 0
+        return self.advance(df, df['close'].values, bar_timestamps(df))
+
+    def advance(
+        self,
+        df: pd.DataFrame,
+        close_column: np.ndarray,
+        timestamps: Optional[np.ndarray]
+    ) -> int:
+        """``consume`` with the close column and timestamps already extracted from ``df``"""
+        # Frames without timestamps can only be matched by identity
+        if df is self._source and len(df) == self._source_len:
+            return 0
+
+        start = self._resume_position(timestamps, close_column)
+        if start is None:
+            self.reset()
+            start = 0
+
+        # Only the unseen tail is converted, keeping the per-call cost O(new bars)
+        closes = np.asarray(close_column[start:], dtype=np.float64)
+        for close in closes:
+            row = self._step(self.indicators, float(close))
+            row["close"] = float(close)
+            self.rows.append(row)
+            self.bars_seen += 1
+
+        self._last_timestamp = timestamps[-1] if timestamps is not None else None
+        self._last_close = float(close_column[-1])
+        self._source = df
+        self._source_len = len(df)
+        return len(closes)
+
+    def _resume_position(self, timestamps: Optional[np.ndarray], closes: np.ndarray) -> Optional[int]:
+        """Index of the first unseen bar, or None if the state must be rebuilt"""
+        if timestamps is None or self._last_timestamp is None:
+            return None
+
+        position = int(np.searchsorted(timestamps, self._last_timestamp, side='right'))
+        if position == 0 or timestamps[position - 1] != self._last_timestamp:
+            return None
+        if closes[position - 1] != self._last_close:
+            return None
+        return position
+
+
+def _rolling_window(window: int) -> RollingWindow:
+    return RollingWindow(window, min_periods=1)
+
+
+def _rolling_step(window: RollingWindow, close: float) -> Dict[str, float]:
+    window.update(close)
+    return {"mean": window.mean, "std": window.std, "count": window.count}
+
+
+def _ema_step(ewma: EWMA, close: float) -> Dict[str, float]:
+    return {"ema": ewma.update(close)}
+
+
+def _rsi_step(rsi: Any, close: float) -> Dict[str, float]:
+    return {"rsi": rsi.update(close)}
+
+
+def _update_step(indicator: Any, close: float) -> Dict[str, float]:
+    return indicator.update(close)
+
+
+# Indicator kinds served by IndicatorCache: name -> (factory(*params), step)
+INDICATORS: Dict[str, Tuple[Callable[..., Any], Callable[[Any, float], Dict[str, float]]]] = {
+    "rolling": (_rolling_window, _rolling_step),      # (window,) - apply min_periods via "count"
+    "ema": (EWMA, _ema_step),                         # (span,)
+    "rsi": (RollingRSI, _rsi_step),                   # (period,)
+    "wilder_rsi": (WilderRSI, _rsi_step),             # (period,)
+    "macd": (MACD, _update_step),                     # (fast, slow, signal)
+    "bollinger": (BollingerBands, _update_step),      # (window, num_std)
+}
+
+
+class IndicatorCache:
+    """
+    Memoized incremental indicators shared by every strategy in a registry.
+
+    Entries are keyed by (symbol, indicator, params) and remember the last bar
+    they were advanced to, so a lookup for a bar that has already been
+    computed is a hit with no work - each indicator is computed once per
+    symbol per bar however many strategies ask for it. Hits and misses are
+    counted locally and exported to Prometheus under ``cache_name``.
+    """
+
+    def __init__(self, cache_name: str = "indicators"):
+        self.cache_name = cache_name
+        self._streams: Dict[Tuple[str, str, Tuple[Any, ...]], IndicatorStream] = {}
+        # Last frame seen per symbol with its extracted closes and timestamps,
+        # so several lookups against the same frame only touch pandas once
+        self._frames: Dict[str, Tuple[pd.DataFrame, np.ndarray, Optional[np.ndarray]]] = {}
+        self.hits = 0
+        self.misses = 0
+        # Strategies sharing the cache may run in worker threads
+        self._lock = threading.RLock()
+
+    def get(self, symbol: str, df: pd.DataFrame, indicator: str, *params: Any) -> IndicatorStream:
+        """Return the (symbol, indicator, params) stream advanced to the last bar of ``df``"""
+        with self._lock:
+            return self._get(symbol, df, indicator, *params)
+
+    def _get(self, symbol: str, df: pd.DataFrame, indicator: str, *params: Any) -> IndicatorStream:
+        key = (symbol, indicator, params)
+        stream = self._streams.get(key)
+        if stream is None:
+            factory, step = INDICATORS[indicator]
+            # A partial rather than a lambda keeps the cache picklable for worker processes
+            stream = IndicatorStream(functools.partial(factory, *params), step)
+            self._streams[key] = stream
+
+        frame = self._frames.get(symbol)
+        if frame is None or frame[0] is not df:
+            frame = (df, df['close'].values, bar_timestamps(df))
+            self._frames[symbol] = frame
+
+        fed = stream.advance(*frame) if len(df) else 0
+        if fed or stream.last_row is None:
+            self.misses += 1
+            record_cache_miss(self.cache_name)
+        else:
+            self.hits += 1
+            record_cache_hit(self.cache_name)
+        return stream
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._streams),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """Drop cached state for one symbol, or everything"""
+        with self._lock:
+            if symbol is None:
+                self._streams.clear()
+                self._frames.clear()
+            else:
+                for key in [k for k in self._streams if k[0] == symbol]:
+                    del self._streams[key]
+                self._frames.pop(symbol, None)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks don't pickle; each process gets its own
+        return {k: v for k, v in vars(self).items() if k != "_lock"}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        vars(self).update(state)
+        self._lock = threading.RLock()
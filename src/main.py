@@ -2,20 +2,28 @@ import asyncio
 import sys
 import time
 import argparse
+import dataclasses
 import json
 import os
 from datetime import datetime, timedelta, timezone
 from typing import Dict, Any, List, Optional, Tuple
 
 from src.api import RobinhoodClient
+from src.blocking_calls import RateLimiter
 from src.utils.logger import logger
-from src.config import MODE, TRADING_INTERVAL_MINUTES, MAX_TRADES_PER_DAY
+from src.config import (
+    MODE, TRADING_INTERVAL_MINUTES, MAX_TRADES_PER_DAY, STRATEGY_DEADLINE_SECONDS, MARKET_DATA_CONCURRENCY,
+    BAR_CACHE_DIR, QUOTE_TTL_SECONDS, ORDER_RATE_PER_SECOND, ORDER_BURST, EXECUTION_CONCURRENCY,
+    PRICE_DRIFT_TOLERANCE
+)
 from src.trading_utils import is_market_open
 from src.exceptions import TradingSystemError, RobinhoodAPIError
 from src.execution import CircuitBreaker, AntiGamingSystem, AntiGamingConfig, StrategyExecutor
+from src.market_data import BarCache, CycleFetcher, QuoteSnapshot
+from src.pipeline import InFlightSymbols, Pipeline, Stage
 
 # Import new trading framework components
-from src.strategy_framework import StrategyRegistry, MovingAverageCrossStrategy, RSIStrategy, Signal, SignalType
+from src.strategy_framework import StrategyRegistry, StrategyWatcher, MovingAverageCrossStrategy, RSIStrategy, Signal, SignalType
 from src.risk_management import RiskManager, RiskParameters, PositionSizing
 from src.ai_trading_engine import AITradingEngine, AITradingStrategy
 
@@ -35,8 +43,31 @@ class TradingBot:
         self.circuit_breaker = CircuitBreaker()
         self._lock = asyncio.Lock()
         
-        # Initialize strategy registry
+        # Historical bars, fetched concurrently once per cycle and shared by
+        # analysis and execution (rh_client is resolved at call time)
+        self.history_fetcher = CycleFetcher(
+            lambda symbol: self.rh_client.get_historical_data(symbol),
+            max_concurrency=MARKET_DATA_CONCURRENCY,
+            name="historical_data"
+        )
+        # Quotes for all signalled symbols in one request, shared by sizing,
+        # risk checks and execution; orders are paced to the API's budget
+        self.quote_snapshot = QuoteSnapshot(
+            lambda symbols: self.rh_client.get_quotes(symbols),
+            ttl=QUOTE_TTL_SECONDS
+        )
+        self.order_limiter = RateLimiter(rate=ORDER_RATE_PER_SECOND, burst=ORDER_BURST)
+        # Symbols with an order being executed; later cycles skip them. Buys
+        # not executed yet reserve their notional so cycles can't spend the
+        # same cash twice.
+        self.in_flight = InFlightSymbols()
+        self.reserved_notional: Dict[str, float] = {}
+        # Orders being executed, counted against the daily trade limit
+        self.orders_executing = 0
+        
+        # Initialize strategy registry; edited strategy modules are hot-reloaded between cycles
         self.strategy_registry = self._setup_strategies()
+        self.strategy_watcher = StrategyWatcher(self.strategy_registry, package="strategies", default_weight=0.3)
         
         # Initialize risk manager
         self.risk_manager = RiskManager()
@@ -58,12 +89,17 @@ class TradingBot:
         )
         
     async def run(self):
-        """Main trading loop"""
+        """Main trading loop
+        
+        Each cycle is queued into the staged pipeline (fetch -> signals -> risk
+        -> execution), so the next cycle's analysis runs while slow executions
+        from earlier cycles are still being worked.
+        """
         logger.info(f"Starting trading bot session {'(DEMO MODE)' if self.demo_mode else ''}")
         
         try:
             if self.rh_client is None:
-                self.rh_client = RobinhoodClient()
+                self.rh_client = RobinhoodClient(bar_cache=BarCache(BAR_CACHE_DIR or None))
             
             if not await self.rh_client.authenticate():
                 logger.error("Failed to authenticate with Robinhood")
@@ -71,51 +107,118 @@ class TradingBot:
                     raise RobinhoodAPIError("authentication", 401, "Failed to authenticate with Robinhood")
                 else:
                     sys.exit(1)
-                
-            while True:
-                try:
-                    # Check if circuit breaker is active
-                    if self.circuit_breaker.is_active():
-                        logger.warning("Circuit breaker active - pausing trading operations")
-                        await asyncio.sleep(60)
-                        continue
+            
+            pipeline = self._build_pipeline()
+            pipeline.start()
+            cycle = 0
+            try:
+                while True:
+                    try:
+                        # Check if circuit breaker is active
+                        if self.circuit_breaker.is_active():
+                            logger.warning("Circuit breaker active - pausing trading operations")
+                            await pipeline.wait(60)
+                            continue
+                            
+                        if not await self._should_run():
+                            await pipeline.wait(60)
+                            continue
                         
-                    if not await self._should_run():
-                        await asyncio.sleep(60)
-                        continue
+                        # Waits only while the previous cycle's data fetch is still queued
+                        cycle += 1
+                        await pipeline.put(cycle)
                         
-                    async with self._lock:  # Thread safety for metrics
-                        decisions = await self._analyze_and_decide()
-                        await self._execute_trades(decisions)
-                    
-                    if self.demo_mode:
-                        self._display_demo_status()
+                        if self.demo_mode:
+                            self._display_demo_status()
+                            
+                        await pipeline.wait(TRADING_INTERVAL_MINUTES * 60)
                         
-                    await asyncio.sleep(TRADING_INTERVAL_MINUTES * 60)
-                    
-                except RobinhoodAPIError as e:
-                    self.metrics['errors'] += 1
-                    logger.error(f"Robinhood API error: {e.message}")
-                    self.circuit_breaker.trip(duration_seconds=300)  # 5 minute pause
-                    await asyncio.sleep(10)
-                    
-                except TradingSystemError as e:
-                    self.metrics['errors'] += 1
-                    logger.error(f"Trading system error: {str(e)}")
-                    await asyncio.sleep(30)
-                    
-                except Exception as e:
-                    self.metrics['errors'] += 1
-                    logger.error(f"Critical error in trading loop: {str(e)}")
-                    if not self.demo_mode:
-                        raise
-                    await asyncio.sleep(10)  # Recover in demo mode
+                    except RobinhoodAPIError as e:
+                        self.metrics['errors'] += 1
+                        logger.error(f"Robinhood API error: {e.message}")
+                        self.circuit_breaker.trip(duration_seconds=300)  # 5 minute pause
+                        await asyncio.sleep(10)
+                        
+                    except TradingSystemError as e:
+                        self.metrics['errors'] += 1
+                        logger.error(f"Trading system error: {str(e)}")
+                        await asyncio.sleep(30)
+                        
+                    except Exception as e:
+                        self.metrics['errors'] += 1
+                        logger.error(f"Critical error in trading loop: {str(e)}")
+                        if not self.demo_mode:
+                            raise
+                        await asyncio.sleep(10)  # Recover in demo mode
+            finally:
+                await pipeline.stop()
                     
         except Exception as e:
             logger.critical(f"Fatal error in trading bot: {str(e)}")
             if not self.demo_mode:
                 sys.exit(1)
 
+    def _build_pipeline(self) -> Pipeline:
+        """Trading cycle stages connected by bounded queues"""
+        return Pipeline([
+            Stage("fetch", self._fetch_stage),
+            Stage("signals", self._signal_stage),
+            Stage("risk", self._risk_stage),
+            Stage(
+                "execute",
+                self._execution_stage,
+                workers=EXECUTION_CONCURRENCY,
+                queue_size=EXECUTION_CONCURRENCY
+            ),
+        ], on_error=self._on_pipeline_error)
+
+    async def _fetch_stage(self, cycle: int) -> List[Dict[str, Any]]:
+        logger.info(f"Analyzing market (cycle {cycle})...")
+        return [await self._fetch_cycle_data()]
+
+    async def _signal_stage(self, strategy_data: Dict[str, Any]) -> List[Tuple[Dict[str, Signal], Dict[str, Any]]]:
+        signals = await self._generate_signals(strategy_data)
+        if not signals:
+            logger.info("No trading signals to execute")
+            return []
+        return [(signals, strategy_data)]
+
+    async def _risk_stage(self, item: Tuple[Dict[str, Signal], Dict[str, Any]]) -> List[Dict[str, Any]]:
+        signals, strategy_data = item
+        return await self._plan_trades(signals, strategy_data)
+
+    async def _execution_stage(self, order: Dict[str, Any]) -> None:
+        if self.circuit_breaker.is_active():
+            # Planned before the breaker tripped; drop rather than trade into it
+            logger.warning(f"Circuit breaker active - dropping order for {order['symbol']}")
+            self._release_order(order["symbol"])
+            return
+        if self.trade_count + self.orders_executing >= MAX_TRADES_PER_DAY:
+            # Orders of overlapping cycles were planned before earlier ones executed
+            logger.info(f"Reached daily trade limit of {MAX_TRADES_PER_DAY} - dropping order for {order['symbol']}")
+            self._release_order(order["symbol"])
+            return
+        self.orders_executing += 1
+        try:
+            trade_record = await self._execute_order(order)
+        finally:
+            self.orders_executing -= 1
+        if trade_record:
+            self._record_trades([trade_record])
+
+    def _on_pipeline_error(self, stage: str, item: Any, error: Exception) -> None:
+        """Handle a stage error; raising stops the pipeline (and the bot)"""
+        self.metrics['errors'] += 1
+        if isinstance(error, RobinhoodAPIError):
+            logger.error(f"Robinhood API error in {stage} stage: {error.message}")
+            self.circuit_breaker.trip(duration_seconds=300)  # 5 minute pause
+        elif isinstance(error, TradingSystemError):
+            logger.error(f"Trading system error in {stage} stage: {str(error)}")
+        else:
+            logger.error(f"Critical error in {stage} stage: {str(error)}")
+            if not self.demo_mode:
+                raise error
+
     async def _should_run(self) -> bool:
         """Check if trading should continue"""
         try:
@@ -150,7 +253,7 @@ class TradingBot:
         """Set up and register trading strategies"""
         registry = StrategyRegistry()
 
-        # Automatically discover and register all plugin strategies
+        # Discover plugin strategies; their modules are imported on first use
         registry.auto_discover_and_register(package="strategies", default_weight=0.3)
 
         
@@ -167,243 +270,302 @@ class TradingBot:
         
         return registry
     
-    async def _analyze_and_decide(self) -> Dict[str, Signal]:
-        """Perform market analysis and get trading decisions
+    async def _fetch_cycle_data(self) -> Dict[str, Any]:
+        """Fetch one cycle's market data, portfolio and per-symbol bar history
         
         Returns:
-            Dictionary of trading signals by symbol
-            
-        Raises:
-            TradingSystemError: If decision making fails
+            Strategy input: "market_data", "portfolio" and a bar frame per symbol
         """
-        logger.info("Analyzing market...")
-        try:
-            # Get market data
-            market_data = await self.rh_client.get_market_data()
-            portfolio = await self.rh_client.get_portfolio()
-            
-            # Prepare data for strategies
-            strategy_data = {
-                "market_data": market_data,
-                "portfolio": portfolio
-            }
-            
-            # Get historical data for technical analysis
-            for symbol in portfolio.get("positions", {}).keys():
-                historical_data = await self.rh_client.get_historical_data(symbol)
-                if historical_data:
-                    strategy_data[symbol] = historical_data
-            
-            # Add watchlist symbols
-            watchlist = await self.rh_client.get_watchlist()
-            for symbol in watchlist:
-                if symbol not in strategy_data:
-                    historical_data = await self.rh_client.get_historical_data(symbol)
-                    if historical_data:
-                        strategy_data[symbol] = historical_data
-            
-            # Generate signals using strategy registry
-            signals = self.strategy_registry.get_combined_signals(strategy_data)
-            
-            # Update metrics
-            self.metrics['decisions_made'] += len(signals)
-            self.metrics['last_decision_time'] = datetime.now(timezone.utc)
-            logger.debug(f"Generated {len(signals)} trading signals")
-            
-            return signals
+        self.history_fetcher.start_cycle()
+        
+        # Get market data
+        market_data, portfolio, watchlist = await asyncio.gather(
+            self.rh_client.get_market_data(),
+            self.rh_client.get_portfolio(),
+            self.rh_client.get_watchlist()
+        )
+        
+        # Prepare data for strategies
+        strategy_data = {
+            "market_data": market_data,
+            "portfolio": portfolio
+        }
+        
+        # Get historical data for technical analysis, positions first and then
+        # the watchlist, all fetched concurrently. The client's bar cache
+        # returns the same frame until new bars arrive, so technical
+        # strategies advance their per-symbol indicator state by only the
+        # bars added since the previous cycle.
+        symbols = [
+            symbol for symbol in [*portfolio.get("positions", {}).keys(), *watchlist]
+            if symbol not in strategy_data
+        ]
+        strategy_data.update(await self.history_fetcher.get_many(symbols))
+        return strategy_data
+
+    async def _generate_signals(self, strategy_data: Dict[str, Any]) -> Dict[str, Signal]:
+        """Run the registered strategies on a cycle's data
+        
+        Args:
+            strategy_data: Output of ``_fetch_cycle_data``
             
-        except Exception as e:
-            self.metrics['errors'] += 1
-            logger.error(f"Decision making failed: {str(e)}")
-            if not self.demo_mode:
-                raise TradingSystemError(f"Decision making failed: {str(e)}")
-            return {}
+        Returns:
+            Dictionary of trading signals by symbol
+        """
+        # Edited strategy modules are reloaded here, never while strategies run
+        async with self._lock:
+            reloaded = self.strategy_watcher.poll()
+            if reloaded:
+                logger.info(f"Hot-reloaded strategies: {', '.join(reloaded)}")
             
-    async def _execute_trades(self, signals: Dict[str, Signal]):
-        """Execute trading signals with risk management
+            # Generate signals using strategy registry; AI strategies are awaited
+            # concurrently and slow strategies are dropped from this cycle
+            signals = await self.strategy_registry.get_combined_signals_async(
+                strategy_data, deadline=STRATEGY_DEADLINE_SECONDS
+            )
+            if self.strategy_registry.last_dropped:
+                logger.warning(
+                    f"Strategies dropped for missing the deadline: {', '.join(self.strategy_registry.last_dropped)}"
+                )
+        
+        # Update metrics
+        self.metrics['decisions_made'] += len(signals)
+        self.metrics['last_decision_time'] = datetime.now(timezone.utc)
+        logger.debug(f"Generated {len(signals)} trading signals")
+        
+        return signals
+
+    async def _plan_trades(
+        self,
+        signals: Dict[str, Signal],
+        strategy_data: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Size and risk-check signals into orders
+        
+        Each returned order claims its symbol in ``self.in_flight`` (and a buy
+        reserves its notional) until ``_execute_order`` finishes with it;
+        signals for symbols that already have an order in flight (from an
+        earlier cycle) are skipped.
         
         Args:
             signals: Dictionary of trading signals by symbol
+            strategy_data: The cycle's strategy input, whose bar frames are
+                reused (fetched again if None)
+            
+        Returns:
+            Orders with "symbol", "signal", "price", "position_sizing",
+            "market_data" and "portfolio_value"
             
         Raises:
-            RobinhoodAPIError: If API calls fail
-            TradingSystemError: For other execution errors
+            TradingSystemError: If account info is unavailable
         """
-        if not signals:
-            logger.info("No trading signals to execute")
-            return
-             
+        # Get account info with retry logic
+        account_info = await self.rh_client.get_account_info()
+        if not account_info:
+            error_msg = "Cannot execute trades - failed to get account info"
+            logger.error(error_msg)
+            raise TradingSystemError(error_msg)
+        
+        # Get portfolio data for risk management; queued and in-flight buys
+        # from earlier cycles have already committed part of the cash (a
+        # pending buy turns cash into stock, so equity is unchanged)
+        portfolio = await self.rh_client.get_portfolio()
+        portfolio_value = account_info.get('portfolio_value', 0.0)
+        cash_balance = account_info.get('cash', 0.0) - sum(self.reserved_notional.values())
+        
+        # Update risk manager with current portfolio
+        portfolio_data = {
+            "portfolio_value": portfolio_value,
+            "cash": cash_balance,
+            "positions": portfolio.get("positions", {})
+        }
+        self.risk_manager.update_portfolio(portfolio_data)
+        
+        # Get market data for volatility calculation (fetched during analysis)
+        # and one quote snapshot for every signalled symbol
+        if strategy_data is None:
+            histories, quotes = await asyncio.gather(
+                self.history_fetcher.get_many(signals.keys()),
+                self.quote_snapshot.get_many(signals.keys())
+            )
+        else:
+            histories = {symbol: strategy_data[symbol] for symbol in signals if symbol in strategy_data}
+            quotes = await self.quote_snapshot.get_many(signals.keys())
+        market_data = {}
+        for symbol, bars in histories.items():
+            market_data[symbol] = {
+                "historical_prices": bars["close"].dropna().tolist(),
+                "sector": portfolio.get("positions", {}).get(symbol, {}).get("sector", "Unknown"),
+                "quote": quotes.get(symbol)
+            }
+        
+        orders = []
+        for symbol, signal in signals.items():
+            if not (signal.is_buy or signal.is_sell):
+                logger.info(f"No action taken for {symbol} (signal: HOLD)")
+                continue
+            if not self.in_flight.claim(symbol):
+                logger.info(f"Skipping {symbol}: an order is already in flight")
+                continue
+            try:
+                # Get current price from the cycle's quote snapshot
+                quote = quotes.get(symbol)
+                if not quote or "last_price" not in quote:
+                    logger.error(f"Failed to get quote for {symbol}")
+                    self._release_order(symbol)
+                    continue
+                
+                price = float(quote["last_price"])
+                
+                # Calculate volatility
+                volatility = self.risk_manager.calculate_volatility(symbol, market_data)
+                
+                # Calculate position size
+                position_sizing = self.risk_manager.calculate_position_size(
+                    signal, price, volatility, market_data
+                )
+                
+                # Validate trade against risk parameters
+                valid, reason = self.risk_manager.validate_trade(
+                    signal, position_sizing, market_data
+                )
+                
+                if valid and signal.is_buy and position_sizing.notional_value > self.risk_manager.cash_balance:
+                    valid, reason = False, "Insufficient unreserved cash"
+                
+                if not valid:
+                    logger.info(f"Trade rejected for {symbol}: {reason}")
+                    self._release_order(symbol)
+                    continue
+                
+                if signal.is_buy:
+                    # Later orders of this and other cycles spend only the cash left
+                    self.reserved_notional[symbol] = position_sizing.notional_value
+                    self.risk_manager.cash_balance -= position_sizing.notional_value
+                
+                orders.append({
+                    "symbol": symbol,
+                    "signal": signal,
+                    "price": price,
+                    "position_sizing": position_sizing,
+                    "market_data": market_data,
+                    "portfolio_value": portfolio_value
+                })
+            except Exception as e:
+                self._release_order(symbol)
+                try:
+                    self._handle_trade_error(symbol, e)
+                except Exception:
+                    # The orders planned so far will never be executed
+                    for planned in orders:
+                        self._release_order(planned["symbol"])
+                    raise
+
+        return orders
+
+    async def _execute_order(self, order: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Execute a planned order with anti-gaming protection and release its symbol
+        
+        Args:
+            order: Order from ``_plan_trades``
+            
+        Returns:
+            Trade record for the feedback loop, or None if nothing was executed
+        """
+        symbol = order["symbol"]
+        signal = order["signal"]
+        price = order["price"]
+        position_sizing = order["position_sizing"]
+        side = "buy" if signal.is_buy else "sell"
         try:
-            # Get account info with retry logic
-            account_info = await self.rh_client.get_account_info()
-            if not account_info:
-                error_msg = "Cannot execute trades - failed to get account info"
-                logger.error(error_msg)
-                raise TradingSystemError(error_msg)
+            # The order may have waited behind slow executions: trade at the
+            # current price, or not at all if it moved away from the sizing price
+            quote = await self.quote_snapshot.get(symbol)
+            if not quote or "last_price" not in quote:
+                logger.error(f"Failed to get quote for {symbol}")
+                return None
+            current_price = float(quote["last_price"])
+            drift = abs(current_price / price - 1) if price > 0 else float("inf")
+            if drift > PRICE_DRIFT_TOLERANCE:
+                logger.info(f"Dropping order for {symbol}: price moved {drift:.2%} since it was sized")
+                return None
+            price = current_price
             
-            # Get portfolio data for risk management
-            portfolio = await self.rh_client.get_portfolio()
-            portfolio_value = account_info.get('portfolio_value', 0.0)
-            cash_balance = account_info.get('cash', 0.0)
+            # Update the strategy executor with the current account balance
+            self.strategy_executor.account_balance = order["portfolio_value"]
             
-            # Update risk manager with current portfolio
-            portfolio_data = {
-                "portfolio_value": portfolio_value,
-                "cash": cash_balance,
-                "positions": portfolio.get("positions", {})
-            }
-            self.risk_manager.update_portfolio(portfolio_data)
+            # Update market conditions for adaptive anti-gaming
+            volatility = self.risk_manager.calculate_volatility(symbol, order["market_data"])
+            volume = 1.0  # Default value, should be calculated from market data if available
+            self.anti_gaming.update_market_conditions(volatility, volume)
             
-            # Get market data for volatility calculation
-            market_data = {}
-            for symbol in signals.keys():
-                historical_data = await self.rh_client.get_historical_data(symbol)
-                if historical_data:
-                    market_data[symbol] = {
-                        "historical_prices": [bar["close"] for bar in historical_data if "close" in bar],
-                        "sector": portfolio.get("positions", {}).get(symbol, {}).get("sector", "Unknown")
-                    }
+            # Execute with anti-gaming protection
+            await self.order_limiter.acquire()
+            result = await self.anti_gaming.execute_with_protection(
+                symbol=symbol,
+                side=side,
+                size=position_sizing.quantity,
+                price=price,
+                exchange_api=self.rh_client,
+                execution_strategy="auto"  # Let the system choose the best strategy
+            )
             
-            # Execute each trade decision
-            executed_trades = []
-            for symbol, signal in signals.items():
-                try:
-                    # Get current price
-                    quote = await self.rh_client.get_quote(symbol)
-                    if not quote or "last_price" not in quote:
-                        logger.error(f"Failed to get quote for {symbol}")
-                        continue
-                    
-                    price = float(quote["last_price"])
-                    
-                    # Calculate volatility
-                    volatility = self.risk_manager.calculate_volatility(symbol, market_data)
-                    
-                    # Calculate position size
-                    position_sizing = self.risk_manager.calculate_position_size(
-                        signal, price, volatility, market_data
-                    )
-                    
-                    # Validate trade against risk parameters
-                    valid, reason = self.risk_manager.validate_trade(
-                        signal, position_sizing, market_data
-                    )
-                    
-                    if not valid:
-                        logger.info(f"Trade rejected for {symbol}: {reason}")
-                        continue
-                    
-                    # Update the strategy executor with the current account balance
-                    self.strategy_executor.account_balance = portfolio_value
-                    
-                    # Update market conditions for adaptive anti-gaming
-                    volatility = self.risk_manager.calculate_volatility(symbol, market_data)
-                    volume = 1.0  # Default value, should be calculated from market data if available
-                    self.anti_gaming.update_market_conditions(volatility, volume)
-                    
-                    # Execute based on signal type with anti-gaming protection
-                    if signal.is_buy:
-                        # Create signal object for strategy executor
-                        execution_signal = Signal()
-                        execution_signal.symbol = symbol
-                        execution_signal.action = "buy"
-                        execution_signal.quantity = position_sizing.quantity
-                        execution_signal.price = price
-                        execution_signal.confidence = signal.confidence
-                        
-                        # Execute with anti-gaming protection
-                        result = await self.anti_gaming.execute_with_protection(
-                            symbol=symbol,
-                            side="buy",
-                            size=position_sizing.quantity,
-                            price=price,
-                            exchange_api=self.rh_client,
-                            execution_strategy="auto"  # Let the system choose the best strategy
-                        )
-                        
-                        self._log_trade("BUY", symbol, signal, position_sizing, result)
-                        
-                        # Record trade for feedback loop
-                        trade_record = {
-                            "symbol": symbol,
-                            "action": "buy",
-                            "quantity": position_sizing.quantity,
-                            "price": price,
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                            "confidence": signal.confidence,
-                            "strategy": result.get("strategy", "simple"),
-                            "result": "success" if result.get("success", False) else "failed"
-                        }
-                        executed_trades.append(trade_record)
-                        
-                    elif signal.is_sell:
-                        # Create signal object for strategy executor
-                        execution_signal = Signal()
-                        execution_signal.symbol = symbol
-                        execution_signal.action = "sell"
-                        execution_signal.quantity = position_sizing.quantity
-                        execution_signal.price = price
-                        execution_signal.confidence = signal.confidence
-                        
-                        # Execute with anti-gaming protection
-                        result = await self.anti_gaming.execute_with_protection(
-                            symbol=symbol,
-                            side="sell",
-                            size=position_sizing.quantity,
-                            price=price,
-                            exchange_api=self.rh_client,
-                            execution_strategy="auto"  # Let the system choose the best strategy
-                        )
-                        
-                        self._log_trade("SELL", symbol, signal, position_sizing, result)
-                        
-                        # Record trade for feedback loop
-                        trade_record = {
-                            "symbol": symbol,
-                            "action": "sell",
-                            "quantity": position_sizing.quantity,
-                            "price": price,
-                            "timestamp": datetime.now(timezone.utc).isoformat(),
-                            "confidence": signal.confidence,
-                            "strategy": result.get("strategy", "simple"),
-                            "result": "success" if result.get("success", False) else "failed"
-                        }
-                        
-                    else:
-                        logger.info(f"No action taken for {symbol} (signal: HOLD)")
-                        continue
-                    
-                    # Update metrics
-                    self.trade_count += 1
-                    self.metrics['trades_executed'] += 1
-                    self.last_trade_time = datetime.now(timezone.utc)
-                    
-                    # Add delay between trades to avoid rate limiting
-                    await asyncio.sleep(1)
-                    
-                except RobinhoodAPIError as e:
-                    self.metrics['errors'] += 1
-                    logger.error(f"Robinhood API error for {symbol}: {e.message}")
-                    if not self.demo_mode:
-                        raise
-                except Exception as e:
-                    self.metrics['errors'] += 1
-                    logger.error(f"Trade execution failed for {symbol}: {str(e)}")
-                    if not self.demo_mode:
-                        raise TradingSystemError(f"Trade execution failed: {str(e)}")
+            self._log_trade(side.upper(), symbol, signal, position_sizing, result)
             
-            # Update trade history
-            self.trade_history.extend(executed_trades)
+            # Update metrics
+            self.trade_count += 1
+            self.metrics['trades_executed'] += 1
+            self.last_trade_time = datetime.now(timezone.utc)
+            self.order_limiter.success()
+            # The fill moves the price; later readers get a fresh quote
+            self.quote_snapshot.invalidate([symbol])
+            
+            # Record trade for feedback loop
+            return {
+                "symbol": symbol,
+                "action": side,
+                "quantity": position_sizing.quantity,
+                "price": price,
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "confidence": signal.confidence,
+                "strategy": result.get("strategy", "simple"),
+                "result": "success" if result.get("success", False) else "failed"
+            }
             
-            # Provide feedback to AI engine
-            if executed_trades:
-                self.ai_engine.feedback_loop(executed_trades)
-                
         except Exception as e:
-            self.metrics['errors'] += 1
-            logger.error(f"Trade execution batch failed: {str(e)}")
+            self._handle_trade_error(symbol, e)
+            return None
+        finally:
+            self._release_order(symbol)
+
+    def _release_order(self, symbol: str) -> None:
+        """Give back a symbol's in-flight claim and reserved notional"""
+        self.in_flight.release(symbol)
+        self.reserved_notional.pop(symbol, None)
+
+    def _handle_trade_error(self, symbol: str, e: Exception) -> None:
+        """Log a per-symbol trade error; re-raised outside demo mode"""
+        self.metrics['errors'] += 1
+        if isinstance(e, RobinhoodAPIError):
+            logger.error(f"Robinhood API error for {symbol}: {e.message}")
+            if e.status_code == 429:
+                pause = self.order_limiter.backoff()
+                logger.warning(f"Order rate limit hit, pausing orders for {pause:.1f}s")
+            if not self.demo_mode:
+                raise e
+        else:
+            logger.error(f"Trade execution failed for {symbol}: {str(e)}")
             if not self.demo_mode:
-                raise
+                raise TradingSystemError(f"Trade execution failed: {str(e)}")
+
+    def _record_trades(self, executed_trades: List[Dict[str, Any]]) -> None:
+        """Add executed trades to the history and feed them back to the AI engine"""
+        # Update trade history
+        self.trade_history.extend(executed_trades)
+        
+        # Provide feedback to AI engine
+        if executed_trades:
+            self.ai_engine.feedback_loop(executed_trades)
 
     def _log_trade(self, action: str, symbol: str, signal: Signal, position_sizing: PositionSizing, result: Any):
         """Log trade details with risk information"""
@@ -540,32 +702,9 @@ Metrics:
 
 async def run_backtest(args):
     """Run backtesting mode"""
-    from src.backtesting import BacktestEngine, BacktestParameters, load_data
+    from src.backtesting import BacktestEngine, BacktestParameters, load_data, run_parallel_backtests
     
     logger.info("Starting backtest mode")
-
-    import asyncio
-    import concurrent.futures
-
-    # Create a process pool for CPU-bound parallel backtests
-    executor = concurrent.futures.ProcessPoolExecutor()
-
-    async def run_parallel_backtests(param_sets, engine_factory):
-        loop = asyncio.get_event_loop()
-        tasks = []
-        for params in param_sets:
-            task = loop.run_in_executor(
-                executor,
-                lambda p=params: engine_factory(p).run()
-            )
-            tasks.append(task)
-        results = await asyncio.gather(*tasks)
-        return results
-
-    # Example usage:
-    # param_sets = [BacktestParameters(...), ...]
-    # results = await run_parallel_backtests(param_sets, lambda p: BacktestEngine(registry, p))
-
     
     # Create strategy registry
     registry = StrategyRegistry()
@@ -594,7 +733,8 @@ async def run_backtest(args):
     params = BacktestParameters(
         initial_capital=args.capital,
         start_date=datetime.strptime(args.start_date, '%Y-%m-%d') if args.start_date else None,
-        end_date=datetime.strptime(args.end_date, '%Y-%m-%d') if args.end_date else None
+        end_date=datetime.strptime(args.end_date, '%Y-%m-%d') if args.end_date else None,
+        cost_model=args.cost_model
     )
     
     # Create risk parameters
@@ -607,12 +747,61 @@ async def run_backtest(args):
     engine = BacktestEngine(registry, params, risk_params)
     
     # Load data
-    data = load_data(args.data_dir, args.symbols.split(',') if args.symbols else None)
+    data = load_data(
+        args.data_dir,
+        args.symbols.split(',') if args.symbols else None,
+        rebuild_cache=args.rebuild_data_cache
+    )
     
     if not data:
         logger.error("No data loaded for backtest")
         return
     
+    if args.param_sets:
+        # Each entry overrides fields of the parameters above, e.g. {"initial_capital": 50000}
+        with open(args.param_sets) as f:
+            overrides = json.load(f)
+        param_sets = []
+        for override in overrides:
+            fields = dict(override)
+            for key in ('start_date', 'end_date'):
+                if isinstance(fields.get(key), str):
+                    fields[key] = datetime.strptime(fields[key], '%Y-%m-%d')
+            param_sets.append(dataclasses.replace(params, **fields))
+        
+        # Worker processes share ``data`` read-only; keep the event loop free meanwhile
+        loop = asyncio.get_running_loop()
+        sweep = await loop.run_in_executor(
+            None, run_parallel_backtests, registry, data, param_sets, risk_params, args.jobs
+        )
+        
+        print("\n=== PARAMETER SWEEP RESULTS ===")
+        for override, sweep_results in zip(overrides, sweep):
+            metrics = sweep_results.metrics
+            print(
+                f"{json.dumps(override)}: "
+                f"total_return={metrics.get('total_return', 0.0):.2%} "
+                f"sharpe_ratio={metrics.get('sharpe_ratio', 0.0):.4f} "
+                f"max_drawdown={metrics.get('max_drawdown', 0.0):.2%}"
+            )
+        return
+    
+    if args.walk_forward:
+        from src.optimization import FitnessCache, WalkForwardOptimizer
+        
+        walk_forward = WalkForwardOptimizer(
+            registry, engine,
+            train_size=args.train_days,
+            test_size=args.test_days,
+            n_jobs=args.jobs,
+            fitness_cache=FitnessCache(path=args.fitness_cache) if args.fitness_cache else None
+        )
+        wf_results = walk_forward.run(data)
+        
+        print("\n=== WALK-FORWARD RESULTS ===")
+        print(wf_results.out_of_sample_metrics().to_string())
+        return
+    
     # Run backtest
     results = engine.run(data)
     
@@ -662,9 +851,18 @@ async def main():
     parser.add_argument('--end-date', help='End date for backtest (YYYY-MM-DD)')
     parser.add_argument('--capital', type=float, default=100000.0, help='Initial capital for backtest')
     parser.add_argument('--symbols', help='Comma-separated list of symbols to backtest')
+    parser.add_argument('--rebuild-data-cache', action='store_true', help='Re-parse backtest CSVs and rebuild their binary cache')
     parser.add_argument('--strategies', help='Comma-separated list of strategies to use')
     parser.add_argument('--max-position', type=float, default=0.05, help='Maximum position size as fraction of portfolio')
     parser.add_argument('--max-risk', type=float, default=0.02, help='Maximum portfolio risk per day')
+    parser.add_argument('--cost-model', choices=['flat', 'spread', 'volume', 'sqrt'], default='flat',
+                        help='Backtest slippage model: flat percentage, high/low spread, or volume/square-root market impact')
+    parser.add_argument('--walk-forward', action='store_true', help='Run walk-forward weight optimization instead of a single backtest')
+    parser.add_argument('--train-days', type=int, default=252, help='In-sample window length for walk-forward (trading days)')
+    parser.add_argument('--test-days', type=int, default=63, help='Out-of-sample window length for walk-forward (trading days)')
+    parser.add_argument('--param-sets', help='JSON file with a list of backtest parameter overrides to run in parallel')
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes for walk-forward optimization and parameter sweeps')
+    parser.add_argument('--fitness-cache', help='SQLite file caching optimizer fitness values across runs')
     
     args = parser.parse_args()
     
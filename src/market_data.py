@@ -0,0 +1,394 @@
+"""
+Per-cycle market data access for the trading loop.
+
+Each trading cycle needs the same per-symbol data in several places (history
+for the strategies, then again for sizing and risk checks). ``CycleFetcher``
+fans the requests out concurrently under a bounded semaphore and fetches each
+symbol at most once per cycle, sharing the result between analysis and
+execution.
+
+``BarCache`` keeps each symbol's historical bars across cycles, so a cycle
+only has to fetch and append the bars added since the previous one.
+``QuoteSnapshot`` fetches the quotes a cycle needs in one batched request and
+serves them to sizing, risk checks and execution for a short TTL.
+"""
+import asyncio
+import os
+import time
+import numpy as np
+import pandas as pd
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.metrics import record_cache_hit, record_cache_miss
+from src.results_store import ColumnBuffer
+from src.utils.logger import logger
+
+
+# Value columns of cached bars, in storage order
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+# Record layout of the on-disk bar files
+BAR_RECORD_DTYPE = np.dtype([("date", np.int64), ("values", np.float64, (len(BAR_FIELDS),))])
+
+# Robinhood history spans from shortest to longest, with the time each covers
+HISTORY_SPANS: Tuple[Tuple[str, pd.Timedelta], ...] = (
+    ("day", pd.Timedelta(days=1)),
+    ("week", pd.Timedelta(days=7)),
+    ("month", pd.Timedelta(days=31)),
+    ("3month", pd.Timedelta(days=92)),
+    ("year", pd.Timedelta(days=366)),
+    ("5year", pd.Timedelta(days=5 * 366)),
+)
+
+
+class CycleFetcher:
+    """
+    Concurrent, deduplicated fetches of one kind of per-symbol data.
+
+    Within a cycle (see ``start_cycle``) every symbol is fetched at most once:
+    concurrent requests for it share the in-flight call and later ones get the
+    stored result. At most ``max_concurrency`` calls run at a time, so a large
+    watchlist costs a few round trips without flooding the API. Failed fetches
+    are logged and stored as None for the rest of the cycle.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str], Awaitable[Any]],
+        max_concurrency: int = 8,
+        name: str = "market_data"
+    ):
+        """
+        Initialize the fetcher.
+
+        Args:
+            fetch: Coroutine function fetching one symbol's data
+            max_concurrency: Maximum number of fetches in flight
+            name: Name used in logs and cache metrics
+        """
+        self.fetch = fetch
+        self.max_concurrency = max_concurrency
+        self.name = name
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._results: Dict[str, "asyncio.Future[Any]"] = {}
+
+    def start_cycle(self) -> None:
+        """Forget the previous cycle's results so symbols are fetched afresh"""
+        self._results = {}
+
+    async def get(self, symbol: str) -> Any:
+        """A symbol's data for this cycle (None if the fetch failed)"""
+        result = self._results.get(symbol)
+        if result is not None:
+            record_cache_hit(self.name)
+        else:
+            record_cache_miss(self.name)
+            result = asyncio.ensure_future(self._fetch(symbol))
+            self._results[symbol] = result
+        # Shielded: a caller giving up must not cancel the fetch other callers share
+        return await asyncio.shield(result)
+
+    async def get_many(self, symbols: Iterable[str]) -> Dict[str, Any]:
+        """
+        Data for several symbols, fetched concurrently.
+
+        Returns:
+            ``{symbol: data}`` in the order given, without symbols whose fetch
+            failed or returned nothing
+        """
+        symbols = list(dict.fromkeys(symbols))
+        results = await asyncio.gather(*(self.get(symbol) for symbol in symbols))
+        return {
+            symbol: result for symbol, result in zip(symbols, results)
+            if result is not None and len(result)
+        }
+
+    async def _fetch(self, symbol: str) -> Any:
+        if self._semaphore is None:
+            # Created lazily so it binds to the running loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._semaphore:
+            try:
+                return await self.fetch(symbol)
+            except Exception as e:
+                logger.error(f"Failed to fetch {self.name} for {symbol}: {str(e)}")
+                return None
+
+
+def parse_historicals(records: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Timestamps (ns) and (n, len(BAR_FIELDS)) values of robin_stocks
+    ``get_stock_historicals`` records, sorted by time.
+    """
+    records = [record for record in records or [] if record and record.get("begins_at")]
+    if not records:
+        return np.empty(0, dtype=np.int64), np.empty((0, len(BAR_FIELDS)), dtype=np.float64)
+
+    dates = pd.to_datetime([record["begins_at"] for record in records], utc=True).tz_localize(None)
+    timestamps = dates.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    values = np.array(
+        [[record.get(f"{field}_price", record.get(field)) for field in BAR_FIELDS] for record in records],
+        dtype=np.float64
+    )
+    order = np.argsort(timestamps, kind="stable")
+    return timestamps[order], values[order]
+
+
+def covering_span(since: pd.Timedelta, longest: str) -> str:
+    """Shortest history span covering ``since``, capped at ``longest``"""
+    names = [name for name, _ in HISTORY_SPANS]
+    if longest not in names:
+        raise ValueError(f"Unknown history span '{longest}', expected one of {names}")
+    for name, length in HISTORY_SPANS[:names.index(longest) + 1]:
+        if since <= length:
+            return name
+    return longest
+
+
+class BarHistory:
+    """
+    One symbol's bars in growable columns.
+
+    ``update`` appends only bars newer than the last one stored (a re-sent last
+    bar replaces it, since the newest bar may still have been forming). The
+    frame returned by ``frame`` wraps the buffers without copying and stays the
+    same object until bars change, so indicator streams fed from it only ever
+    process the new tail.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Append-only file persisting the bars (memory only if None)
+        """
+        self.path = path
+        self._dates = ColumnBuffer(np.int64)
+        self._values = ColumnBuffer(np.dtype((np.float64, len(BAR_FIELDS))))
+        self._frame: Optional[pd.DataFrame] = None
+        if path is not None and os.path.exists(path):
+            self._load()
+
+    @property
+    def last_timestamp(self) -> Optional[pd.Timestamp]:
+        dates = self._dates.values()
+        return pd.Timestamp(int(dates[-1])) if len(dates) else None
+
+    def update(self, timestamps: np.ndarray, values: np.ndarray) -> int:
+        """Append bars newer than the last stored one; returns how many changed"""
+        dates = self._dates.values()
+        start = 0
+        revised = False
+        if len(dates):
+            start = int(np.searchsorted(timestamps, dates[-1], side="right"))
+            if start and timestamps[start - 1] == dates[-1]:
+                last = self._values.values()[-1]
+                if not np.array_equal(last, values[start - 1], equal_nan=True):
+                    last[:] = values[start - 1]
+                    revised = True
+
+        for timestamp, bar in zip(timestamps[start:], values[start:]):
+            self._dates.append(timestamp)
+            self._values.append(bar)
+        added = len(timestamps) - start
+
+        if added or revised:
+            self._frame = None
+            if self.path is not None:
+                self._persist(added, revised)
+        return added + revised
+
+    def reset(self) -> None:
+        """Drop every stored bar, on disk too"""
+        self._dates.truncate(0)
+        self._values.truncate(0)
+        self._frame = None
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def frame(self) -> pd.DataFrame:
+        """Bars indexed by bar start (no data copy)"""
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                self._values.values(),
+                index=pd.DatetimeIndex(self._dates.values().view("datetime64[ns]"), name="date"),
+                columns=list(BAR_FIELDS),
+                copy=False
+            )
+        return self._frame
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def _load(self) -> None:
+        records = np.fromfile(self.path, dtype=BAR_RECORD_DTYPE)
+        for record in records:
+            self._dates.append(record["date"])
+            self._values.append(record["values"])
+
+    def _persist(self, added: int, revised: bool) -> None:
+        count = len(self._dates)
+        exists = os.path.exists(self.path)
+        first = count - added - (1 if revised else 0) if exists else 0
+        records = np.empty(count - first, dtype=BAR_RECORD_DTYPE)
+        records["date"] = self._dates.values()[first:]
+        records["values"] = self._values.values()[first:]
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        with open(self.path, "r+b" if exists else "wb") as f:
+            # A revised bar is rewritten in place, new bars are appended
+            f.seek(first * BAR_RECORD_DTYPE.itemsize)
+            records.tofile(f)
+            f.truncate()
+
+
+class BarCache:
+    """
+    Historical bars per (symbol, interval), kept across trading cycles.
+
+    With a ``directory`` each history is also stored as an append-only file of
+    fixed-size records (``<directory>/<interval>/<SYMBOL>.bars``), so a restart
+    resumes from the bars already fetched.
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        Args:
+            directory: Directory of the on-disk store (memory only if None)
+        """
+        self.directory = directory
+        self._histories: Dict[Tuple[str, str], BarHistory] = {}
+
+    def history(self, symbol: str, interval: str) -> BarHistory:
+        key = (symbol, interval)
+        history = self._histories.get(key)
+        if history is None:
+            path = None
+            if self.directory:
+                path = os.path.join(self.directory, interval, f"{symbol.upper()}.bars")
+            history = BarHistory(path)
+            self._histories[key] = history
+        return history
+
+    def fetch_span(self, symbol: str, interval: str, span: str, now: Optional[pd.Timestamp] = None) -> str:
+        """
+        Span to request so the reply reaches back to the last cached bar.
+
+        Robinhood's history endpoint only takes a span, not a start time, so
+        this is the shortest span covering the time since the last cached bar
+        (the full ``span`` when nothing is cached). When even ``span`` cannot
+        reach the last cached bar (after a long outage) the history is reset
+        and refetched in full, rather than appending after a hole.
+        """
+        history = self.history(symbol, interval)
+        last = history.last_timestamp
+        if last is None:
+            return span
+        now = pd.Timestamp.now(tz="UTC").tz_localize(None) if now is None else now
+        fetch = covering_span(now - last, span)
+        if now - last > dict(HISTORY_SPANS)[span]:
+            history.reset()
+        return fetch
+
+    def update(self, symbol: str, interval: str, records: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Fold fetched records into a symbol's history and return its bars"""
+        timestamps, values = parse_historicals(records)
+        history = self.history(symbol, interval)
+        if history.update(timestamps, values):
+            record_cache_miss("historical_bars")
+        else:
+            record_cache_hit("historical_bars")
+        return history.frame()
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """Forget in-memory histories (files on disk are kept)"""
+        if symbol is None:
+            self._histories.clear()
+        else:
+            for key in [k for k in self._histories if k[0] == symbol]:
+                del self._histories[key]
+
+
+class QuoteSnapshot:
+    """
+    Short-lived quotes for a set of symbols, fetched in batches.
+
+    ``get_many`` requests every symbol missing or older than ``ttl`` seconds
+    in a single call to ``fetch_many``; fresh quotes are served from memory.
+    Concurrent callers wait for the batch in flight instead of issuing their
+    own. A failed batch is logged and leaves its symbols without quotes.
+    """
+
+    def __init__(
+        self,
+        fetch_many: Callable[[List[str]], Awaitable[Dict[str, Dict[str, Any]]]],
+        ttl: float = 5.0,
+        name: str = "quotes",
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize the snapshot.
+
+        Args:
+            fetch_many: Coroutine function returning ``{symbol: quote}`` for a
+                list of symbols
+            ttl: Seconds a quote is served before it is refetched
+            name: Name used in logs and cache metrics
+            clock: Monotonic clock in seconds
+        """
+        self.fetch_many = fetch_many
+        self.ttl = ttl
+        self.name = name
+        self.clock = clock
+        self._quotes: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def get_many(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Quotes for several symbols, refreshing stale ones in one request.
+
+        Returns:
+            ``{symbol: quote}`` in the order given, without symbols that have
+            no quote
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if self._lock is None:
+            # Created lazily so it binds to the running loop
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            stale = [symbol for symbol in symbols if self._fresh(symbol) is None]
+            for _ in range(len(symbols) - len(stale)):
+                record_cache_hit(self.name)
+            if stale:
+                for _ in stale:
+                    record_cache_miss(self.name)
+                await self._refresh(stale)
+        quotes = {symbol: self._fresh(symbol) for symbol in symbols}
+        return {symbol: quote for symbol, quote in quotes.items() if quote is not None}
+
+    async def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """A symbol's quote (None if it could not be fetched)"""
+        return (await self.get_many([symbol])).get(symbol)
+
+    def invalidate(self, symbols: Optional[Iterable[str]] = None) -> None:
+        """Drop cached quotes so they are refetched, e.g. after a fill"""
+        if symbols is None:
+            self._quotes.clear()
+        else:
+            for symbol in symbols:
+                self._quotes.pop(symbol, None)
+
+    def _fresh(self, symbol: str) -> Optional[Dict[str, Any]]:
+        entry = self._quotes.get(symbol)
+        if entry is None or self.clock() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    async def _refresh(self, symbols: List[str]) -> None:
+        try:
+            quotes = await self.fetch_many(symbols)
+        except Exception as e:
+            logger.error(f"Failed to fetch {self.name} for {', '.join(symbols)}: {str(e)}")
+            return
+        fetched = self.clock()
+        for symbol, quote in (quotes or {}).items():
+            if quote:
+                self._quotes[symbol] = (fetched, quote)
@@ -42,6 +42,11 @@ CACHE_HITS = Counter(
     'Cache hit counter',
     ['cache_name']
 )
+CACHE_MISSES = Counter(
+    'trading_cache_misses_total',
+    'Cache miss counter',
+    ['cache_name']
+)
 CIRCUIT_STATE = Gauge(
     'trading_circuit_state',
     'Circuit breaker state',
@@ -99,10 +104,19 @@ def track_metrics(
         return wrapper
     return decorator
 
+def record_api_call(endpoint: str, status: str, latency: float):
+    """Record an API call's outcome ('success', 'error', 'timeout' or 'cancelled') and latency"""
+    API_CALLS.labels(endpoint=endpoint, status=status).inc()
+    API_LATENCY.labels(endpoint=endpoint).observe(latency)
+
 def record_cache_hit(cache_name: str):
     """Record a cache hit"""
     CACHE_HITS.labels(cache_name=cache_name).inc()
 
+def record_cache_miss(cache_name: str):
+    """Record a cache miss"""
+    CACHE_MISSES.labels(cache_name=cache_name).inc()
+
 def update_circuit_state(endpoint: str, state: int):
     """Update circuit breaker state gauge"""
     CIRCUIT_STATE.labels(endpoint=endpoint).set(state)
\ No newline at end of file
@@ -2,8 +2,16 @@
 Optimization package for trading strategies.
 """
 from src.optimization.weight_optimizer import WeightOptimizer, OptimizationResult
+from src.optimization.fitness_cache import FitnessCache
+from src.optimization.bayesian_optimizer import BayesianOptimizer
+from src.optimization.walk_forward import WalkForwardOptimizer, WalkForwardResult, WalkForwardWindow
 
 __all__ = [
     'WeightOptimizer',
     'OptimizationResult',
+    'FitnessCache',
+    'BayesianOptimizer',
+    'WalkForwardOptimizer',
+    'WalkForwardResult',
+    'WalkForwardWindow',
 ]
@@ -0,0 +1,363 @@
+"""
+Bayesian (TPE) optimization of strategy weights and parameters with Optuna.
+"""
+import copy
+import dataclasses
+import os
+import shutil
+import tempfile
+import pandas as pd
+from typing import Dict, List, Any, Tuple, Optional, Union
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from src.strategy_framework import Strategy, StrategyRegistry
+from src.backtesting import BacktestEngine, BacktestParameters
+from src.price_cube import PriceCube, SharedPriceCube
+from src.optimization.weight_optimizer import EvaluationContext, OptimizationResult, _extract_metric
+
+
+PRUNERS: Tuple[str, ...] = ("median", "successive_halving", "none")
+
+# A parameter range: (low, high) of ints or floats, or a list of choices
+ParamRange = Union[Tuple[int, int], Tuple[float, float], List[Any]]
+
+
+def _optuna():
+    try:
+        import optuna
+    except ImportError:
+        raise ImportError("BayesianOptimizer requires optuna")
+    return optuna
+
+
+def _make_pruner(name: str):
+    optuna = _optuna()
+    if name == "median":
+        return optuna.pruners.MedianPruner(n_startup_trials=5, n_warmup_steps=1)
+    if name == "successive_halving":
+        return optuna.pruners.SuccessiveHalvingPruner()
+    return optuna.pruners.NopPruner()
+
+
+class TrialObjective:
+    """
+    Optuna objective that backtests one trial's weights and strategy parameters.
+
+    The backtest is simulated in ``checkpoints`` segments of its period. After
+    each segment but the last, the metric of the run so far is reported to the
+    trial, so the pruner can stop an unpromising trial before it covers the
+    whole period.
+    """
+
+    def __init__(
+        self,
+        context: EvaluationContext,
+        param_space: Dict[str, Dict[str, ParamRange]],
+        metric: str,
+        checkpoints: int
+    ):
+        self.context = context
+        self.param_space = param_space
+        self.metric = metric
+        self.checkpoints = checkpoints
+
+    def __call__(self, trial: Any) -> float:
+        optuna = _optuna()
+        registry = StrategyRegistry()
+        for strategy in self.context.strategies:
+            weight = trial.suggest_float(f"weight.{strategy.name}", 0.0, 1.0)
+            registry.register(self._build(trial, strategy), weight)
+
+        engine = BacktestEngine(
+            registry,
+            copy.deepcopy(self.context.parameters),
+            copy.deepcopy(self.context.risk_parameters)
+        )
+        if not engine.begin(
+            self.context.cube,
+            start_date=self.context.start_date,
+            end_date=self.context.end_date,
+            vectorized=self.context.vectorized,
+            series_cache=self.context.series_cache
+        ):
+            return _extract_metric({}, self.metric)
+
+        for step, until in enumerate(self._checkpoint_dates(engine)):
+            engine.advance(until)
+            trial.report(_extract_metric(engine.results.calculate_metrics(), self.metric), step)
+            if trial.should_prune():
+                raise optuna.TrialPruned()
+
+        engine.advance()
+        return _extract_metric(engine.finish().metrics, self.metric)
+
+    def _build(self, trial: Any, strategy: Strategy) -> Strategy:
+        """Fresh strategy with the trial's suggested constructor parameters"""
+        space = self.param_space.get(strategy.name)
+        if not space:
+            return copy.deepcopy(strategy)
+        params = dict(strategy.params)
+        for param, bounds in space.items():
+            name = f"{strategy.name}.{param}"
+            if isinstance(bounds, list):
+                params[param] = trial.suggest_categorical(name, bounds)
+            elif all(isinstance(bound, int) for bound in bounds):
+                params[param] = trial.suggest_int(name, *bounds)
+            else:
+                params[param] = trial.suggest_float(name, *bounds)
+        return type(strategy)(**params)
+
+    def _checkpoint_dates(self, engine: BacktestEngine) -> List[datetime]:
+        """Ends of every segment but the last"""
+        rows = engine.rows
+        return [
+            engine.cube.date_at(rows.start + len(rows) * k // self.checkpoints - 1)
+            for k in range(1, self.checkpoints)
+            if len(rows) * k // self.checkpoints > 0
+        ]
+
+
+# Objective of a pool worker, set once by the pool initializer
+_worker_objective: Optional[TrialObjective] = None
+
+
+def _init_worker(objective: TrialObjective, shared_cube: SharedPriceCube) -> None:
+    global _worker_objective
+    objective.context = dataclasses.replace(objective.context, cube=shared_cube.attach())
+    _worker_objective = objective
+
+
+def _optimize_in_worker(
+    storage: str,
+    study_name: str,
+    n_trials: int,
+    pruner: str,
+    seed: Optional[int]
+) -> None:
+    optuna = _optuna()
+    study = optuna.load_study(
+        study_name=study_name,
+        storage=_rdb_storage(storage),
+        sampler=optuna.samplers.TPESampler(seed=seed),
+        pruner=_make_pruner(pruner)
+    )
+    study.optimize(_worker_objective, n_trials=n_trials)
+
+
+def _rdb_storage(url: str) -> Any:
+    # Wait on SQLite's write lock instead of failing when workers commit at once
+    return _optuna().storages.RDBStorage(url, engine_kwargs={"connect_args": {"timeout": 60}})
+
+
+class BayesianOptimizer:
+    """
+    Tree-structured Parzen estimator search over strategy weights and
+    constructor parameters, with pruning of unpromising trials.
+
+    Every registered strategy gets a weight in [0, 1] (normalized in the
+    result). Strategies named in ``param_space`` are also rebuilt per trial
+    with suggested constructor parameters, for example::
+
+        {"MACDStrategy": {"fast_period": (5, 20), "slow_period": (20, 60)},
+         "BollingerBandsStrategy": {"num_std": (1.5, 3.0)}}
+
+    Integer bounds suggest ints, float bounds floats and a list a choice.
+
+    Each trial backtests the period in ``checkpoints`` segments on one
+    engine, reporting the metric of the run so far after each, so the
+    ``median`` or ``successive_halving`` pruner can abandon it early without
+    re-simulating any bar. Trials are spread over ``n_jobs`` processes that
+    attach to the data through a ``SharedPriceCube`` and share a study in
+    SQLite; with ``storage`` set, the study persists and optimizing again with
+    the same ``study_name`` resumes it.
+    """
+
+    def __init__(
+        self,
+        strategy_registry: StrategyRegistry,
+        backtester: Any,
+        param_space: Optional[Dict[str, Dict[str, ParamRange]]] = None,
+        pruner: str = "median",
+        checkpoints: int = 4,
+        n_jobs: Optional[int] = 1,
+        storage: Optional[str] = None,
+        study_name: str = "strategy_weights",
+        vectorized: bool = False,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the Bayesian optimizer.
+
+        Args:
+            strategy_registry: The strategy registry containing strategies to optimize
+            backtester: Backtester whose parameters and risk parameters are used
+            param_space: Constructor parameter ranges per strategy name
+            pruner: 'median', 'successive_halving' or 'none'
+            checkpoints: Number of segments each trial's backtest is split into
+                for pruning (1 disables interim reports)
+            n_jobs: Number of worker processes (1 runs in-process, None uses every core)
+            storage: SQLite file (or database URL) for the study; a temporary
+                file is used if None and n_jobs > 1
+            study_name: Name of the study in ``storage``
+            vectorized: Run trial backtests in vectorized signal mode
+            start_date: First date of the optimization period
+            end_date: Last date of the optimization period
+            seed: Sampler seed; worker ``i`` uses ``seed + i``
+        """
+        if pruner not in PRUNERS:
+            raise ValueError(f"Unknown pruner '{pruner}', expected one of {list(PRUNERS)}")
+        if checkpoints < 1:
+            raise ValueError("checkpoints must be at least 1")
+
+        self.strategy_registry = strategy_registry
+        self.backtester = backtester
+        self.param_space = param_space or {}
+        self.pruner = pruner
+        self.checkpoints = checkpoints
+        self.n_jobs = n_jobs if n_jobs is not None else (os.cpu_count() or 1)
+        self.storage = storage
+        self.study_name = study_name
+        self.vectorized = vectorized
+        self.start_date = start_date
+        self.end_date = end_date
+        self.seed = seed
+        self.study = None
+
+        for name, space in self.param_space.items():
+            strategy = strategy_registry.get_strategy(name)
+            if strategy is None:
+                raise ValueError(f"Strategy not registered: {name}")
+            unknown = set(space) - set(getattr(strategy, 'params', None) or {})
+            if unknown:
+                raise ValueError(f"{name} has no parameters {sorted(unknown)}")
+
+    def optimize(
+        self,
+        data: Union[Dict[str, pd.DataFrame], PriceCube],
+        n_trials: int = 100,
+        metric: str = "sharpe_ratio"
+    ) -> OptimizationResult:
+        """
+        Run ``n_trials`` more trials of the study.
+
+        Args:
+            data: Historical price data for backtesting
+            n_trials: Number of trials to run (split across workers)
+            metric: Performance metric to optimize ('sharpe_ratio', 'total_return', etc.)
+
+        Returns:
+            OptimizationResult with the best trial's normalized weights and
+            parameters, and every trial of the study in its history
+        """
+        optuna = _optuna()
+        objective = TrialObjective(self._context(data), self.param_space, metric, self.checkpoints)
+        direction = "minimize" if metric == "max_drawdown" else "maximize"
+
+        temp_dir = None
+        storage = self.storage
+        if storage is None and self.n_jobs > 1:
+            temp_dir = tempfile.mkdtemp(prefix="optuna-")
+            storage = os.path.join(temp_dir, "study.db")
+        url = storage if storage is None or "://" in storage else f"sqlite:///{os.path.abspath(storage)}"
+
+        try:
+            study = optuna.create_study(
+                study_name=self.study_name,
+                storage=_rdb_storage(url) if url else None,
+                direction=direction,
+                sampler=optuna.samplers.TPESampler(seed=self.seed),
+                pruner=_make_pruner(self.pruner),
+                load_if_exists=True
+            )
+            if self.n_jobs <= 1:
+                study.optimize(objective, n_trials=n_trials)
+            else:
+                self._optimize_parallel(objective, url, n_trials)
+                study = optuna.load_study(study_name=self.study_name, storage=_rdb_storage(url))
+            self.study = study
+            return self._result(study, metric)
+        finally:
+            if temp_dir is not None:
+                shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def _optimize_parallel(self, objective: TrialObjective, url: str, n_trials: int) -> None:
+        """Split trials over worker processes sharing the study's storage"""
+        counts = [n_trials // self.n_jobs + (i < n_trials % self.n_jobs) for i in range(self.n_jobs)]
+        seeds = [self.seed + i if self.seed is not None else None for i in range(self.n_jobs)]
+        worker_objective = TrialObjective(
+            dataclasses.replace(objective.context, cube=None, series_cache={}),
+            objective.param_space, objective.metric, objective.checkpoints
+        )
+
+        with SharedPriceCube(objective.context.cube) as shared_cube, ProcessPoolExecutor(
+            max_workers=self.n_jobs,
+            initializer=_init_worker,
+            initargs=(worker_objective, shared_cube)
+        ) as executor:
+            futures = [
+                executor.submit(_optimize_in_worker, url, self.study_name, count, self.pruner, seed)
+                for count, seed in zip(counts, seeds)
+                if count > 0
+            ]
+            for future in futures:
+                future.result()
+
+    def _context(self, data: Union[Dict[str, pd.DataFrame], PriceCube]) -> EvaluationContext:
+        cube = data if isinstance(data, PriceCube) else PriceCube.from_frames(data)
+        memo = {id(self.strategy_registry.indicator_cache): None}
+        risk_manager = getattr(self.backtester, 'risk_manager', None)
+        return EvaluationContext(
+            cube=cube,
+            strategies=[
+                copy.deepcopy(self.strategy_registry.get_strategy(name), memo)
+                for name in self.strategy_registry.list_strategies()
+            ],
+            parameters=getattr(self.backtester, 'parameters', None) or BacktestParameters(),
+            risk_parameters=getattr(risk_manager, 'parameters', None),
+            vectorized=self.vectorized,
+            start_date=self.start_date,
+            end_date=self.end_date
+        )
+
+    def _result(self, study: Any, metric: str) -> OptimizationResult:
+        optuna = _optuna()
+        history = [
+            {
+                "trial": trial.number,
+                "state": trial.state.name.lower(),
+                "weights": self._weights(trial.params),
+                "params": self._params(trial.params),
+                "performance": trial.value
+            }
+            for trial in study.trials
+        ]
+        completed = study.get_trials(deepcopy=False, states=(optuna.trial.TrialState.COMPLETE,))
+        if not completed:
+            return OptimizationResult({}, {}, history)
+
+        best = study.best_trial
+        return OptimizationResult(
+            weights=self._weights(best.params),
+            performance={metric: best.value},
+            iteration_history=history,
+            params=self._params(best.params)
+        )
+
+    def _weights(self, trial_params: Dict[str, Any]) -> Dict[str, float]:
+        weights = {
+            key[len("weight."):]: value for key, value in trial_params.items() if key.startswith("weight.")
+        }
+        total = sum(weights.values())
+        return {name: value / total for name, value in weights.items()} if total > 0 else weights
+
+    def _params(self, trial_params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        params: Dict[str, Dict[str, Any]] = {}
+        for key, value in trial_params.items():
+            if key.startswith("weight."):
+                continue
+            strategy, param = key.split(".", 1)
+            params.setdefault(strategy, {})[param] = value
+        return params
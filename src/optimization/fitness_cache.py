@@ -0,0 +1,149 @@
+"""
+Content-addressed cache of backtest fitness values for weight optimization.
+"""
+import hashlib
+import os
+import sqlite3
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.price_cube import PriceCube
+
+
+# Data fingerprints per cube, keyed by the last row an evaluation can see
+_fingerprint_cache: "weakref.WeakKeyDictionary[PriceCube, Dict[int, str]]" = weakref.WeakKeyDictionary()
+
+
+def data_fingerprint(cube: PriceCube, end_date: Optional[datetime] = None) -> str:
+    """
+    Hash of the cube's contents up to ``end_date``.
+
+    A backtest ending at ``end_date`` never reads later bars, so only those are
+    hashed: extending the data with new bars keeps fingerprints (and cached
+    fitness values) of earlier periods valid.
+    """
+    end_row = len(cube) - 1 if end_date is None else cube.row_for(end_date)
+    per_cube = _fingerprint_cache.setdefault(cube, {})
+    fingerprint = per_cube.get(end_row)
+    if fingerprint is not None:
+        return fingerprint
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update("\0".join(cube.symbols).encode())
+    digest.update(np.ascontiguousarray(cube.dates[:end_row + 1]).view(np.uint8))
+    counts = cube.bar_count[end_row] if end_row >= 0 else np.zeros(len(cube.symbols), dtype=np.int64)
+    for s, count in enumerate(counts):
+        start = cube.offsets[s]
+        digest.update(np.ascontiguousarray(cube.bars[start:start + count]).view(np.uint8))
+
+    fingerprint = digest.hexdigest()
+    per_cube[end_row] = fingerprint
+    return fingerprint
+
+
+class FitnessCache:
+    """
+    Two-tier cache of backtest fitness values.
+
+    Entries are keyed on everything that determines a backtest's outcome: the
+    quantized, normalized weight vector, the strategies and their parameters,
+    a fingerprint of the data the run can see, the evaluated period and the
+    backtest and risk parameters (see ``EvaluationContext.cache_key``). Lookups go to an
+    in-memory LRU first and then to an optional SQLite file shared by
+    optimizer runs and processes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 100_000,
+        path: Optional[str] = None,
+        decimals: int = 4
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Capacity of the in-memory LRU tier
+            path: SQLite file of the on-disk tier (memory only if None)
+            decimals: Weights are rounded to this many decimals, so
+                near-identical weight vectors share one entry
+        """
+        self.max_entries = max_entries
+        self.path = path
+        self.decimals = decimals
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[str, float]" = OrderedDict()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def quantize(self, weights: Dict[str, float], names: List[str]) -> Dict[str, float]:
+        """Normalized weights rounded to the cache's precision, in ``names`` order"""
+        values = np.array([weights.get(name, 0.0) for name in names], dtype=np.float64)
+        total = values.sum()
+        if total > 0:
+            values = values / total
+        return {name: float(value) for name, value in zip(names, np.round(values, self.decimals))}
+
+    def key(self, context_key: str, weights: Dict[str, float], metric: str) -> str:
+        """Cache key of quantized ``weights`` under a context key"""
+        weight_text = ",".join(f"{name}={value!r}" for name, value in weights.items())
+        return hashlib.blake2b(
+            f"{context_key}|{metric}|{weight_text}".encode(), digest_size=16
+        ).hexdigest()
+
+    def get(self, key: str) -> Optional[float]:
+        value = self._memory.get(key)
+        if value is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return value
+        if self.path is not None:
+            row = self._db().execute("SELECT value FROM fitness WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                # SQLite stores NaN as NULL
+                value = float("nan") if row[0] is None else row[0]
+                self._remember(key, value)
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def put_many(self, entries: List[Tuple[str, float]]) -> None:
+        for key, value in entries:
+            self._remember(key, value)
+        if self.path is not None and entries:
+            with self._db() as db:
+                db.executemany("INSERT OR REPLACE INTO fitness (key, value) VALUES (?, ?)", entries)
+
+    def put(self, key: str, value: float) -> None:
+        self.put_many([(key, value)])
+
+    def clear(self) -> None:
+        """Empty the in-memory tier (the on-disk tier is kept)"""
+        self._memory.clear()
+
+    def _remember(self, key: str, value: float) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _db(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._connection = sqlite3.connect(self.path, timeout=30)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS fitness (key TEXT PRIMARY KEY, value REAL)"
+            )
+            self._connection.commit()
+        return self._connection
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Connections don't pickle; each process opens its own
+        return dict(vars(self), _connection=None)
@@ -0,0 +1,302 @@
+"""
+Walk-forward optimization: optimize weights in-sample, evaluate out-of-sample.
+"""
+import copy
+import random
+import pandas as pd
+from typing import Dict, List, Any, Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from src.strategy_framework import StrategyRegistry
+from src.backtesting import BacktestEngine, BacktestParameters, BacktestResults
+from src.indicators import IndicatorCache
+from src.price_cube import PriceCube, SharedPriceCube
+from src.risk_management import RiskParameters
+from src.optimization.weight_optimizer import WeightOptimizer, OptimizationResult
+from src.optimization.fitness_cache import FitnessCache
+
+
+@dataclass
+class WalkForwardWindow:
+    """One train/test split of a walk-forward run"""
+    train_start: datetime
+    train_end: datetime
+    test_start: datetime
+    test_end: datetime
+    weights: Dict[str, float] = field(default_factory=dict)
+    in_sample_performance: float = 0.0
+    out_of_sample: Optional[BacktestResults] = None
+
+
+@dataclass
+class WalkForwardResult:
+    """Results of a walk-forward optimization"""
+    metric: str
+    windows: List[WalkForwardWindow]
+
+    def out_of_sample_metrics(self) -> pd.DataFrame:
+        """Out-of-sample metrics per window, indexed by test start date"""
+        rows = [window.out_of_sample.metrics for window in self.windows]
+        return pd.DataFrame(rows, index=[window.test_start for window in self.windows])
+
+
+# State of a walk-forward pool worker, set once by the pool initializer
+_worker_optimizer: Optional[WeightOptimizer] = None
+_worker_cube: Optional[PriceCube] = None
+
+
+def _init_worker(
+    shared_cube: SharedPriceCube,
+    registry: StrategyRegistry,
+    parameters: BacktestParameters,
+    risk_parameters: Optional[RiskParameters],
+    vectorized: bool,
+    fitness_cache: Optional[FitnessCache]
+) -> None:
+    global _worker_optimizer, _worker_cube
+    _worker_cube = shared_cube.attach()
+    _worker_optimizer = WeightOptimizer(
+        registry,
+        BacktestEngine(registry, parameters, risk_parameters),
+        n_jobs=1,
+        vectorized=vectorized,
+        fitness_cache=fitness_cache
+    )
+
+
+def _optimize_in_worker(
+    train_start: datetime,
+    train_end: datetime,
+    method: str,
+    metric: str,
+    seed: Optional[int],
+    optimizer_kwargs: Dict[str, Any]
+) -> OptimizationResult:
+    return _optimize_window(
+        _worker_optimizer, _worker_cube, train_start, train_end, method, metric, seed, optimizer_kwargs
+    )
+
+
+def _optimize_window(
+    optimizer: WeightOptimizer,
+    cube: PriceCube,
+    train_start: datetime,
+    train_end: datetime,
+    method: str,
+    metric: str,
+    seed: Optional[int],
+    optimizer_kwargs: Dict[str, Any]
+) -> OptimizationResult:
+    """Run one in-sample optimization; windows are seeded independently of scheduling"""
+    if seed is not None:
+        random.seed(seed)
+    optimizer.start_date = train_start
+    optimizer.end_date = train_end
+    return getattr(optimizer, f"optimize_{method}")(cube, metric=metric, **optimizer_kwargs)
+
+
+class WalkForwardOptimizer:
+    """
+    Rolling walk-forward optimization of strategy weights.
+
+    The data is indexed into a single ``PriceCube`` once. Every window then
+    optimizes weights with ``WeightOptimizer`` on its in-sample rows and
+    backtests them on the following out-of-sample rows. Every run keeps the
+    bars before its window as indicator history, so nothing is warmed up
+    from scratch.
+
+    In-sample optimizations are independent and run on a process pool
+    (``n_jobs``) that attaches to the cube through shared memory. Out-of-sample
+    runs are cheap and run in order, sharing one ``IndicatorCache`` (and, in
+    vectorized mode, one signal series cache). Indicator state at the end of
+    one test window therefore carries straight into the next.
+    """
+
+    def __init__(
+        self,
+        strategy_registry: StrategyRegistry,
+        backtester: Any,
+        train_size: int,
+        test_size: int,
+        step: Optional[int] = None,
+        method: str = "random_search",
+        n_jobs: Optional[int] = 1,
+        vectorized: bool = False,
+        seed: Optional[int] = None,
+        fitness_cache: Optional[FitnessCache] = None,
+        **optimizer_kwargs: Any
+    ):
+        """
+        Initialize the walk-forward optimizer.
+
+        Args:
+            strategy_registry: The strategy registry containing strategies to optimize
+            backtester: Backtester whose parameters and risk parameters are used
+            train_size: Number of dates in each in-sample window
+            test_size: Number of dates in each out-of-sample window
+            step: Dates between window starts (defaults to ``test_size``)
+            method: WeightOptimizer method: 'grid_search', 'random_search' or
+                'genetic_algorithm'
+            n_jobs: Number of processes for in-sample optimizations
+                (1 runs in-process, None uses every core)
+            vectorized: Run backtests in vectorized signal mode
+            seed: Base random seed; window ``i`` is seeded with ``seed + i``
+            fitness_cache: Fitness cache for the in-sample optimizations; give
+                it an on-disk tier to share it between worker processes and runs
+            **optimizer_kwargs: Passed to the optimization method
+        """
+        if train_size <= 0 or test_size <= 0:
+            raise ValueError("train_size and test_size must be positive")
+        if not hasattr(WeightOptimizer, f"optimize_{method}"):
+            raise ValueError(f"Unknown optimization method: {method}")
+
+        self.strategy_registry = strategy_registry
+        self.backtester = backtester
+        self.train_size = train_size
+        self.test_size = test_size
+        self.step = step or test_size
+        self.method = method
+        self.n_jobs = n_jobs
+        self.vectorized = vectorized
+        self.seed = seed
+        self.fitness_cache = fitness_cache
+        self.optimizer_kwargs = optimizer_kwargs
+
+    def windows(self, cube: PriceCube) -> List[WalkForwardWindow]:
+        """Split the cube's dates into rolling train/test windows"""
+        windows = []
+        start = 0
+        while start + self.train_size < len(cube):
+            test_start = start + self.train_size
+            test_end = min(test_start + self.test_size, len(cube)) - 1
+            windows.append(WalkForwardWindow(
+                train_start=cube.date_at(start),
+                train_end=cube.date_at(test_start - 1),
+                test_start=cube.date_at(test_start),
+                test_end=cube.date_at(test_end)
+            ))
+            start += self.step
+        return windows
+
+    def run(
+        self,
+        data: Dict[str, pd.DataFrame],
+        metric: str = "sharpe_ratio"
+    ) -> WalkForwardResult:
+        """
+        Run the walk-forward optimization.
+
+        Args:
+            data: Historical price data (``load_data`` output or a ``PriceCube``)
+            metric: Performance metric to optimize in-sample
+
+        Returns:
+            WalkForwardResult with weights and out-of-sample results per window
+        """
+        cube = data if isinstance(data, PriceCube) else PriceCube.from_frames(data)
+        windows = self.windows(cube)
+        if not windows:
+            return WalkForwardResult(metric, [])
+
+        optimizations = self._optimize_windows(cube, windows, metric)
+
+        # Out-of-sample runs share indicator state across adjacent windows
+        indicator_cache = IndicatorCache()
+        series_cache: Dict[Tuple[str, str, str], pd.DataFrame] = {}
+        strategies = self._strategy_copies()
+        equal_weight = 1.0 / len(strategies) if strategies else 0.0
+
+        for window, optimization in zip(windows, optimizations):
+            window.weights = optimization.weights or {s.name: equal_weight for s in strategies}
+            window.in_sample_performance = optimization.performance.get(metric, 0.0)
+
+            registry = StrategyRegistry()
+            registry.indicator_cache = indicator_cache
+            for strategy in strategies:
+                registry.register(strategy, window.weights.get(strategy.name, 0.0))
+
+            engine = BacktestEngine(
+                registry,
+                copy.deepcopy(self._parameters()),
+                copy.deepcopy(self._risk_parameters())
+            )
+            window.out_of_sample = engine.run(
+                cube,
+                start_date=window.test_start,
+                end_date=window.test_end,
+                vectorized=self.vectorized,
+                series_cache=series_cache
+            )
+
+        return WalkForwardResult(metric, windows)
+
+    def _optimize_windows(
+        self,
+        cube: PriceCube,
+        windows: List[WalkForwardWindow],
+        metric: str
+    ) -> List[OptimizationResult]:
+        """In-sample optimization of every window, in window order"""
+        seeds = [
+            self.seed + i if self.seed is not None else None for i in range(len(windows))
+        ]
+        if self.n_jobs == 1 or len(windows) == 1:
+            # One optimizer for all windows so its evaluation context is reused
+            registry = self._registry_copy()
+            optimizer = WeightOptimizer(
+                registry,
+                BacktestEngine(registry, self._parameters(), self._risk_parameters()),
+                n_jobs=1,
+                vectorized=self.vectorized,
+                fitness_cache=self.fitness_cache
+            )
+            return [
+                _optimize_window(
+                    optimizer, cube, w.train_start, w.train_end,
+                    self.method, metric, seed, self.optimizer_kwargs
+                )
+                for w, seed in zip(windows, seeds)
+            ]
+
+        with SharedPriceCube(cube) as shared_cube, ProcessPoolExecutor(
+            max_workers=self.n_jobs,
+            initializer=_init_worker,
+            initargs=(
+                shared_cube,
+                self._registry_copy(),
+                self._parameters(),
+                self._risk_parameters(),
+                self.vectorized,
+                self.fitness_cache
+            )
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _optimize_in_worker, w.train_start, w.train_end,
+                    self.method, metric, seed, self.optimizer_kwargs
+                )
+                for w, seed in zip(windows, seeds)
+            ]
+            return [future.result() for future in futures]
+
+    def _strategy_copies(self) -> List[Any]:
+        """Copies of the registered strategies without the registry's indicator cache"""
+        memo = {id(self.strategy_registry.indicator_cache): None}
+        return [
+            copy.deepcopy(self.strategy_registry.get_strategy(name), memo)
+            for name in self.strategy_registry.list_strategies()
+        ]
+
+    def _registry_copy(self) -> StrategyRegistry:
+        registry = StrategyRegistry()
+        for strategy in self._strategy_copies():
+            registry.register(strategy, self.strategy_registry._weights[strategy.name])
+        return registry
+
+    def _parameters(self) -> BacktestParameters:
+        return getattr(self.backtester, 'parameters', None) or BacktestParameters()
+
+    def _risk_parameters(self) -> Optional[RiskParameters]:
+        return getattr(getattr(self.backtester, 'risk_manager', None), 'parameters', None)
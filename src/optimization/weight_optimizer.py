@@ -3,12 +3,23 @@ Strategy weight optimization based on backtesting results.
 """
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Any, Tuple, Optional
+from typing import Dict, List, Any, Tuple, Optional, Callable, Iterator
+import copy
+import dataclasses
+import math
+import os
 import random
-from dataclasses import dataclass
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from itertools import repeat
 
 from src.strategy_framework import Strategy, StrategyRegistry
-from src.backtesting import BacktestResult
+from src.backtesting import BacktestEngine, BacktestParameters
+from src.price_cube import PriceCube, SharedPriceCube
+from src.optimization.fitness_cache import FitnessCache, data_fingerprint
+from src.risk_management import RiskParameters
 
 
 @dataclass
@@ -17,6 +28,103 @@ class OptimizationResult:
     weights: Dict[str, float]
     performance: Dict[str, float]
     iteration_history: List[Dict[str, Any]]
+    # Strategy constructor parameters, for optimizers that tune them
+    params: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Bars simulated against the cost of backtesting every candidate in full
+    evaluation_cost: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class EvaluationContext:
+    """
+    Everything needed to backtest a weight vector in isolation.
+    
+    Holds the market data as a prebuilt ``PriceCube`` and clean copies of the
+    strategies, so each evaluation gets its own registry and engine and never
+    touches the optimizer's registry. Backtests cover ``start_date`` to
+    ``end_date`` of the cube, with earlier bars still available as indicator
+    warm-up. ``series_cache`` keeps per-strategy signal series of vectorized
+    runs, which are the same for every weight vector on this cube.
+    """
+    cube: PriceCube
+    strategies: List[Strategy]
+    parameters: BacktestParameters
+    risk_parameters: Optional[RiskParameters] = None
+    vectorized: bool = False
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    series_cache: Dict[Tuple[str, str, str], pd.DataFrame] = field(default_factory=dict)
+    
+    def evaluate(self, weights: Dict[str, float], metric: str) -> float:
+        """Backtest one weight vector and return the requested metric"""
+        engine = self.engine(weights)
+        result = engine.run(
+            self.cube,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            vectorized=self.vectorized,
+            series_cache=self.series_cache
+        )
+        return _extract_metric(result.metrics, metric)
+    
+    def engine(self, weights: Dict[str, float]) -> BacktestEngine:
+        """Fresh engine over copies of the strategies with the given weights"""
+        registry = StrategyRegistry()
+        for strategy in self.strategies:
+            registry.register(copy.deepcopy(strategy), weights.get(strategy.name, 0.0))
+        
+        return BacktestEngine(
+            registry,
+            copy.deepcopy(self.parameters),
+            copy.deepcopy(self.risk_parameters)
+        )
+    
+    def begin(self, weights: Dict[str, float]) -> Optional[BacktestEngine]:
+        """Engine set up to step through the period (None if it has no dates)"""
+        engine = self.engine(weights)
+        started = engine.begin(
+            self.cube,
+            start_date=self.start_date,
+            end_date=self.end_date,
+            vectorized=self.vectorized,
+            series_cache=self.series_cache
+        )
+        return engine if started else None
+    
+    def cache_key(self) -> str:
+        """Identity of everything besides the weights that determines an evaluation's result"""
+        strategies = ";".join(
+            f"{type(s).__qualname__}:{s.name}:{getattr(s, 'params', None)!r}" for s in self.strategies
+        )
+        period = [None if d is None else pd.Timestamp(d).isoformat() for d in (self.start_date, self.end_date)]
+        return "|".join([
+            data_fingerprint(self.cube, self.end_date),
+            strategies,
+            repr(self.parameters),
+            repr(self.risk_parameters),
+            repr(period)
+        ])
+
+
+def _extract_metric(metrics: Dict[str, float], metric: str) -> float:
+    """Read an optimization metric from backtest metrics (0.0 if it wasn't computed)"""
+    if metric not in ("sharpe_ratio", "total_return", "max_drawdown", "win_rate"):
+        metric = "sharpe_ratio"  # Default
+    return float(metrics.get(metric, 0.0))
+
+
+# Evaluation context of a pool worker, set once by the pool initializer; the
+# cube is attached from shared memory rather than pickled to each process
+_worker_context: Optional[EvaluationContext] = None
+
+
+def _init_worker(context: EvaluationContext, shared_cube: SharedPriceCube) -> None:
+    global _worker_context
+    _worker_context = dataclasses.replace(context, cube=shared_cube.attach())
+
+
+def _evaluate_in_worker(weights: Dict[str, float], metric: str) -> float:
+    return _worker_context.evaluate(weights, metric)
 
 
 class WeightOptimizer:
@@ -29,26 +137,62 @@ class WeightOptimizer:
     3. Genetic Algorithm - Evolution-inspired optimization
     """
     
-    def __init__(self, strategy_registry: StrategyRegistry, backtester: Any):
+    def __init__(
+        self,
+        strategy_registry: StrategyRegistry,
+        backtester: Any,
+        n_jobs: Optional[int] = 1,
+        vectorized: bool = False,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        fitness_cache: Optional[FitnessCache] = None
+    ):
         """
         Initialize the weight optimizer.
         
         Args:
             strategy_registry: The strategy registry containing strategies to optimize
-            backtester: The backtester to use for evaluating strategy performance
+            backtester: The backtester to use for evaluating strategy performance;
+                only its parameters and risk parameters are used, every candidate
+                runs on a fresh engine
+            n_jobs: Number of worker processes for candidate evaluation
+                (1 evaluates in-process, None uses every core)
+            vectorized: Run candidate backtests in vectorized signal mode
+            start_date: First date of the optimization (in-sample) period
+            end_date: Last date of the optimization (in-sample) period
+            fitness_cache: Reuse fitness values of weight vectors already
+                evaluated on the same data and settings, across runs; candidates
+                are evaluated at the cache's quantized weights
         """
         self.strategy_registry = strategy_registry
         self.backtester = backtester
-        self.strategy_names = strategy_registry.list_strategies()
+        self.n_jobs = n_jobs if n_jobs is not None else (os.cpu_count() or 1)
+        self.vectorized = vectorized
+        self.start_date = start_date
+        self.end_date = end_date
+        self.fitness_cache = fitness_cache
         self.best_weights = None
         self.best_performance = None
+        
+        # Evaluation context of the last data set, whose cube is reused while
+        # the same data object is optimized again (e.g. over walk-forward windows)
+        self._context: Optional[EvaluationContext] = None
+        self._context_data: Any = None
+    
+    @property
+    def strategy_names(self) -> List[str]:
+        """Strategies currently registered, in registration order"""
+        return self.strategy_registry.list_strategies()
     
     def optimize_grid_search(
         self, 
         data: Dict[str, pd.DataFrame],
         steps: int = 5,
         metric: str = "sharpe_ratio",
-        max_iterations: int = 100
+        max_iterations: int = 100,
+        successive_halving: bool = False,
+        eta: int = 3,
+        min_fraction: float = 1 / 9
     ) -> OptimizationResult:
         """
         Optimize weights using grid search.
@@ -58,6 +202,10 @@ class WeightOptimizer:
             steps: Number of steps between 0 and 1 for each weight
             metric: Performance metric to optimize ('sharpe_ratio', 'total_return', etc.)
             max_iterations: Maximum number of iterations to perform
+            successive_halving: Evaluate candidates on a growing share of the
+                period, keeping the best ``1 / eta`` after each rung
+            eta: Reduction factor between successive-halving rungs
+            min_fraction: Share of the period in the first rung
             
         Returns:
             OptimizationResult with optimized weights and performance metrics
@@ -75,6 +223,7 @@ class WeightOptimizer:
         
         # Limit iterations for performance
         iterations = 0
+        candidates = []
         
         # Generate weight combinations
         for weights in self._generate_weight_combinations(weight_values, len(self.strategy_names)):
@@ -92,19 +241,25 @@ class WeightOptimizer:
             
             # Normalize weights
             total = sum(weight_dict.values())
-            weight_dict = {k: v/total for k, v in weight_dict.items()}
-            
-            # Run backtest with these weights
-            performance = self._evaluate_weights(data, weight_dict, metric)
+            candidates.append({k: v/total for k, v in weight_dict.items()})
+        
+        # Run backtests for all combinations
+        performances, fidelities, cost = self._evaluate_candidates(
+            data, candidates, metric, successive_halving, eta, min_fraction
+        )
+        
+        for candidate, performance, fidelity in zip(candidates, performances, fidelities):
+            weight_dict = self._scored_weights(candidate)
             
             # Track history
             history.append({
                 "weights": weight_dict.copy(),
-                "performance": performance
+                "performance": performance,
+                "fidelity": fidelity
             })
             
-            # Update best if better
-            is_better = (
+            # Only candidates backtested over the whole period can win
+            is_better = fidelity == 1.0 and (
                 (metric != 'max_drawdown' and performance > best_performance) or
                 (metric == 'max_drawdown' and performance < best_performance)
             )
@@ -120,14 +275,18 @@ class WeightOptimizer:
         return OptimizationResult(
             weights=best_weights,
             performance={metric: best_performance},
-            iteration_history=history
+            iteration_history=history,
+            evaluation_cost=cost
         )
     
     def optimize_random_search(
         self, 
         data: Dict[str, pd.DataFrame],
         iterations: int = 50,
-        metric: str = "sharpe_ratio"
+        metric: str = "sharpe_ratio",
+        successive_halving: bool = False,
+        eta: int = 3,
+        min_fraction: float = 1 / 9
     ) -> OptimizationResult:
         """
         Optimize weights using random search.
@@ -136,6 +295,10 @@ class WeightOptimizer:
             data: Historical price data for backtesting
             iterations: Number of random weight combinations to try
             metric: Performance metric to optimize ('sharpe_ratio', 'total_return', etc.)
+            successive_halving: Evaluate candidates on a growing share of the
+                period, keeping the best ``1 / eta`` after each rung
+            eta: Reduction factor between successive-halving rungs
+            min_fraction: Share of the period in the first rung
             
         Returns:
             OptimizationResult with optimized weights and performance metrics
@@ -148,6 +311,7 @@ class WeightOptimizer:
         best_performance = -float('inf') if metric != 'max_drawdown' else float('inf')
         history = []
         
+        candidates = []
         for _ in range(iterations):
             # Generate random weights
             weight_dict = {name: random.random() for name in self.strategy_names}
@@ -157,19 +321,25 @@ class WeightOptimizer:
             if total == 0:  # Avoid division by zero
                 continue
                 
-            weight_dict = {k: v/total for k, v in weight_dict.items()}
-            
-            # Run backtest with these weights
-            performance = self._evaluate_weights(data, weight_dict, metric)
+            candidates.append({k: v/total for k, v in weight_dict.items()})
+        
+        # Run backtests for all samples
+        performances, fidelities, cost = self._evaluate_candidates(
+            data, candidates, metric, successive_halving, eta, min_fraction
+        )
+        
+        for candidate, performance, fidelity in zip(candidates, performances, fidelities):
+            weight_dict = self._scored_weights(candidate)
             
             # Track history
             history.append({
                 "weights": weight_dict.copy(),
-                "performance": performance
+                "performance": performance,
+                "fidelity": fidelity
             })
             
-            # Update best if better
-            is_better = (
+            # Only candidates backtested over the whole period can win
+            is_better = fidelity == 1.0 and (
                 (metric != 'max_drawdown' and performance > best_performance) or
                 (metric == 'max_drawdown' and performance < best_performance)
             )
@@ -185,7 +355,8 @@ class WeightOptimizer:
         return OptimizationResult(
             weights=best_weights,
             performance={metric: best_performance},
-            iteration_history=history
+            iteration_history=history,
+            evaluation_cost=cost
         )
     
     def optimize_genetic_algorithm(
@@ -226,56 +397,57 @@ class WeightOptimizer:
         best_performance = -float('inf') if metric != 'max_drawdown' else float('inf')
         history = []
         
-        # Evolution loop
-        for generation in range(generations):
-            # Evaluate fitness for each individual
-            fitness_scores = []
-            for weights in population:
-                performance = self._evaluate_weights(data, weights, metric)
-                fitness_scores.append(performance)
-                
-                # Track history
-                history.append({
-                    "generation": generation,
-                    "weights": weights.copy(),
-                    "performance": performance
-                })
+        # Evolution loop; the pool (and the data loaded into it) lives across generations
+        with self._evaluation_pool(data) as evaluate:
+            for generation in range(generations):
+                # Evaluate fitness for the whole generation at once
+                fitness_scores = evaluate(population, metric)
                 
-                # Update best if better
-                is_better = (
-                    (metric != 'max_drawdown' and performance > best_performance) or
-                    (metric == 'max_drawdown' and performance < best_performance)
-                )
+                for individual, performance in zip(population, fitness_scores):
+                    weights = self._scored_weights(individual)
+                    
+                    # Track history
+                    history.append({
+                        "generation": generation,
+                        "weights": weights.copy(),
+                        "performance": performance
+                    })
+                    
+                    # Update best if better
+                    is_better = (
+                        (metric != 'max_drawdown' and performance > best_performance) or
+                        (metric == 'max_drawdown' and performance < best_performance)
+                    )
+                    
+                    if is_better:
+                        best_weights = weights.copy()
+                        best_performance = performance
                 
-                if is_better:
-                    best_weights = weights.copy()
-                    best_performance = performance
-            
-            # Create next generation
-            new_population = []
-            
-            # Elitism: keep the best individual
-            if population:
-                best_idx = np.argmax(fitness_scores) if metric != 'max_drawdown' else np.argmin(fitness_scores)
-                new_population.append(population[best_idx])
-            
-            # Fill the rest with crossover and mutation
-            while len(new_population) < population_size:
-                # Selection (tournament selection)
-                parent1 = self._tournament_selection(population, fitness_scores, metric)
-                parent2 = self._tournament_selection(population, fitness_scores, metric)
+                # Create next generation
+                new_population = []
                 
-                # Crossover
-                child = self._crossover(parent1, parent2)
+                # Elitism: keep the best individual
+                if population:
+                    best_idx = np.argmax(fitness_scores) if metric != 'max_drawdown' else np.argmin(fitness_scores)
+                    new_population.append(population[best_idx])
                 
-                # Mutation
-                child = self._mutate(child, mutation_rate)
+                # Fill the rest with crossover and mutation
+                while len(new_population) < population_size:
+                    # Selection (tournament selection)
+                    parent1 = self._tournament_selection(population, fitness_scores, metric)
+                    parent2 = self._tournament_selection(population, fitness_scores, metric)
+                    
+                    # Crossover
+                    child = self._crossover(parent1, parent2)
+                    
+                    # Mutation
+                    child = self._mutate(child, mutation_rate)
+                    
+                    # Add to new population
+                    new_population.append(child)
                 
-                # Add to new population
-                new_population.append(child)
-            
-            # Replace old population
-            population = new_population
+                # Replace old population
+                population = new_population
         
         # Save best results
         self.best_weights = best_weights
@@ -304,26 +476,259 @@ class WeightOptimizer:
         Returns:
             Performance metric value
         """
-        # Set weights in registry
-        for name, weight in weights.items():
-            strategy = self.strategy_registry.get_strategy(name)
-            if strategy:
-                self.strategy_registry._weights[name] = weight
-        
-        # Run backtest
-        result = self.backtester.run(data)
-        
-        # Extract metric
-        if metric == "sharpe_ratio":
-            return result.sharpe_ratio
-        elif metric == "total_return":
-            return result.total_return
-        elif metric == "max_drawdown":
-            return result.max_drawdown
-        elif metric == "win_rate":
-            return result.win_rate
+        context = self._evaluation_context(data)
+        evaluate = self._memoized(context, lambda candidates, m: [context.evaluate(w, m) for w in candidates])
+        return evaluate([weights], metric)[0]
+    
+    def _evaluate_candidates(
+        self,
+        data: Dict[str, pd.DataFrame],
+        candidates: List[Dict[str, float]],
+        metric: str,
+        successive_halving: bool,
+        eta: int,
+        min_fraction: float
+    ) -> Tuple[List[float], List[float], Dict[str, float]]:
+        """
+        Score candidates in full, or by successive halving.
+        
+        Returns each candidate's score, the share of the period it was
+        backtested over (1.0 for full runs) and the evaluation cost.
+        """
+        if successive_halving:
+            return self._successive_halving(data, candidates, metric, eta, min_fraction)
+        
+        with self._evaluation_pool(data) as evaluate:
+            performances = evaluate(candidates, metric)
+        return performances, [1.0] * len(candidates), {}
+    
+    def _successive_halving(
+        self,
+        data: Dict[str, pd.DataFrame],
+        candidates: List[Dict[str, float]],
+        metric: str,
+        eta: int,
+        min_fraction: float
+    ) -> Tuple[List[float], List[float], Dict[str, float]]:
+        """
+        Multi-fidelity evaluation of candidates.
+        
+        Every candidate is backtested over the first ``min_fraction`` of the
+        period; the best ``1 / eta`` are extended to ``eta`` times as much, and
+        so on until the survivors cover the whole period. Survivors keep their
+        engine and continue from the bar where they stopped, so no bar is
+        simulated twice. Engine state lives in this process, so candidates are
+        evaluated in-process regardless of ``n_jobs``.
+        
+        Candidates with a full-period score in the fitness cache go straight
+        to the final rung, duplicates share one engine, and the full-period
+        scores of the survivors are added to the cache.
+        """
+        if eta < 2 or not 0 < min_fraction <= 1:
+            raise ValueError("Successive halving needs eta >= 2 and 0 < min_fraction <= 1")
+        
+        context = self._evaluation_context(data)
+        cache = self.fitness_cache
+        context_key = context.cache_key() if cache is not None else None
+        scores = [0.0] * len(candidates)
+        fidelities = [0.0] * len(candidates)
+        engines: List[Optional[BacktestEngine]] = [None] * len(candidates)
+        keys: List[Optional[str]] = [None] * len(candidates)
+        first: Dict[str, int] = {}
+        for i, weights in enumerate(candidates):
+            weights = self._scored_weights(weights)
+            if cache is not None:
+                keys[i] = cache.key(context_key, weights, metric)
+                if keys[i] in first:
+                    continue
+                first[keys[i]] = i
+                score = cache.get(keys[i])
+                if score is not None:
+                    scores[i], fidelities[i] = score, 1.0
+                    continue
+            engines[i] = context.begin(weights)
+        alive = [i for i, engine in enumerate(engines) if engine is not None]
+        if not alive:
+            self._copy_duplicate_scores(keys, first, scores, fidelities)
+            return scores, fidelities, {}
+        
+        rows = engines[alive[0]].rows
+        fractions = []
+        fraction = min_fraction
+        while fraction < 1.0 - 1e-9:
+            fractions.append(fraction)
+            fraction *= eta
+        fractions.append(1.0)
+        
+        minimize = metric == 'max_drawdown'
+        worst = float('inf') if minimize else -float('inf')
+        bars_simulated = 0
+        for fraction in fractions:
+            for i in alive:
+                engine = engines[i]
+                if fraction < 1.0:
+                    engine.advance(context.cube.date_at(rows.start + math.ceil(len(rows) * fraction) - 1))
+                    scores[i] = _extract_metric(engine.results.calculate_metrics(), metric)
+                else:
+                    engine.advance()
+                    scores[i] = _extract_metric(engine.finish().metrics, metric)
+                fidelities[i] = fraction
+            if fraction == 1.0:
+                break
+            
+            # Keep the best 1 / eta (NaN scores rank last)
+            ranked = sorted(
+                alive, key=lambda i: worst if np.isnan(scores[i]) else scores[i], reverse=not minimize
+            )
+            keep = max(1, math.ceil(len(alive) / eta))
+            for i in ranked[keep:]:
+                bars_simulated += engines[i].bars_simulated
+                engines[i] = None
+            alive = ranked[:keep]
+        
+        bars_simulated += sum(engines[i].bars_simulated for i in alive)
+        if cache is not None:
+            cache.put_many([(keys[i], scores[i]) for i in alive])
+        self._copy_duplicate_scores(keys, first, scores, fidelities)
+        full_bars = len(rows) * len(candidates)
+        cost = {
+            "bars_simulated": bars_simulated,
+            "full_bars": full_bars,
+            "fraction": bars_simulated / full_bars if full_bars else 0.0
+        }
+        print(
+            f"[WeightOptimizer] Successive halving simulated {bars_simulated} of {full_bars} bars "
+            f"({cost['fraction']:.1%} of a full evaluation)"
+        )
+        return scores, fidelities, cost
+    
+    @staticmethod
+    def _copy_duplicate_scores(
+        keys: List[Optional[str]],
+        first: Dict[str, int],
+        scores: List[float],
+        fidelities: List[float]
+    ) -> None:
+        """Give candidates sharing a cache key the result of the first of them"""
+        for i, key in enumerate(keys):
+            if key is not None and first[key] != i:
+                scores[i], fidelities[i] = scores[first[key]], fidelities[first[key]]
+    
+    def _evaluation_context(self, data: Dict[str, pd.DataFrame]) -> EvaluationContext:
+        """
+        Snapshot data, strategies and backtest settings for isolated evaluations.
+        
+        Strategies and settings are snapshotted on every call, so strategies
+        registered or re-parameterized since the last one are picked up. The
+        cube built from ``data`` is reused while ``data`` is the same object,
+        and so are the cached signal series while the strategy classes match
+        (the cache is keyed on strategy name, parameters and symbol).
+        """
+        previous = self._context if self._context_data is data else None
+        if previous is not None:
+            cube = previous.cube
         else:
-            return result.sharpe_ratio  # Default
+            cube = data if isinstance(data, PriceCube) else PriceCube.from_frames(data)
+        
+        # Copy strategies without the registry's shared indicator cache; each
+        # evaluation registers them into a fresh registry with its own cache
+        memo = {id(self.strategy_registry.indicator_cache): None}
+        strategies = [
+            copy.deepcopy(self.strategy_registry.get_strategy(name), memo)
+            for name in self.strategy_names
+        ]
+        
+        risk_manager = getattr(self.backtester, 'risk_manager', None)
+        context = EvaluationContext(
+            cube=cube,
+            strategies=strategies,
+            parameters=getattr(self.backtester, 'parameters', None) or BacktestParameters(),
+            risk_parameters=getattr(risk_manager, 'parameters', None),
+            vectorized=self.vectorized,
+            start_date=self.start_date,
+            end_date=self.end_date
+        )
+        if previous is not None and [type(s) for s in previous.strategies] == [type(s) for s in strategies]:
+            context.series_cache = previous.series_cache
+        
+        self._context = context
+        self._context_data = data
+        return context
+    
+    @contextmanager
+    def _evaluation_pool(
+        self,
+        data: Dict[str, pd.DataFrame]
+    ) -> Iterator[Callable[[List[Dict[str, float]], str], List[float]]]:
+        """
+        Yield a batch evaluator: ``evaluate(candidates, metric) -> scores``.
+        
+        With ``n_jobs > 1`` candidates are spread over a process pool whose
+        workers receive the evaluation context once, at startup, and attach to
+        the market data through a ``SharedPriceCube``. Scores are returned in
+        candidate order either way. Candidates found in the fitness cache
+        (and duplicates within a batch) are not evaluated again.
+        """
+        context = self._evaluation_context(data)
+        
+        if self.n_jobs <= 1:
+            yield self._memoized(
+                context, lambda candidates, metric: [context.evaluate(w, metric) for w in candidates]
+            )
+            return
+        
+        with SharedPriceCube(context.cube) as shared_cube, ProcessPoolExecutor(
+            max_workers=self.n_jobs,
+            initializer=_init_worker,
+            initargs=(dataclasses.replace(context, cube=None, series_cache={}), shared_cube)
+        ) as executor:
+            def evaluate(candidates: List[Dict[str, float]], metric: str) -> List[float]:
+                chunksize = max(1, len(candidates) // (self.n_jobs * 4))
+                return list(executor.map(
+                    _evaluate_in_worker, candidates, repeat(metric), chunksize=chunksize
+                ))
+            
+            yield self._memoized(context, evaluate)
+    
+    def _memoized(
+        self,
+        context: EvaluationContext,
+        evaluate: Callable[[List[Dict[str, float]], str], List[float]]
+    ) -> Callable[[List[Dict[str, float]], str], List[float]]:
+        """Wrap a batch evaluator with the fitness cache (if any)"""
+        cache = self.fitness_cache
+        if cache is None:
+            return evaluate
+        context_key = context.cache_key()
+        
+        def memoized(candidates: List[Dict[str, float]], metric: str) -> List[float]:
+            quantized = [cache.quantize(w, self.strategy_names) for w in candidates]
+            keys = [cache.key(context_key, w, metric) for w in quantized]
+            
+            scores: Dict[str, float] = {}
+            pending: Dict[str, Dict[str, float]] = {}
+            for key, weights in zip(keys, quantized):
+                if key in scores or key in pending:
+                    continue
+                score = cache.get(key)
+                if score is None:
+                    pending[key] = weights
+                else:
+                    scores[key] = score
+            
+            if pending:
+                computed = evaluate(list(pending.values()), metric)
+                cache.put_many(list(zip(pending, computed)))
+                scores.update(zip(pending, computed))
+            return [scores[key] for key in keys]
+        
+        return memoized
+    
+    def _scored_weights(self, weights: Dict[str, float]) -> Dict[str, float]:
+        """The weights a candidate is scored at: quantized when a fitness cache is used"""
+        if self.fitness_cache is None:
+            return weights.copy()
+        return self.fitness_cache.quantize(weights, self.strategy_names)
     
     def _generate_weight_combinations(self, weight_values: np.ndarray, num_strategies: int) -> List[List[float]]:
         """Generate all combinations of weights for grid search"""
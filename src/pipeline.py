@@ -0,0 +1,169 @@
+"""
+Staged pipeline for the live trading loop.
+
+A trading cycle runs as data fetch -> signal generation -> risk -> execution.
+Each stage has its own workers and a bounded input queue, so a slow stage
+(a minutes-long TWAP/VWAP execution) only holds up the work queued behind it:
+the next cycle's fetch and analysis proceed meanwhile, and a full queue pushes
+back on the stage feeding it instead of letting work pile up.
+"""
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+from src.utils.logger import logger
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline stage.
+
+    Attributes:
+        name: Stage name used in logs and errors
+        handler: Coroutine function taking an item and returning the items
+            to pass to the next stage (None or empty to pass nothing on)
+        workers: Items the stage works on concurrently
+        queue_size: Items that may wait for the stage before upstream blocks
+    """
+    name: str
+    handler: Callable[[Any], Awaitable[Optional[Iterable[Any]]]]
+    workers: int = 1
+    queue_size: int = 1
+
+
+class InFlightSymbols:
+    """Symbols with an order being worked; each can be claimed by one order at a time"""
+
+    def __init__(self):
+        self._symbols: Set[str] = set()
+
+    def claim(self, symbol: str) -> bool:
+        """Claim a symbol; False if an order for it is already in flight"""
+        if symbol in self._symbols:
+            return False
+        self._symbols.add(symbol)
+        return True
+
+    def release(self, symbol: str) -> None:
+        self._symbols.discard(symbol)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._symbols
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+
+class Pipeline:
+    """
+    Stages connected by bounded asyncio queues.
+
+    Items ``put`` into the pipeline go to the first stage; each handler's
+    outputs are queued for the next one. A handler error is passed to
+    ``on_error(stage_name, item, error)`` and the stage carries on with its
+    next item; if ``on_error`` raises, the pipeline fails and ``put``,
+    ``wait`` and ``join`` re-raise that error.
+    """
+
+    def __init__(
+        self,
+        stages: List[Stage],
+        on_error: Optional[Callable[[str, Any, Exception], None]] = None
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stages: Stages in processing order
+            on_error: Called with errors raised by stage handlers (logged if None)
+        """
+        self.stages = stages
+        self.on_error = on_error
+        self._queues: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        self._error: Optional[Exception] = None
+        self._failed: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        """Start the stage workers (on the running loop)"""
+        if self._tasks:
+            return
+        self._error = None
+        self._failed = asyncio.Event()
+        self._queues = [asyncio.Queue(maxsize=stage.queue_size) for stage in self.stages]
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                self._tasks.append(asyncio.create_task(self._work(index), name=f"{stage.name}-{worker}"))
+
+    async def put(self, item: Any) -> None:
+        """Queue an item for the first stage, waiting while its queue is full"""
+        self._raise_if_failed()
+        await self._until_failed(self._queues[0].put(item))
+
+    async def wait(self, timeout: float) -> None:
+        """Sleep up to ``timeout`` seconds, returning early by raising if the pipeline fails"""
+        try:
+            await asyncio.wait_for(self._failed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        self._raise_if_failed()
+
+    async def join(self) -> None:
+        """Wait until every queued item has passed through all stages"""
+        for queue in self._queues:
+            await self._until_failed(queue.join())
+        self._raise_if_failed()
+
+    async def stop(self) -> None:
+        """Cancel the workers, dropping queued items"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def depths(self) -> Dict[str, int]:
+        """Items waiting per stage"""
+        return {stage.name: queue.qsize() for stage, queue in zip(self.stages, self._queues)}
+
+    async def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        queue = self._queues[index]
+        downstream = self._queues[index + 1] if index + 1 < len(self._queues) else None
+        while True:
+            item = await queue.get()
+            try:
+                outputs = await stage.handler(item)
+                if downstream is not None:
+                    for output in outputs or ():
+                        await downstream.put(output)
+            except Exception as e:
+                try:
+                    self._handle_error(stage.name, item, e)
+                except Exception as fatal:
+                    self._error = fatal
+                    self._failed.set()
+                    return
+            finally:
+                queue.task_done()
+
+    def _handle_error(self, stage_name: str, item: Any, error: Exception) -> None:
+        if self.on_error is None:
+            logger.error(f"Pipeline stage {stage_name} failed: {str(error)}")
+        else:
+            self.on_error(stage_name, item, error)
+
+    async def _until_failed(self, awaitable: Awaitable[Any]) -> Any:
+        # A failed stage never drains its queue; don't wait on it forever
+        task = asyncio.ensure_future(awaitable)
+        failed = asyncio.ensure_future(self._failed.wait())
+        await asyncio.wait([task, failed], return_when=asyncio.FIRST_COMPLETED)
+        failed.cancel()
+        if task.done():
+            return task.result()
+        task.cancel()
+        self._raise_if_failed()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise self._error
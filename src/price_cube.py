@@ -0,0 +1,289 @@
+"""
+Pre-indexed columnar price storage for backtesting.
+"""
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+
+
+FIELDS: Tuple[str, ...] = ("open", "high", "low", "close", "volume")
+
+# Arrays persisted by ``PriceCube.save``, one ``.npy`` file each
+ARRAYS: Tuple[str, ...] = ("dates", "bars", "bar_dates", "offsets", "bar_count", "values")
+
+
+class PriceCube:
+    """
+    Aligned (dates x symbols x OHLCV) price cube built once from per-symbol frames.
+
+    Bars for every symbol are packed into a single ragged array (``bars``) with
+    per-symbol ``offsets``. ``bar_count[t, s]`` holds the number of bars symbol
+    ``s`` has at or before ``dates[t]``, so "latest bar as of date" and "history
+    up to date" lookups are O(1) slices instead of DataFrame scans. ``values``
+    is the as-of aligned cube (NaN before a symbol's first bar).
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        dates: np.ndarray,
+        bars: np.ndarray,
+        bar_dates: np.ndarray,
+        offsets: np.ndarray,
+        bar_count: np.ndarray,
+        values: np.ndarray
+    ):
+        self.symbols = list(symbols)
+        self.symbol_index: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        self.dates = dates
+        self.bars = bars
+        self.bar_dates = bar_dates
+        self.offsets = offsets
+        self.bar_count = bar_count
+        self.values = values
+        self.date_index: Dict[pd.Timestamp, int] = {
+            pd.Timestamp(d): i for i, d in enumerate(dates)
+        }
+
+    @classmethod
+    def from_frames(cls, data: Dict[str, pd.DataFrame]) -> "PriceCube":
+        """Build a cube from ``load_data`` style frames (``date`` column or index)."""
+        symbols = []
+        blocks = []
+        block_dates = []
+        for symbol, df in data.items():
+            if not isinstance(df, pd.DataFrame) or df.empty:
+                continue
+
+            if 'date' in df.columns:
+                dates = pd.to_datetime(df['date']).to_numpy(dtype='datetime64[ns]')
+            else:
+                dates = pd.to_datetime(df.index).to_numpy(dtype='datetime64[ns]')
+
+            if 'close' in df.columns:
+                close = df['close'].to_numpy(dtype=np.float64)
+            elif 'price' in df.columns:
+                close = df['price'].to_numpy(dtype=np.float64)
+            else:
+                continue
+
+            block = np.empty((len(df), len(FIELDS)), dtype=np.float64)
+            for j, field in enumerate(FIELDS):
+                if field == 'close':
+                    block[:, j] = close
+                elif field in df.columns:
+                    block[:, j] = df[field].to_numpy(dtype=np.float64)
+                elif field == 'volume':
+                    block[:, j] = np.nan
+                else:
+                    block[:, j] = close
+
+            # Bars must be in date order for searchsorted lookups
+            order = np.argsort(dates, kind='stable')
+            symbols.append(symbol)
+            blocks.append(block[order])
+            block_dates.append(dates[order])
+
+        return cls.from_arrays(symbols, blocks, block_dates)
+
+    @classmethod
+    def from_arrays(
+        cls,
+        symbols: List[str],
+        blocks: List[np.ndarray],
+        block_dates: List[np.ndarray]
+    ) -> "PriceCube":
+        """Build a cube from per-symbol (n, len(FIELDS)) bar arrays sorted by date."""
+        if symbols:
+            dates = np.unique(np.concatenate(block_dates))
+            bars = np.concatenate(blocks).astype(np.float64, copy=False)
+            bar_dates = np.concatenate(block_dates)
+        else:
+            dates = np.array([], dtype='datetime64[ns]')
+            bars = np.empty((0, len(FIELDS)), dtype=np.float64)
+            bar_dates = np.array([], dtype='datetime64[ns]')
+
+        offsets = np.zeros(len(symbols) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(b) for b in block_dates], dtype=np.int64)
+
+        bar_count = np.empty((len(dates), len(symbols)), dtype=np.int64)
+        for s, symbol_dates in enumerate(block_dates):
+            bar_count[:, s] = np.searchsorted(symbol_dates, dates, side='right')
+
+        # As-of aligned view: latest bar at or before each date
+        latest = offsets[:-1][np.newaxis, :] + bar_count - 1
+        values = bars[np.clip(latest, 0, None)] if len(bars) else np.empty(
+            (len(dates), len(symbols), len(FIELDS)), dtype=np.float64
+        )
+        values[bar_count == 0] = np.nan
+
+        return cls(symbols, dates, bars, bar_dates, offsets, bar_count, values)
+
+    def save(self, directory: str) -> None:
+        """Write the cube as one ``.npy`` file per array plus ``symbols.json``"""
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAYS:
+            np.save(os.path.join(directory, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(directory, "symbols.json"), "w") as f:
+            json.dump(self.symbols, f)
+
+    @classmethod
+    def load(cls, directory: str, mmap_mode: Optional[str] = "r") -> "PriceCube":
+        """Load a saved cube; by default arrays are read-only memory maps (no copy)"""
+        with open(os.path.join(directory, "symbols.json")) as f:
+            symbols = json.load(f)
+        arrays = [
+            np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mmap_mode)
+            for name in ARRAYS
+        ]
+        return cls(symbols, *arrays)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.symbol_index
+
+    def date_at(self, row: int) -> datetime:
+        """Date of a cube row as a pandas Timestamp"""
+        return pd.Timestamp(self.dates[row])
+
+    def row_range(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> range:
+        """Rows whose dates fall within [start_date, end_date]"""
+        start = 0
+        stop = len(self.dates)
+        if start_date is not None:
+            start = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(start_date)), side='left'))
+        if end_date is not None:
+            stop = int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(end_date)), side='right'))
+        return range(start, max(start, stop))
+
+    def row_for(self, date: datetime) -> int:
+        """Row of the latest cube date at or before ``date`` (-1 if none)"""
+        row = self.date_index.get(pd.Timestamp(date))
+        if row is not None:
+            return row
+        return int(np.searchsorted(self.dates, np.datetime64(pd.Timestamp(date)), side='right')) - 1
+
+    def price(self, symbol: str, row: int, field: str = "close") -> Optional[float]:
+        """As-of price for a symbol at a cube row"""
+        s = self.symbol_index.get(symbol)
+        if s is None or row < 0:
+            return None
+        value = self.values[row, s, FIELDS.index(field)]
+        if np.isnan(value):
+            return None
+        return float(value)
+
+    def prices(self, row: int, field: str = "close") -> np.ndarray:
+        """As-of prices for all symbols at a cube row"""
+        return self.values[row, :, FIELDS.index(field)]
+
+    def _bar_slice(self, symbol: str, row: int, lookback: Optional[int] = None) -> slice:
+        s = self.symbol_index[symbol]
+        start = self.offsets[s]
+        stop = start + self.bar_count[row, s]
+        if lookback is not None:
+            start = max(start, stop - lookback)
+        return slice(start, stop)
+
+    def history(self, symbol: str, row: int, lookback: Optional[int] = None) -> np.ndarray:
+        """Bars (n, len(FIELDS)) for a symbol up to a cube row, as a view"""
+        if symbol not in self.symbol_index or row < 0:
+            return self.bars[:0]
+        return self.bars[self._bar_slice(symbol, row, lookback)]
+
+    def closes(self, symbol: str, row: int, lookback: Optional[int] = None) -> np.ndarray:
+        """Closing prices for a symbol up to a cube row, as a view"""
+        return self.history(symbol, row, lookback)[:, FIELDS.index("close")]
+
+    def frame(self, symbol: str, row: int, lookback: Optional[int] = None) -> pd.DataFrame:
+        """History up to a cube row as a DataFrame indexed by date (no data copy)"""
+        if symbol not in self.symbol_index or row < 0:
+            return pd.DataFrame(columns=list(FIELDS))
+        bar_slice = self._bar_slice(symbol, row, lookback)
+        return pd.DataFrame(
+            self.bars[bar_slice],
+            index=pd.DatetimeIndex(self.bar_dates[bar_slice], name='date'),
+            columns=list(FIELDS),
+            copy=False
+        )
+
+    def snapshot(self, row: int) -> "CubeSnapshot":
+        """Lazy ``{symbol: frame}`` mapping of every listed symbol's history up to a row"""
+        return CubeSnapshot(self, row)
+
+
+class CubeSnapshot(Mapping):
+    """
+    Read-only ``Dict[str, pd.DataFrame]`` view of a cube row.
+
+    Frames are only materialised for symbols a strategy actually reads, so
+    strategies that ignore most of the universe do not pay for it.
+    """
+
+    def __init__(self, cube: PriceCube, row: int):
+        self.cube = cube
+        self.row = row
+        listed = np.flatnonzero(cube.bar_count[row] > 0) if row >= 0 else []
+        self._listed = [cube.symbols[s] for s in listed]
+        self._listed_set = set(self._listed)
+        self._frames: Dict[str, pd.DataFrame] = {}
+
+    def __getitem__(self, symbol: str) -> pd.DataFrame:
+        if symbol not in self._listed_set:
+            raise KeyError(symbol)
+        frame = self._frames.get(symbol)
+        if frame is None:
+            frame = self.cube.frame(symbol, self.row)
+            self._frames[symbol] = frame
+        return frame
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._listed)
+
+    def __len__(self) -> int:
+        return len(self._listed)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._listed_set
+
+
+class SharedPriceCube:
+    """
+    A cube published as memory-mapped files for worker processes.
+
+    The owner writes the arrays once (to ``/dev/shm`` when available); workers
+    ``attach()`` read-only memory maps of the same pages, so memory use stays
+    flat however many workers attach. Instances pickle as just the path.
+    """
+
+    def __init__(self, cube: PriceCube, directory: Optional[str] = None):
+        if directory is None and os.path.isdir("/dev/shm"):
+            directory = "/dev/shm"
+        self.path = tempfile.mkdtemp(prefix="price_cube_", dir=directory)
+        cube.save(self.path)
+
+    def attach(self) -> PriceCube:
+        """Read-only, zero-copy view of the shared cube"""
+        return PriceCube.load(self.path, mmap_mode="r")
+
+    def close(self) -> None:
+        """Remove the backing files (attached maps stay valid until released)"""
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def __enter__(self) -> "SharedPriceCube":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
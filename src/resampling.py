@@ -0,0 +1,345 @@
+"""
+Multi-timeframe OHLCV resampling for backtest and live data.
+
+Minute bars (from ``load_data`` or the ClickHouse ``candles`` table written by
+``src/backfill.py``) are aggregated into 5m/15m/1h/1d bars incrementally: each
+update only folds in bars newer than the last one seen, and the forming
+(partial) bar is updated in place.
+"""
+import threading
+import numpy as np
+import pandas as pd
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.indicators import bar_timestamps
+from src.price_cube import FIELDS
+from src.results_store import ColumnBuffer
+
+
+TIMEFRAMES: Dict[str, np.timedelta64] = {
+    "1m": np.timedelta64(1, "m"),
+    "5m": np.timedelta64(5, "m"),
+    "15m": np.timedelta64(15, "m"),
+    "1h": np.timedelta64(1, "h"),
+    "1d": np.timedelta64(1, "D"),
+}
+
+# BacktestParameters.data_frequency values with a fixed bar size
+FREQUENCY_TIMEFRAMES: Dict[str, str] = {
+    "minute": "1m",
+    "hourly": "1h",
+    "daily": "1d",
+}
+
+# pandas period aliases for BacktestParameters.rebalance_frequency values
+REBALANCE_PERIODS: Dict[str, str] = {
+    "minute": "min",
+    "hourly": "h",
+    "daily": "D",
+    "weekly": "W",
+    "monthly": "M",
+}
+
+
+def timeframe_step(timeframe: str) -> int:
+    """Bar size of a timeframe in nanoseconds"""
+    try:
+        return int(TIMEFRAMES[timeframe] / np.timedelta64(1, "ns"))
+    except KeyError:
+        raise ValueError(f"Unknown timeframe '{timeframe}', expected one of {list(TIMEFRAMES)}")
+
+
+def _bar_arrays(df: pd.DataFrame) -> Tuple[Optional[np.ndarray], np.ndarray]:
+    """Timestamps (ns) and (n, len(FIELDS)) OHLCV values of a frame"""
+    timestamps = bar_timestamps(df)
+    if timestamps is not None:
+        timestamps = timestamps.astype("datetime64[ns]").view(np.int64)
+
+    close = df["close"].to_numpy(dtype=np.float64) if "close" in df.columns else df["price"].to_numpy(dtype=np.float64)
+    values = np.empty((len(df), len(FIELDS)), dtype=np.float64)
+    for j, field in enumerate(FIELDS):
+        if field in df.columns:
+            values[:, j] = df[field].to_numpy(dtype=np.float64)
+        else:
+            values[:, j] = np.nan if field == "volume" else close
+    return timestamps, values
+
+
+def aggregate_bars(
+    timestamps: np.ndarray,
+    values: np.ndarray,
+    step: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Aggregate sorted bars into ``step``-sized buckets.
+
+    Returns the bucket start timestamps (ns) and (buckets, len(FIELDS)) OHLCV
+    values: first open, max high, min low, last close, summed volume.
+    """
+    buckets = timestamps // step * step
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]]) if len(buckets) else buckets[:0]
+    ends = np.r_[starts[1:], len(buckets)] - 1
+
+    out = np.empty((len(starts), len(FIELDS)), dtype=np.float64)
+    if len(starts):
+        out[:, 0] = values[starts, 0]
+        out[:, 1] = np.maximum.reduceat(values[:, 1], starts)
+        out[:, 2] = np.minimum.reduceat(values[:, 2], starts)
+        out[:, 3] = values[ends, 3]
+        out[:, 4] = np.add.reduceat(values[:, 4], starts)
+    return buckets[starts], out
+
+
+def resample_bars(df: pd.DataFrame, timeframe: str) -> pd.DataFrame:
+    """Resample one symbol's bars (``date``/``timestamp`` column or DatetimeIndex) in one pass"""
+    resampler = IncrementalResampler(timeframe)
+    resampler.update(df)
+    return resampler.frame().copy()
+
+
+def resample_frames(data: Dict[str, pd.DataFrame], timeframe: str) -> Dict[str, pd.DataFrame]:
+    """Resample ``load_data`` output to a coarser timeframe (``date`` column kept)"""
+    return {
+        symbol: resample_bars(df, timeframe).reset_index()
+        for symbol, df in data.items()
+        if isinstance(df, pd.DataFrame) and not df.empty
+    }
+
+
+def resample_to_frequency(data: Dict[str, pd.DataFrame], data_frequency: str) -> Dict[str, pd.DataFrame]:
+    """``load_data`` output resampled to a ``data_frequency`` if its bars are finer (else ``data`` itself)"""
+    timeframe = FREQUENCY_TIMEFRAMES.get(data_frequency)
+    if timeframe is None:
+        return data
+    step = infer_bar_step(data)
+    if step is None or step >= timeframe_step(timeframe):
+        return data
+    return resample_frames(data, timeframe)
+
+
+def infer_bar_step(data: Dict[str, pd.DataFrame]) -> Optional[int]:
+    """Smallest median bar spacing (ns) across symbols, or None if unknown"""
+    steps = []
+    for df in data.values():
+        if not isinstance(df, pd.DataFrame) or len(df) < 2:
+            continue
+        timestamps = bar_timestamps(df)
+        if timestamps is None:
+            continue
+        diffs = np.diff(timestamps.astype("datetime64[ns]").view(np.int64))
+        steps.append(int(np.median(diffs)))
+    return min(steps) if steps else None
+
+
+def period_starts(dates: np.ndarray, frequency: str) -> np.ndarray:
+    """Boolean mask of the first date in each ``frequency`` period (see ``REBALANCE_PERIODS``)"""
+    try:
+        alias = REBALANCE_PERIODS[frequency]
+    except KeyError:
+        raise ValueError(f"Unknown rebalance frequency '{frequency}', expected one of {list(REBALANCE_PERIODS)}")
+    if len(dates) == 0:
+        return np.zeros(0, dtype=bool)
+    periods = pd.DatetimeIndex(dates).to_period(alias).asi8
+    return np.r_[True, periods[1:] != periods[:-1]]
+
+
+class IncrementalResampler:
+    """
+    One symbol's bars aggregated to a coarser timeframe, updated incrementally.
+
+    Bars are kept in a growable (n, len(FIELDS)) buffer whose last row is the
+    forming bar; ``update`` folds newer source bars into it and appends new
+    buckets, so keeping a timeframe current costs O(new bars). A last source
+    bar revised in place (a live bar still forming) re-aggregates the forming
+    bucket; if the source history no longer continues from the last bar seen,
+    it is rebuilt.
+    """
+
+    def __init__(self, timeframe: str):
+        self.timeframe = timeframe
+        self.step = timeframe_step(timeframe)
+        self.last_timestamp: Optional[int] = None
+        self._last_values: Optional[np.ndarray] = None
+        self._dates = ColumnBuffer(np.int64)
+        self._values = ColumnBuffer(np.dtype((np.float64, len(FIELDS))))
+        self._frame: Optional[pd.DataFrame] = None
+
+    def reset(self) -> None:
+        self.last_timestamp = None
+        self._last_values = None
+        self._dates.clear()
+        self._values.clear()
+        self._frame = None
+
+    def update(self, df: pd.DataFrame) -> int:
+        """Fold source bars newer than the last one seen; returns how many were new"""
+        timestamps, values = _bar_arrays(df)
+        if timestamps is None:
+            raise ValueError("Resampling needs bar timestamps (date/timestamp column or DatetimeIndex)")
+
+        start = 0
+        if self.last_timestamp is not None:
+            start = int(np.searchsorted(timestamps, self.last_timestamp, side="right"))
+            if start == 0 or timestamps[start - 1] != self.last_timestamp:
+                self.reset()
+                start = 0
+            elif not np.array_equal(values[start - 1], self._last_values, equal_nan=True):
+                start = self._reopen_forming_bucket(timestamps)
+        if start == len(timestamps):
+            return 0
+
+        buckets, bars = aggregate_bars(timestamps[start:], values[start:], self.step)
+        dates = self._dates.values()
+        if len(dates) and buckets[0] == dates[-1]:
+            # Merge into the forming bar
+            partial = self._values.values()[-1]
+            first = bars[0]
+            partial[1] = max(partial[1], first[1])
+            partial[2] = min(partial[2], first[2])
+            partial[3] = first[3]
+            partial[4] = partial[4] + first[4]
+            buckets, bars = buckets[1:], bars[1:]
+        for bucket, bar in zip(buckets, bars):
+            self._dates.append(bucket)
+            self._values.append(bar)
+
+        self.last_timestamp = int(timestamps[-1])
+        self._last_values = values[-1].copy()
+        self._frame = None
+        return len(timestamps) - start
+
+    def _reopen_forming_bucket(self, timestamps: np.ndarray) -> int:
+        """Drop the forming bucket and return the source position to refold it from"""
+        bucket = self._dates.values()[-1]
+        first = int(np.searchsorted(timestamps, bucket, side="left"))
+        if first == 0 and timestamps[0] != bucket:
+            # The source starts inside the bucket: its earlier bars are unknown
+            self.reset()
+            return 0
+        self._dates.truncate(len(self._dates) - 1)
+        self._values.truncate(len(self._values) - 1)
+        self._frame = None
+        return first
+
+    def frame(self, include_partial: bool = True) -> pd.DataFrame:
+        """Resampled bars indexed by bucket start (no data copy); the last one may be forming"""
+        if self._frame is None:
+            self._frame = pd.DataFrame(
+                self._values.values(),
+                index=pd.DatetimeIndex(self._dates.values().view("datetime64[ns]"), name="date"),
+                columns=list(FIELDS),
+                copy=False
+            )
+        if include_partial:
+            return self._frame
+        # A bucket is only known to be complete once a bar beyond it has been seen
+        return self._frame.iloc[:-1]
+
+
+class ResampleCache:
+    """Incremental resamplers per (symbol, timeframe)"""
+
+    def __init__(self):
+        self._resamplers: Dict[Tuple[str, str], IncrementalResampler] = {}
+        # Strategies sharing the cache may run in worker threads
+        self._lock = threading.RLock()
+
+    def get(
+        self,
+        symbol: str,
+        df: pd.DataFrame,
+        timeframe: str,
+        include_partial: bool = True
+    ) -> pd.DataFrame:
+        """``df`` resampled to ``timeframe``, folding in only bars not seen before"""
+        key = (symbol, timeframe)
+        with self._lock:
+            resampler = self._resamplers.get(key)
+            if resampler is None:
+                resampler = IncrementalResampler(timeframe)
+                self._resamplers[key] = resampler
+            resampler.update(df)
+            return resampler.frame(include_partial)
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        with self._lock:
+            if symbol is None:
+                self._resamplers.clear()
+            else:
+                for key in [k for k in self._resamplers if k[0] == symbol]:
+                    del self._resamplers[key]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Locks don't pickle; each process gets its own
+        return {k: v for k, v in vars(self).items() if k != "_lock"}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        vars(self).update(state)
+        self._lock = threading.RLock()
+
+
+class TimeframeView(Mapping):
+    """Read-only ``{symbol: frame}`` view of data resampled to one timeframe on access"""
+
+    def __init__(self, data: Mapping, timeframe: str, cache: ResampleCache):
+        self.data = data
+        self.timeframe = timeframe
+        self.cache = cache
+
+    def __getitem__(self, symbol: str) -> Any:
+        df = self.data[symbol]
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            return df
+        return self.cache.get(symbol, df, self.timeframe)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self.data
+
+
+def load_candles(
+    client: Any,
+    symbols: Optional[List[str]] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    table: str = "candles"
+) -> Dict[str, pd.DataFrame]:
+    """
+    Load minute candles from ClickHouse in ``load_data`` format.
+
+    Args:
+        client: clickhouse_connect client (as created in ``src/backfill.py``)
+        symbols: Symbols to load (all if None)
+        start: First timestamp to load
+        end: Last timestamp to load
+        table: Candles table name
+    """
+    conditions = []
+    parameters: Dict[str, Any] = {}
+    if symbols:
+        conditions.append("symbol IN {symbols:Array(String)}")
+        parameters["symbols"] = list(symbols)
+    if start is not None:
+        conditions.append("timestamp >= {start:DateTime}")
+        parameters["start"] = start
+    if end is not None:
+        conditions.append("timestamp <= {end:DateTime}")
+        parameters["end"] = end
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    df = client.query_df(
+        f"SELECT timestamp, symbol, open, high, low, close, volume FROM {table}{where} "
+        f"ORDER BY symbol, timestamp",
+        parameters=parameters
+    )
+    data = {}
+    for symbol, group in df.groupby("symbol", sort=False):
+        data[symbol] = group.drop(columns="symbol").rename(columns={"timestamp": "date"}).reset_index(drop=True)
+    return data
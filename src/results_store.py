@@ -0,0 +1,140 @@
+"""
+Columnar storage for backtest results.
+
+Per-bar values, trades and signals are appended to typed, preallocated NumPy
+buffers instead of lists of dicts. A ``ParquetSpill`` can be attached so full
+chunks are written to disk during the run, which bounds memory for arbitrarily
+long backtests.
+"""
+import json
+import os
+import numpy as np
+from typing import Dict, List, Any, Optional
+
+
+BAR_DTYPE = np.dtype([
+    ("date", "datetime64[ns]"),
+    ("equity", np.float64),
+    ("cash", np.float64),
+    ("drawdown", np.float64),
+])
+
+TRADE_DTYPE = np.dtype([
+    ("symbol", np.int32),
+    ("direction", np.int8),
+    ("entry_date", "datetime64[ns]"),
+    ("entry_price", np.float64),
+    ("exit_date", "datetime64[ns]"),
+    ("exit_price", np.float64),
+    ("quantity", np.float64),
+    ("pnl", np.float64),
+    ("return_pct", np.float64),
+    ("reason", np.int16),
+])
+
+SIGNAL_DTYPE = np.dtype([
+    ("date", "datetime64[ns]"),
+    ("symbol", np.int32),
+    ("signal_type", np.int8),
+    ("confidence", np.float64),
+    ("source", np.int16),
+])
+
+
+class ColumnBuffer:
+    """Growable typed array with amortized O(1) appends (plain or structured dtype)"""
+
+    def __init__(self, dtype: np.dtype, capacity: int = 1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def append(self, value: Any) -> None:
+        if self._size == len(self._data):
+            grown = np.empty(max(1, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size] = value
+        self._size += 1
+
+    def values(self) -> np.ndarray:
+        """Filled part of the buffer, as a view"""
+        return self._data[:self._size]
+
+    def clear(self) -> None:
+        self._size = 0
+
+    def truncate(self, size: int) -> None:
+        """Drop values past the first ``size``"""
+        self._size = min(self._size, size)
+
+    def __len__(self) -> int:
+        return self._size
+
+
+class LabelTable:
+    """Interns repeated strings (symbols, sources, reasons) as small integer codes"""
+
+    def __init__(self, labels: Optional[List[str]] = None):
+        self.labels: List[str] = []
+        self._codes: Dict[str, int] = {}
+        for label in labels or []:
+            self.code(label)
+
+    def code(self, label: str) -> int:
+        code = self._codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self._codes[label] = code
+            self.labels.append(label)
+        return code
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Object array of labels for an array of codes"""
+        return np.asarray(self.labels + [None], dtype=object)[codes]
+
+
+class ParquetSpill:
+    """
+    Chunked Parquet writer for result buffers.
+
+    Each ``write`` adds a part file ``<name>-NNNNN.parquet`` under ``directory``;
+    ``read`` concatenates a name's parts back into a structured array.
+    Requires ``pyarrow``.
+    """
+
+    def __init__(self, directory: str):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError("Streaming backtest results to Parquet requires pyarrow")
+        self.directory = directory
+        self._parts: Dict[str, int] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def write(self, name: str, records: np.ndarray) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if not len(records):
+            return
+        part = self._parts.get(name, 0)
+        table = pa.table({field: records[field] for field in records.dtype.names})
+        pq.write_table(table, os.path.join(self.directory, f"{name}-{part:05d}.parquet"))
+        self._parts[name] = part + 1
+
+    def read(self, name: str, dtype: np.dtype) -> np.ndarray:
+        import pyarrow.parquet as pq
+
+        chunks = []
+        for part in range(self._parts.get(name, 0)):
+            table = pq.read_table(os.path.join(self.directory, f"{name}-{part:05d}.parquet"))
+            chunk = np.empty(table.num_rows, dtype=dtype)
+            for field in dtype.names:
+                chunk[field] = table.column(field).to_numpy()
+            chunks.append(chunk)
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=dtype)
+
+    def write_labels(self, tables: Dict[str, LabelTable]) -> None:
+        """Save the code -> label tables needed to decode spilled columns"""
+        with open(os.path.join(self.directory, "labels.json"), "w") as f:
+            json.dump({name: table.labels for name, table in tables.items()}, f)
@@ -0,0 +1,253 @@
+"""
+Monte Carlo / bootstrap robustness analysis of backtest results.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from src.backtesting import BacktestResults
+from src.backtest_metrics import periods_per_year as bars_per_year
+
+
+METRICS: Tuple[str, ...] = ("sharpe_ratio", "max_drawdown", "cagr")
+
+# Largest (paths x steps) matrix a batch builds; batches of long series get
+# fewer paths so memory stays bounded however many bars the backtest has
+MAX_BATCH_CELLS = 20_000_000
+
+
+@dataclass
+class RobustnessReport:
+    """Distributions of path metrics from one resampling method"""
+    method: str
+    sharpe_ratio: np.ndarray
+    max_drawdown: np.ndarray
+    cagr: np.ndarray
+
+    @property
+    def n_paths(self) -> int:
+        return len(self.sharpe_ratio)
+
+    def confidence_interval(self, metric: str, level: float = 0.95) -> Tuple[float, float]:
+        """Central ``level`` interval of a metric's distribution"""
+        values = getattr(self, metric)
+        tail = (1 - level) / 2 * 100
+        low, high = np.nanpercentile(values, [tail, 100 - tail])
+        return float(low), float(high)
+
+    def summary(self, level: float = 0.95) -> pd.DataFrame:
+        """Mean, median and confidence bounds per metric"""
+        rows = {}
+        for metric in METRICS:
+            values = getattr(self, metric)
+            low, high = self.confidence_interval(metric, level)
+            rows[metric] = {
+                "mean": float(np.nanmean(values)),
+                "median": float(np.nanmedian(values)),
+                "lower": low,
+                "upper": high
+            }
+        return pd.DataFrame(rows).T
+
+
+def path_metrics(
+    equity: np.ndarray,
+    periods_per_year: float,
+    years: float,
+    risk_free_rate: float = 0.0
+) -> Dict[str, np.ndarray]:
+    """
+    Sharpe ratio, max drawdown and CAGR of every row of an equity matrix.
+
+    Args:
+        equity: (paths, steps + 1) equity values, starting equity in column 0
+        periods_per_year: Steps per year, for Sharpe annualization
+        years: Calendar length of each path, for CAGR
+        risk_free_rate: Annual risk-free rate
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        returns = equity[:, 1:] / equity[:, :-1] - 1
+        excess = returns - risk_free_rate / periods_per_year
+        volatility = returns.std(axis=1)
+        sharpe = np.where(
+            volatility > 0, excess.mean(axis=1) / volatility * np.sqrt(periods_per_year), 0.0
+        )
+
+        peaks = np.maximum.accumulate(equity, axis=1)
+        max_drawdown = ((peaks - equity) / peaks).max(axis=1)
+
+        growth = equity[:, -1] / equity[:, 0]
+        cagr = np.where(growth > 0, growth ** (1 / years) - 1, -1.0) if years > 0 else growth - 1
+
+    return {"sharpe_ratio": sharpe, "max_drawdown": max_drawdown, "cagr": cagr}
+
+
+def _simulate_batch(
+    method: str,
+    inputs: Dict[str, Any],
+    n_paths: int,
+    seed: np.random.SeedSequence
+) -> Dict[str, np.ndarray]:
+    """Simulate ``n_paths`` paths of one method as a single array operation"""
+    rng = np.random.default_rng(seed)
+    initial = inputs["initial_equity"]
+
+    if method == "trade_shuffle":
+        pnl = rng.permuted(np.broadcast_to(inputs["pnl"], (n_paths, len(inputs["pnl"]))), axis=1)
+        steps = initial + np.cumsum(pnl, axis=1)
+    elif method == "block_bootstrap":
+        returns = inputs["returns"]
+        n = len(returns)
+        block_size = min(inputs["block_size"], n)
+        n_blocks = -(-n // block_size)
+        # Circular blocks so every return is equally likely to be drawn
+        starts = rng.integers(0, n, size=(n_paths, n_blocks))
+        index = (starts[:, :, np.newaxis] + np.arange(block_size)) % n
+        sampled = returns[index.reshape(n_paths, -1)[:, :n]]
+        steps = initial * np.cumprod(1 + sampled, axis=1)
+    elif method == "parameter_jitter":
+        # Relative jitter of commission and slippage, applied to every trade's
+        # round-trip notional (first-order effect on its P&L)
+        scale = inputs["jitter"]
+        commission = inputs["commission_pct"] * np.clip(1 + rng.normal(0, scale, n_paths), 0, None)
+        slippage = inputs["slippage_pct"] * np.clip(1 + rng.normal(0, scale, n_paths), 0, None)
+        extra_cost = (commission - inputs["commission_pct"]) + (slippage - inputs["slippage_pct"])
+        pnl = inputs["pnl"] - extra_cost[:, np.newaxis] * inputs["notional"]
+        steps = initial + np.cumsum(pnl, axis=1)
+    else:
+        raise ValueError(f"Unknown resampling method: {method}")
+
+    equity = np.concatenate([np.full((n_paths, 1), initial), steps], axis=1)
+    return path_metrics(equity, inputs["periods_per_year"], inputs["years"], inputs["risk_free_rate"])
+
+
+class MonteCarloEngine:
+    """
+    Resampling engine for the robustness of a backtest.
+
+    Builds metric distributions from a finished ``BacktestResults`` without
+    re-running the backtest:
+
+    - ``trade_shuffle``: random reorderings of the closed trades' P&L
+    - ``block_bootstrap``: circular block bootstrap of the per-bar returns
+    - ``parameter_jitter``: commission and slippage perturbed around the
+      backtest's settings, applied to each trade
+
+    Paths are simulated in vectorized batches of up to ``batch_size`` (fewer
+    for long series, see ``MAX_BATCH_CELLS``) and batches are spread over
+    ``n_jobs`` processes. Each batch gets its own spawned seed, so results
+    for a given ``seed`` do not depend on ``n_jobs``. Sharpe ratios are
+    annualized like ``results.metrics``: at the results' data frequency and
+    risk-free rate unless given.
+    """
+
+    def __init__(
+        self,
+        results: BacktestResults,
+        periods_per_year: Optional[float] = None,
+        risk_free_rate: Optional[float] = None,
+        commission_pct: float = 0.001,
+        slippage_pct: float = 0.001,
+        batch_size: int = 2000,
+        n_jobs: Optional[int] = 1,
+        seed: Optional[int] = None
+    ):
+        if len(results.equity_curve) < 2:
+            raise ValueError("Backtest results need at least two equity points")
+
+        self.results = results
+        self.periods_per_year = (
+            bars_per_year(results.data_frequency) if periods_per_year is None else periods_per_year
+        )
+        self.risk_free_rate = results.risk_free_rate if risk_free_rate is None else risk_free_rate
+        self.commission_pct = commission_pct
+        self.slippage_pct = slippage_pct
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+        self.seed = seed
+
+        trades = results.trade_records
+        self.equity = np.asarray(results.equity_curve, dtype=np.float64)
+        self.pnl = trades["pnl"]
+        self.notional = trades["quantity"] * (trades["entry_price"] + trades["exit_price"])
+
+        if len(results.dates) >= 2:
+            days = (pd.Timestamp(results.dates[-1]) - pd.Timestamp(results.dates[0])).days
+            self.years = days / 365.25
+        else:
+            self.years = (len(self.equity) - 1) / self.periods_per_year
+
+    def trade_shuffle(self, n_paths: int = 10000) -> RobustnessReport:
+        """Distribution over random orderings of the closed trades"""
+        self._require_trades()
+        return self._run("trade_shuffle", {"pnl": self.pnl}, n_paths, self._trades_per_year())
+
+    def block_bootstrap(self, n_paths: int = 10000, block_size: int = 20) -> RobustnessReport:
+        """Distribution over block-bootstrapped return paths"""
+        returns = self.equity[1:] / self.equity[:-1] - 1
+        inputs = {"returns": returns, "block_size": block_size}
+        return self._run("block_bootstrap", inputs, n_paths, self.periods_per_year)
+
+    def parameter_jitter(self, n_paths: int = 10000, jitter: float = 0.5) -> RobustnessReport:
+        """Distribution over commission/slippage jittered by a relative std of ``jitter``"""
+        self._require_trades()
+        inputs = {
+            "pnl": self.pnl,
+            "notional": self.notional,
+            "jitter": jitter,
+            "commission_pct": self.commission_pct,
+            "slippage_pct": self.slippage_pct
+        }
+        return self._run("parameter_jitter", inputs, n_paths, self._trades_per_year())
+
+    def run_all(self, n_paths: int = 10000) -> Dict[str, RobustnessReport]:
+        """Every resampling method with its default settings"""
+        reports = {"block_bootstrap": self.block_bootstrap(n_paths)}
+        if len(self.pnl):
+            reports["trade_shuffle"] = self.trade_shuffle(n_paths)
+            reports["parameter_jitter"] = self.parameter_jitter(n_paths)
+        return reports
+
+    def _require_trades(self) -> None:
+        if not len(self.pnl):
+            raise ValueError("Backtest results contain no trades")
+
+    def _trades_per_year(self) -> float:
+        return len(self.pnl) / self.years if self.years > 0 else len(self.pnl)
+
+    def _run(
+        self,
+        method: str,
+        inputs: Dict[str, Any],
+        n_paths: int,
+        periods_per_year: float
+    ) -> RobustnessReport:
+        inputs = dict(
+            inputs,
+            initial_equity=self.equity[0],
+            periods_per_year=periods_per_year,
+            years=self.years,
+            risk_free_rate=self.risk_free_rate
+        )
+        steps = len(inputs["returns"] if method == "block_bootstrap" else inputs["pnl"])
+        batch_size = max(1, min(self.batch_size, MAX_BATCH_CELLS // max(steps, 1)))
+        sizes = [batch_size] * (n_paths // batch_size)
+        if n_paths % batch_size:
+            sizes.append(n_paths % batch_size)
+        seeds = np.random.SeedSequence(self.seed).spawn(len(sizes))
+
+        if self.n_jobs == 1 or len(sizes) == 1:
+            batches = [_simulate_batch(method, inputs, n, s) for n, s in zip(sizes, seeds)]
+        else:
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                futures = [
+                    executor.submit(_simulate_batch, method, inputs, n, s)
+                    for n, s in zip(sizes, seeds)
+                ]
+                batches = [future.result() for future in futures]
+
+        return RobustnessReport(method, **{
+            metric: np.concatenate([batch[metric] for batch in batches]) for metric in METRICS
+        })
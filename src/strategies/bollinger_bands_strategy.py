@@ -3,9 +3,9 @@ Bollinger Bands trading strategy implementation.
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple, Union
 
-from src.strategy_framework import TechnicalStrategy, Signal, SignalType
+from src.strategy_framework import TechnicalStrategy, Signal, SignalType, previous_bar
 
 
 class BollingerBandsStrategy(TechnicalStrategy):
@@ -17,6 +17,9 @@ class BollingerBandsStrategy(TechnicalStrategy):
     on the distance between the price and the middle band (normalized by the band width).
     """
     
+    vectorizable = True
+    batchable = True
+    
     def __init__(self, window: int = 20, num_std: float = 2.0):
         """
         Initialize the Bollinger Bands strategy.
@@ -29,6 +32,22 @@ class BollingerBandsStrategy(TechnicalStrategy):
         self.window = window
         self.num_std = num_std
     
+    def _bands(self, row: Dict[str, float]) -> Dict[str, float]:
+        """Bollinger Bands and %B from a rolling mean/std row"""
+        # Bands need a full window
+        middle_band = row['mean'] if row['count'] >= self.window else float('nan')
+        upper_band = middle_band + (row['std'] * self.num_std)
+        lower_band = middle_band - (row['std'] * self.num_std)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent_b = float(np.float64(row['close'] - lower_band) / np.float64(upper_band - lower_band))
+        return {
+            "close": row['close'],
+            "middle_band": middle_band,
+            "upper_band": upper_band,
+            "lower_band": lower_band,
+            "percent_b": percent_b
+        }
+    
     def generate_signals(self, data: Dict[str, Any]) -> List[Signal]:
         """
         Generate trading signals based on Bollinger Bands.
@@ -45,26 +64,15 @@ class BollingerBandsStrategy(TechnicalStrategy):
             if not isinstance(df, pd.DataFrame):
                 continue
             
-            # Calculate Bollinger Bands
-            df = df.copy()
-            df['middle_band'] = df['close'].rolling(window=self.window).mean()
-            df['std'] = df['close'].rolling(window=self.window).std()
-            df['upper_band'] = df['middle_band'] + (df['std'] * self.num_std)
-            df['lower_band'] = df['middle_band'] - (df['std'] * self.num_std)
-            
-            # Calculate %B (percent bandwidth) - where price is relative to the bands
-            df['percent_b'] = (df['close'] - df['lower_band']) / (df['upper_band'] - df['lower_band'])
-            
-            # Skip if we don't have enough data
-            if df.iloc[-1]['middle_band'] is np.nan:
-                continue
+            # Update the rolling mean/std (shared with other strategies) with bars not seen yet
+            stream = self.indicator(symbol, df, "rolling", self.window)
             
             # Get the last two rows to check for crossovers
-            if len(df) < 2:
+            if stream.prev_row is None:
                 continue
                 
-            last_row = df.iloc[-1]
-            prev_row = df.iloc[-2]
+            last_row = self._bands(stream.last_row)
+            prev_row = self._bands(stream.prev_row)
             
             # Calculate band width as percentage of price
             band_width = (last_row['upper_band'] - last_row['lower_band']) / last_row['middle_band']
@@ -114,6 +122,77 @@ class BollingerBandsStrategy(TechnicalStrategy):
         
         return signals
     
+    def generate_signal_series(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generate Bollinger Bands signals for every bar at once.
+        
+        Args:
+            df: Price history for a single symbol
+            
+        Returns:
+            DataFrame with ``signal`` (NaN where no signal) and ``confidence``
+        """
+        signal, confidence = self._signals(df['close'])
+        return pd.DataFrame({"signal": signal, "confidence": confidence}, index=df.index)
+    
+    @property
+    def signal_lookback(self) -> int:
+        # Bands at the latest and the previous bar
+        return self.window + 1
+    
+    def generate_signal_matrix(self, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate Bollinger Bands signals for many symbols at their latest bar.
+        
+        Args:
+            close: (bars x symbols) closes (see ``close_matrix``)
+            
+        Returns:
+            Per-symbol ``signal`` (NaN where no signal) and ``confidence``
+        """
+        # Padding above a symbol's first bars leaves its bands NaN, as a short history does
+        signal, confidence = self._signals(pd.DataFrame(close[-self.signal_lookback:]))
+        return signal[-1], confidence[-1]
+    
+    def _signals(self, close: Union[pd.Series, pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-bar signal values and confidences for one or more close columns"""
+        middle_band = close.rolling(window=self.window).mean()
+        std = close.rolling(window=self.window).std()
+        upper_band = (middle_band + (std * self.num_std)).to_numpy()
+        lower_band = (middle_band - (std * self.num_std)).to_numpy()
+        middle_band = middle_band.to_numpy()
+        close = close.to_numpy()
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent_b = (close - lower_band) / (upper_band - lower_band)
+            band_width = (upper_band - lower_band) / middle_band
+            distance_factor = np.abs(close - middle_band) / middle_band
+            cross_confidence = np.minimum(0.9, 0.5 + distance_factor * (1.0 / band_width))
+        
+        prev_close = previous_bar(close)
+        prev_lower = previous_bar(lower_band)
+        prev_upper = previous_bar(upper_band)
+        
+        cross_below = (prev_close >= prev_lower) & (close < lower_band)
+        cross_above = ~cross_below & (prev_close <= prev_upper) & (close > upper_band)
+        below = ~cross_below & ~cross_above & (percent_b < 0)
+        above = ~cross_below & ~cross_above & ~below & (percent_b > 1)
+        
+        signal = np.full(close.shape, np.nan)
+        signal[cross_below | below] = SignalType.BUY.value
+        signal[cross_above | above] = SignalType.SELL.value
+        # A signal needs the previous bar to check for crossovers
+        signal[:1] = np.nan
+        
+        confidence = np.where(
+            cross_below | cross_above, cross_confidence,
+            np.where(
+                below, np.minimum(0.8, 0.5 + np.abs(percent_b) * 0.5),
+                np.minimum(0.8, 0.5 + (percent_b - 1) * 0.5)
+            )
+        )
+        return signal, confidence
+    
     def get_required_data(self) -> List[str]:
         """List of required data fields"""
         return ["symbol", "close", "high", "low", "open"]
@@ -3,9 +3,9 @@ MACD (Moving Average Convergence Divergence) trading strategy implementation.
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple, Union
 
-from src.strategy_framework import TechnicalStrategy, Signal, SignalType
+from src.strategy_framework import TechnicalStrategy, Signal, SignalType, previous_bar
 
 
 class MACDStrategy(TechnicalStrategy):
@@ -18,6 +18,9 @@ class MACDStrategy(TechnicalStrategy):
     and the histogram value.
     """
     
+    vectorizable = True
+    batchable = True
+    
     def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
         """
         Initialize the MACD strategy.
@@ -52,30 +55,17 @@ class MACDStrategy(TechnicalStrategy):
             if not isinstance(df, pd.DataFrame):
                 continue
             
-            # Calculate MACD components
-            df = df.copy()
-            
-            # Calculate EMAs
-            df['ema_fast'] = df['close'].ewm(span=self.fast_period, adjust=False).mean()
-            df['ema_slow'] = df['close'].ewm(span=self.slow_period, adjust=False).mean()
-            
-            # Calculate MACD line and signal line
-            df['macd'] = df['ema_fast'] - df['ema_slow']
-            df['signal_line'] = df['macd'].ewm(span=self.signal_period, adjust=False).mean()
-            
-            # Calculate histogram
-            df['histogram'] = df['macd'] - df['signal_line']
-            
-            # Skip if we don't have enough data
-            if df.iloc[-1]['signal_line'] is np.nan:
-                continue
+            # Update MACD components with bars not seen yet
+            stream = self.indicator(
+                symbol, df, "macd", self.fast_period, self.slow_period, self.signal_period
+            )
             
             # Get the last two rows to check for crossovers
-            if len(df) < 2:
+            if stream.prev_row is None:
                 continue
                 
-            last_row = df.iloc[-1]
-            prev_row = df.iloc[-2]
+            last_row = stream.last_row
+            prev_row = stream.prev_row
             
             # Signal generation logic
             signal_type = SignalType.HOLD
@@ -126,6 +116,69 @@ class MACDStrategy(TechnicalStrategy):
         
         return signals
     
+    def generate_signal_series(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generate MACD crossover signals for every bar at once.
+        
+        Args:
+            df: Price history for a single symbol
+            
+        Returns:
+            DataFrame with ``signal`` (NaN where no crossover) and ``confidence``
+        """
+        signal, confidence = self._signals(df['close'])
+        return pd.DataFrame({"signal": signal, "confidence": confidence}, index=df.index)
+    
+    def generate_signal_matrix(self, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate MACD crossover signals for many symbols at their latest bar.
+        
+        The EMAs depend on the whole history, so ``close`` should hold every
+        bar of each symbol (``signal_lookback`` is None).
+        
+        Args:
+            close: (bars x symbols) closes (see ``close_matrix``)
+            
+        Returns:
+            Per-symbol ``signal`` (NaN where no crossover) and ``confidence``
+        """
+        signal, confidence = self._signals(pd.DataFrame(close))
+        return signal[-1], confidence[-1]
+    
+    def _signals(self, close: Union[pd.Series, pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-bar signal values and confidences for one or more close columns"""
+        ema_fast = close.ewm(span=self.fast_period, adjust=False).mean()
+        ema_slow = close.ewm(span=self.slow_period, adjust=False).mean()
+        macd = ema_fast - ema_slow
+        signal_line = macd.ewm(span=self.signal_period, adjust=False).mean()
+        histogram = macd - signal_line
+        
+        macd, signal_line, histogram = macd.to_numpy(), signal_line.to_numpy(), histogram.to_numpy()
+        prev_macd = previous_bar(macd)
+        prev_signal = previous_bar(signal_line)
+        prev_histogram = previous_bar(histogram)
+        
+        buy = (prev_macd <= prev_signal) & (macd > signal_line)
+        sell = ~buy & (prev_macd >= prev_signal) & (macd < signal_line)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crossover_strength = np.where(
+                signal_line != 0, np.abs(macd - signal_line) / np.abs(signal_line), 0
+            )
+        histogram_direction = np.where(
+            buy, np.where(histogram > prev_histogram, 1, 0.5),
+            np.where(histogram < prev_histogram, 1, 0.5)
+        )
+        macd_strength = np.minimum(1.0, np.abs(macd) / 2)
+        confidence = np.minimum(
+            0.9, 0.5 + (crossover_strength * 0.2 + histogram_direction * 0.2 + macd_strength * 0.1)
+        )
+        
+        signal = np.full(macd.shape, np.nan)
+        signal[buy] = SignalType.BUY.value
+        signal[sell] = SignalType.SELL.value
+        return signal, confidence
+    
     def get_required_data(self) -> List[str]:
         """List of required data fields"""
         return ["symbol", "close"]
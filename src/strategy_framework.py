@@ -2,13 +2,27 @@
 Unified strategy framework for combining technical and AI-based trading strategies.
 """
 import abc
+import ast
+import asyncio
+import copy
+import importlib
+import importlib.util
+import inspect
+import os
+import pkgutil
+import sys
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple, Union
+from collections.abc import Mapping
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Awaitable, Dict, List, Any, Optional, Set, Tuple, Union
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime, timezone
 
+from src.indicators import IndicatorCache, IndicatorStream
+from src.resampling import ResampleCache, TimeframeView, timeframe_step
+
 
 class SignalType(Enum):
     """Types of trading signals"""
@@ -40,9 +54,73 @@ class Signal:
         return self.signal_type == SignalType.HOLD
 
 
+def close_matrix(data: Mapping, lookback: Optional[int] = None) -> Tuple[List[str], np.ndarray]:
+    """
+    (bars x symbols) matrix of every symbol's last ``lookback`` closes.
+    
+    Columns are right-aligned on each symbol's latest bar, so the last row is
+    every symbol's current bar; shorter histories are NaN-padded at the top.
+    
+    Returns:
+        The symbols (in ``data`` order, skipping empty or non-frame entries)
+        and the matrix
+    """
+    symbols: List[str] = []
+    columns: List[np.ndarray] = []
+    for symbol, df in data.items():
+        if not isinstance(df, pd.DataFrame) or df.empty:
+            continue
+        close = df['close'].to_numpy(dtype=np.float64)
+        symbols.append(symbol)
+        columns.append(close if lookback is None else close[-lookback:])
+    
+    rows = max((len(close) for close in columns), default=0)
+    matrix = np.full((rows, len(columns)), np.nan)
+    for s, close in enumerate(columns):
+        matrix[rows - len(close):, s] = close
+    return symbols, matrix
+
+
+def window_mean(close: np.ndarray, window: int) -> np.ndarray:
+    """NaN-skipping mean of each column's last ``window`` rows (NaN if none are valid)"""
+    tail = close[-window:]
+    valid = ~np.isnan(tail)
+    count = valid.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(count > 0, np.where(valid, tail, 0.0).sum(axis=0) / count, np.nan)
+
+
+def previous_bar(values: np.ndarray) -> np.ndarray:
+    """Values shifted one bar (row) down, NaN for the first bar"""
+    return np.concatenate((np.full_like(values[:1], np.nan), values[:-1]))
+
+
+def _is_async(strategy: "Strategy") -> bool:
+    """Whether a strategy's ``generate_signals`` is a coroutine function"""
+    return inspect.iscoroutinefunction(strategy.generate_signals)
+
+
+def _matrix_matches_signals(strategy: "Strategy") -> bool:
+    """
+    Whether ``generate_signal_matrix`` still mirrors ``generate_signals``, i.e.
+    a subclass (or the instance) has not overridden only the latter.
+    """
+    if "generate_signals" in vars(strategy):
+        return False
+    owner = {}
+    for method in ("generate_signals", "generate_signal_matrix"):
+        owner[method] = next(cls for cls in type(strategy).__mro__ if method in vars(cls))
+    return issubclass(owner["generate_signal_matrix"], owner["generate_signals"])
+
+
 class Strategy(abc.ABC):
     """Base strategy interface"""
     
+    # Whether generate_signal_series is implemented (stateless strategies only)
+    vectorizable: bool = False
+    # Whether generate_signal_matrix is implemented
+    batchable: bool = False
+    
     @property
     def name(self) -> str:
         """Strategy name"""
@@ -54,19 +132,79 @@ class Strategy(abc.ABC):
         pass
     
     def get_required_data(self) -> List[str]:
-        """List of required data fields"""
+        """
+        List of required data fields.
+        
+        A ``"timeframe:<tf>"`` entry (e.g. ``"timeframe:1h"``) asks for bars
+        resampled to that timeframe (see ``src.resampling.TIMEFRAMES``).
+        """
         return ["symbol", "close"]
+    
+    @property
+    def timeframe(self) -> Optional[str]:
+        """Timeframe requested in ``get_required_data`` (None: bars as given)"""
+        for field in self.get_required_data():
+            if field.startswith("timeframe:"):
+                return field.split(":", 1)[1]
+        return None
+    
+    def generate_signal_series(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generate signals for every bar of a symbol's history in one pass.
+        
+        Row ``i`` of the result must match what ``generate_signals`` emits for
+        ``df.iloc[:i + 1]``: ``signal`` holds the SignalType value (NaN where no
+        signal would be emitted) and ``confidence`` its confidence.
+        """
+        raise NotImplementedError(f"{self.name} does not support vectorized signal generation")
+    
+    @property
+    def signal_lookback(self) -> Optional[int]:
+        """Bars of history ``generate_signal_matrix`` needs (None: the full history)"""
+        return None
+    
+    def generate_signal_matrix(self, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Generate signals for many symbols at their latest bar in one pass.
+        
+        Entry ``s`` of the result must match what ``generate_signals`` emits for
+        the symbol in column ``s``.
+        
+        Args:
+            close: (bars x symbols) closes, right-aligned on each symbol's latest
+                bar and NaN-padded above shorter histories (see ``close_matrix``)
+            
+        Returns:
+            Per-symbol ``signal`` (SignalType values, NaN where no signal would be
+            emitted) and ``confidence`` arrays
+        """
+        raise NotImplementedError(f"{self.name} does not support batched signal generation")
 
 
 class TechnicalStrategy(Strategy):
-    """Base class for technical indicator-based strategies"""
+    """
+    Base class for technical indicator-based strategies.
+    
+    Indicators are requested through ``indicator`` and kept as incremental
+    per-symbol state that is only fed bars newer than the last call, so each
+    new bar costs O(1) in the live loop and backtester. Registering the
+    strategy swaps in the registry's shared ``IndicatorCache``.
+    """
     
     def __init__(self, params: Dict[str, Any] = None):
         self.params = params or {}
+        self.indicator_cache = IndicatorCache()
     
     def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
         """Calculate technical indicators on dataframe"""
         return df
+    
+    def indicator(self, symbol: str, df: pd.DataFrame, name: str, *params: Any) -> IndicatorStream:
+        """Indicator stream for a symbol, advanced to the last bar of ``df``"""
+        timeframe = self.timeframe
+        # Keep resampled streams apart from the same symbol's source-bar streams
+        key = symbol if timeframe is None else f"{symbol}@{timeframe}"
+        return self.indicator_cache.get(key, df, name, *params)
 
 
 class AIStrategy(Strategy):
@@ -81,111 +219,606 @@ class AIStrategy(Strategy):
         return ["symbol", "close", "open", "high", "low", "volume", "market_data", "portfolio"]
 
 
+# Base classes a discovered strategy may derive from
+_STRATEGY_BASES = {"Strategy", "TechnicalStrategy", "AIStrategy"}
+
+
+@dataclass
+class LazyStrategy:
+    """Placeholder for a discovered strategy whose module is imported on first use"""
+    module: str
+    class_name: str
+
+
+def package_modules(package: str) -> List[Tuple[str, str]]:
+    """(module name, source file) of a package's modules, without importing the package"""
+    spec = importlib.util.find_spec(package)
+    if spec is None or spec.submodule_search_locations is None:
+        raise ModuleNotFoundError(f"No package named '{package}'")
+    modules = []
+    for info in pkgutil.iter_modules(spec.submodule_search_locations):
+        module_name = f"{package}.{info.name}"
+        module_spec = info.module_finder.find_spec(module_name)
+        if module_spec is not None and module_spec.origin and module_spec.origin.endswith(".py"):
+            modules.append((module_name, module_spec.origin))
+    return modules
+
+
+def discover_strategies(package: str) -> List[Tuple[str, str]]:
+    """
+    (module name, class name) of the strategy classes defined in a package.
+    
+    Modules are parsed rather than imported, so discovery costs no imports or
+    instantiation. A class counts as a strategy if it derives, directly or via
+    other classes in the package, from a Strategy subclass known by name;
+    abstract ones are weeded out when loaded.
+    """
+    classes: List[Tuple[str, str, Set[str]]] = []
+    for module_name, path in package_modules(package):
+        with open(path, encoding="utf-8") as source:
+            tree = ast.parse(source.read(), filename=path)
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef):
+                bases = {
+                    base.id if isinstance(base, ast.Name) else base.attr
+                    for base in node.bases if isinstance(base, (ast.Name, ast.Attribute))
+                }
+                classes.append((module_name, node.name, bases))
+    
+    # Strategies already imported (e.g. the framework's examples) can be bases too;
+    # grow the set until subclasses of subclasses are found
+    known = set(_STRATEGY_BASES)
+    pending = [Strategy]
+    while pending:
+        subclasses = pending.pop().__subclasses__()
+        known.update(subclass.__name__ for subclass in subclasses)
+        pending.extend(subclasses)
+    changed = True
+    while changed:
+        changed = False
+        for _, class_name, bases in classes:
+            if class_name not in known and bases & known:
+                known.add(class_name)
+                changed = True
+    
+    return [
+        (module_name, class_name) for module_name, class_name, _ in classes
+        if class_name in known and class_name not in _STRATEGY_BASES
+    ]
+
+
+def _unaccepted_params(strategy_class: type, params: Dict[str, Any]) -> List[str]:
+    """Names in ``params`` that ``strategy_class``'s constructor does not accept"""
+    try:
+        signature = inspect.signature(strategy_class)
+    except (TypeError, ValueError):
+        return []
+    if any(p.kind is inspect.Parameter.VAR_KEYWORD for p in signature.parameters.values()):
+        return []
+    accepted = {
+        name for name, p in signature.parameters.items()
+        if p.kind in (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    }
+    return [name for name in params if name not in accepted]
+
+
 class StrategyRegistry:
     """Registry for managing and combining multiple strategies"""
     
     def __init__(self):
-        self._strategies: Dict[str, Strategy] = {}
+        # Lazily discovered strategies are LazyStrategy placeholders until first use
+        self._strategies: Dict[str, Union[Strategy, "LazyStrategy"]] = {}
         self._weights: Dict[str, float] = {}
+        # Per-strategy deadlines (seconds) for get_combined_signals_async
+        self._deadlines: Dict[str, Optional[float]] = {}
+        # Strategies dropped from the last async cycle for missing their deadline
+        self.last_dropped: List[str] = []
+        # Shared by all registered technical strategies
+        self.indicator_cache = IndicatorCache()
+        # Higher-timeframe bars for strategies that declare a timeframe
+        self.resample_cache = ResampleCache()
 
-    def auto_discover_and_register(self, package: str = "strategies", default_weight: float = 1.0) -> None:
-        """Dynamically discover and register all Strategy subclasses in the given package"""
-        import importlib
-        import pkgutil
-        import inspect
-
+    def auto_discover_and_register(
+        self,
+        package: str = "strategies",
+        default_weight: float = 1.0,
+        lazy: bool = True
+    ) -> None:
+        """
+        Discover and register all concrete Strategy subclasses in the given package.
+        
+        With ``lazy`` the package's modules are only parsed: each strategy class
+        found is registered as a placeholder, and its module is imported and the
+        class instantiated the first time the strategy is used (``get_strategy``
+        or a signal cycle). Otherwise every module is imported and every
+        strategy instantiated now. Names already registered are kept.
+        """
+        if lazy:
+            discovered = 0
+            for module_name, class_name in discover_strategies(package):
+                if class_name in self._strategies:
+                    continue
+                self._strategies[class_name] = LazyStrategy(module_name, class_name)
+                self._weights[class_name] = default_weight
+                self._deadlines[class_name] = None
+                discovered += 1
+            print(f"[StrategyRegistry] Discovered {discovered} strategies in {package} (loaded on first use)")
+            return
+        
         discovered = 0
-        package_module = importlib.import_module(package)
-        for _, module_name, _ in pkgutil.iter_modules(package_module.__path__):
-            full_module_name = f"{package}.{module_name}"
-            module = importlib.import_module(full_module_name)
-            for name, obj in inspect.getmembers(module, inspect.isclass):
-                if issubclass(obj, Strategy) and obj is not Strategy:
+        for module_name, _ in package_modules(package):
+            module = importlib.import_module(module_name)
+            for _, obj in inspect.getmembers(module, inspect.isclass):
+                # Skip base classes imported into the module
+                if issubclass(obj, Strategy) and obj.__module__ == module_name and not inspect.isabstract(obj):
                     instance = obj()
                     self.register(instance, getattr(instance, 'weight', default_weight))
                     discovered += 1
         print(f"[StrategyRegistry] Auto-registered {discovered} strategies from {package}")
-
     
-    def register(self, strategy: Strategy, weight: float = 1.0) -> None:
-        """Register a strategy with a weight"""
+    def register(self, strategy: Strategy, weight: float = 1.0, deadline: Optional[float] = None) -> None:
+        """
+        Register a strategy with a weight.
+        
+        ``deadline`` (seconds) overrides the default deadline of
+        ``get_combined_signals_async`` for this strategy.
+        """
+        self._install(strategy)
         self._strategies[strategy.name] = strategy
         self._weights[strategy.name] = weight
+        self._deadlines[strategy.name] = deadline
     
     def unregister(self, strategy_name: str) -> None:
         """Remove a strategy from the registry"""
         if strategy_name in self._strategies:
             del self._strategies[strategy_name]
             del self._weights[strategy_name]
+            self._deadlines.pop(strategy_name, None)
     
     def get_strategy(self, strategy_name: str) -> Optional[Strategy]:
-        """Get a strategy by name"""
-        return self._strategies.get(strategy_name)
+        """Get a strategy by name (importing it if it was discovered lazily)"""
+        strategy = self._strategies.get(strategy_name)
+        if isinstance(strategy, LazyStrategy):
+            strategy = self._load(strategy_name)
+        return strategy
     
     def list_strategies(self) -> List[str]:
-        """List all registered strategies"""
+        """List all registered strategies (lazily discovered ones are not loaded)"""
         return list(self._strategies.keys())
     
+    def reload_module(self, module_name: str) -> List[str]:
+        """
+        Re-import a strategy module and swap in its new implementation.
+        
+        Each registered strategy defined in the module is re-created from the
+        reloaded class with the same parameters, keeping its weight, deadline
+        and position in the registry. A strategy whose parameters the new
+        constructor no longer accepts (or that fails to construct) keeps its
+        loaded version. Indicator state lives in the registry's
+        shared cache keyed by (symbol, indicator, parameters), so the new
+        instance resumes the old one's streams; only indicators whose
+        parameters changed start from scratch.
+        
+        Returns:
+            Names of the strategies swapped
+        """
+        if module_name not in sys.modules:
+            # Not imported yet: lazily discovered strategies load the new code on first use
+            return []
+        module = importlib.reload(sys.modules[module_name])
+        
+        swapped = []
+        for name, strategy in list(self._strategies.items()):
+            if isinstance(strategy, LazyStrategy) or type(strategy).__module__ != module_name:
+                continue
+            strategy_class = getattr(module, type(strategy).__name__, None)
+            if strategy_class is None:
+                print(f"[StrategyRegistry] {name} is no longer defined in {module_name}, keeping the loaded version")
+                continue
+            params = getattr(strategy, 'params', None) or {}
+            rejected = _unaccepted_params(strategy_class, params)
+            if rejected:
+                # Rebuilding with defaults would silently drop the tuned values
+                print(
+                    f"[StrategyRegistry] {name}: {strategy_class.__name__} no longer accepts "
+                    f"{', '.join(rejected)}, keeping the loaded version"
+                )
+                continue
+            try:
+                replacement = strategy_class(**params)
+                self._install(replacement)
+            except Exception as e:
+                print(f"[StrategyRegistry] Could not reload {name}: {str(e)}")
+                continue
+            self._strategies[name] = replacement
+            swapped.append(name)
+        
+        print(f"[StrategyRegistry] Reloaded {module_name}: {', '.join(swapped) or 'no registered strategies'}")
+        return swapped
+    
+    def _install(self, strategy: Strategy) -> None:
+        """Validate a strategy and attach the registry's shared state"""
+        if strategy.timeframe is not None:
+            # Fail on an unknown timeframe now rather than on the first bar
+            timeframe_step(strategy.timeframe)
+        if isinstance(strategy, TechnicalStrategy):
+            strategy.indicator_cache = self.indicator_cache
+    
+    def _load(self, name: str) -> Optional[Strategy]:
+        """Import and instantiate a lazily discovered strategy (unregistered on failure)"""
+        lazy = self._strategies[name]
+        try:
+            module = importlib.import_module(lazy.module)
+            strategy_class = getattr(module, lazy.class_name)
+            if not (inspect.isclass(strategy_class) and issubclass(strategy_class, Strategy)) \
+                    or inspect.isabstract(strategy_class):
+                raise TypeError(f"{lazy.class_name} is not a concrete Strategy")
+            strategy = strategy_class()
+            self._install(strategy)
+        except Exception as e:
+            print(f"[StrategyRegistry] Could not load {name} from {lazy.module}: {str(e)}")
+            self.unregister(name)
+            return None
+        
+        weight = getattr(strategy, 'weight', self._weights[name])
+        if strategy.name != name:
+            self.unregister(name)
+            self.register(strategy, weight)
+        else:
+            # Replaced in place to keep the registration order
+            self._strategies[name] = strategy
+            self._weights[name] = weight
+        return strategy
+    
+    def _load_all(self) -> None:
+        """Load every lazily discovered strategy before a signal cycle"""
+        for name in [name for name, strategy in self._strategies.items() if isinstance(strategy, LazyStrategy)]:
+            self._load(name)
+    
     def get_combined_signals(self, data: Dict[str, Any]) -> Dict[str, Signal]:
-        """Generate signals from all strategies and combine them"""
-        all_signals: Dict[str, List[Tuple[Signal, float]]] = {}
+        """
+        Generate signals from all strategies and combine them.
+        
+        Batchable strategies score every symbol at once from a shared close
+        matrix; the others' signals are scattered into the same (strategies x
+        symbols) arrays, which are then reduced with the strategy weights in one
+        pass. Only BUY and SELL combinations are returned as ``Signal`` objects.
+        
+        Strategies on their own timeframe, and those needing the full history
+        (e.g. MACD's EMAs, which ``generate_signals`` keeps up to date in O(1)
+        per bar), always go through ``generate_signals``. Async strategies are
+        skipped here; use ``get_combined_signals_async`` to include them.
+        """
+        self._load_all()
+        batched = self._batched_strategies()
+        matrix_symbols, close = self._close_matrix(data, batched)
+        views: Dict[str, TimeframeView] = {}
         
         # Collect signals from all strategies
+        results: List[Tuple[str, Any]] = []
         for name, strategy in self._strategies.items():
-            weight = self._weights[name]
             try:
-                signals = strategy.generate_signals(data)
-                for signal in signals:
-                    if signal.symbol not in all_signals:
-                        all_signals[signal.symbol] = []
-                    all_signals[signal.symbol].append((signal, weight))
+                if name in batched:
+                    results.append((name, strategy.generate_signal_matrix(close[-strategy.signal_lookback:])))
+                elif _is_async(strategy):
+                    print(f"Skipping async strategy {name}: use get_combined_signals_async")
+                else:
+                    results.append((name, strategy.generate_signals(self._strategy_data(strategy, data, views))))
             except Exception as e:
                 print(f"Error in strategy {name}: {str(e)}")
         
-        # Combine signals for each symbol
+        return self._combine(results, matrix_symbols)
+    
+    async def get_combined_signals_async(
+        self,
+        data: Dict[str, Any],
+        deadline: Optional[float] = None,
+        executor: Optional[Executor] = None
+    ) -> Dict[str, Signal]:
+        """
+        Generate and combine signals with strategies running concurrently.
+        
+        Async (AI or I/O-bound) strategies are awaited on the event loop, while
+        synchronous ones run in ``executor``. A strategy that misses its deadline
+        (set at registration, else ``deadline``) is dropped from this cycle and
+        listed in ``last_dropped``; the others are combined as in
+        ``get_combined_signals``.
+        
+        Args:
+            data: Dictionary mapping symbols to their price data
+            deadline: Default per-strategy deadline in seconds (None: no deadline)
+            executor: Executor for CPU-bound work (the loop's default thread pool
+                if None). With a ``ProcessPoolExecutor`` only the stateless batch
+                passes are sent to it; strategies keeping indicator state run in
+                the default thread pool.
+        
+        Returns:
+            Combined BUY/SELL signals by symbol
+        """
+        loop = asyncio.get_running_loop()
+        self._load_all()
+        batched = self._batched_strategies()
+        matrix_symbols, close = self._close_matrix(data, batched)
+        views: Dict[str, TimeframeView] = {}
+        thread_executor = None if isinstance(executor, ProcessPoolExecutor) else executor
+        
+        calls: Dict[str, Awaitable] = {}
+        for name, strategy in self._strategies.items():
+            if name in batched:
+                if isinstance(executor, ProcessPoolExecutor):
+                    # Indicator state stays behind: the batch pass only needs parameters
+                    strategy = copy.copy(strategy)
+                    strategy.indicator_cache = None
+                call = loop.run_in_executor(
+                    executor, strategy.generate_signal_matrix, close[-strategy.signal_lookback:]
+                )
+            elif _is_async(strategy):
+                call = strategy.generate_signals(self._strategy_data(strategy, data, views))
+            else:
+                call = loop.run_in_executor(
+                    thread_executor, strategy.generate_signals, self._strategy_data(strategy, data, views)
+                )
+            timeout = self._deadlines.get(name)
+            calls[name] = asyncio.wait_for(call, deadline if timeout is None else timeout)
+        
+        outcomes = await asyncio.gather(*calls.values(), return_exceptions=True)
+        
+        results: List[Tuple[str, Any]] = []
+        self.last_dropped = []
+        for name, outcome in zip(calls, outcomes):
+            if isinstance(outcome, asyncio.TimeoutError):
+                # A worker thread cannot be interrupted; its late result is discarded
+                print(f"Strategy {name} missed its deadline, dropped from this cycle")
+                self.last_dropped.append(name)
+            elif isinstance(outcome, Exception):
+                print(f"Error in strategy {name}: {str(outcome)}")
+            else:
+                results.append((name, outcome))
+        
+        return self._combine(results, matrix_symbols)
+    
+    def _batched_strategies(self) -> Set[str]:
+        """Strategies combined through ``generate_signal_matrix``"""
+        return {
+            name for name, strategy in self._strategies.items()
+            if strategy.batchable and strategy.timeframe is None and strategy.signal_lookback is not None
+            and _matrix_matches_signals(strategy)
+        }
+    
+    def _close_matrix(self, data: Dict[str, Any], batched: Set[str]) -> Tuple[List[str], Optional[np.ndarray]]:
+        """Close matrix covering the longest lookback of the batched strategies"""
+        if not batched:
+            return [], None
+        return close_matrix(data, max(self._strategies[name].signal_lookback for name in batched))
+    
+    def _strategy_data(self, strategy: Strategy, data: Dict[str, Any], views: Dict[str, TimeframeView]) -> Any:
+        """``data`` as the strategy sees it (resampled to its timeframe, if any)"""
+        timeframe = strategy.timeframe
+        if timeframe is None:
+            return data
+        if timeframe not in views:
+            views[timeframe] = TimeframeView(data, timeframe, self.resample_cache)
+        return views[timeframe]
+    
+    def _combine(self, results: List[Tuple[str, Any]], matrix_symbols: List[str]) -> Dict[str, Signal]:
+        """
+        Weighted combination of per-strategy results.
+        
+        Args:
+            results: (strategy name, result) in registration order, where a
+                result is a ``generate_signal_matrix`` (values, confidence) pair
+                over ``matrix_symbols`` or a list of signals
+            matrix_symbols: Symbols of the close matrix columns
+        """
+        # Symbols in the order they are first emitted, as columns of the arrays below
+        columns: Dict[str, int] = {}
+        # Per strategy: (weight, columns, signal values, confidences, sources)
+        emitted: List[Tuple[float, List[int], np.ndarray, np.ndarray, List[str]]] = []
+        for name, result in results:
+            weight = self._weights[name]
+            if isinstance(result, tuple):
+                values, confidence = result
+                present = np.flatnonzero(~np.isnan(values))
+                cols = [columns.setdefault(matrix_symbols[s], len(columns)) for s in present]
+                emitted.append((weight, cols, values[present], confidence[present], [name] * len(cols)))
+            else:
+                cols = [columns.setdefault(signal.symbol, len(columns)) for signal in result]
+                emitted.append((
+                    weight,
+                    cols,
+                    np.array([signal.signal_type.value for signal in result], dtype=np.float64),
+                    np.array([signal.confidence for signal in result], dtype=np.float64),
+                    [signal.source for signal in result]
+                ))
+        
+        if not columns:
+            return {}
+        
+        # (strategies x symbols) weights of emitted signals, weighted values and confidences
+        shape = (len(emitted), len(columns))
+        weights = np.zeros(shape)
+        weighted_values = np.zeros(shape)
+        weighted_confidence = np.zeros(shape)
+        components = np.zeros(shape, dtype=np.int64)
+        for k, (weight, cols, values, confidence, _) in enumerate(emitted):
+            np.add.at(weights[k], cols, weight)
+            np.add.at(weighted_values[k], cols, values * weight)
+            np.add.at(weighted_confidence[k], cols, confidence * weight)
+            np.add.at(components[k], cols, 1)
+        
+        # Rows are summed in registration order, as the per-signal sums were
+        total_weight = weights.sum(axis=0)
+        component_signals = components.sum(axis=0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weighted_signal = weighted_values.sum(axis=0) / total_weight
+            avg_confidence = weighted_confidence.sum(axis=0) / total_weight
+        
+        # Determine final signal types; zero total weight combines to nothing
+        signal_types = np.where(
+            weighted_signal > 0.3, SignalType.BUY.value,
+            np.where(weighted_signal < -0.3, SignalType.SELL.value, SignalType.HOLD.value)
+        )
+        actionable = (total_weight != 0) & (signal_types != SignalType.HOLD.value)
+        
+        sources: Dict[int, List[str]] = {col: [] for col in np.flatnonzero(actionable).tolist()}
+        for _, cols, _, _, strategy_sources in emitted:
+            for col, source in zip(cols, strategy_sources):
+                if col in sources:
+                    sources[col].append(source)
+        
         combined_signals: Dict[str, Signal] = {}
-        for symbol, signals in all_signals.items():
-            if not signals:
-                continue
-                
-            # Calculate weighted signal type
-            total_weight = sum(weight for _, weight in signals)
-            if total_weight == 0:
+        for symbol, col in columns.items():
+            if not actionable[col]:
                 continue
-                
-            weighted_signal = sum(signal.signal_type.value * weight for signal, weight in signals) / total_weight
-            
-            # Determine final signal type
-            if weighted_signal > 0.3:
-                signal_type = SignalType.BUY
-            elif weighted_signal < -0.3:
-                signal_type = SignalType.SELL
-            else:
-                signal_type = SignalType.HOLD
-            
-            # Calculate average confidence
-            avg_confidence = sum(signal.confidence * weight for signal, weight in signals) / total_weight
-            
-            # Create combined signal
             combined_signals[symbol] = Signal(
                 symbol=symbol,
-                signal_type=signal_type,
-                confidence=avg_confidence,
+                signal_type=SignalType(int(signal_types[col])),
+                confidence=float(avg_confidence[col]),
                 source="combined",
                 metadata={
-                    "weighted_value": weighted_signal,
-                    "component_signals": len(signals),
-                    "strategy_sources": [signal.source for signal, _ in signals]
+                    "weighted_value": float(weighted_signal[col]),
+                    "component_signals": int(component_signals[col]),
+                    "strategy_sources": sources[col]
                 }
             )
         
         return combined_signals
+    
+    def get_combined_signal_series(
+        self,
+        data: Dict[str, Any],
+        series_cache: Optional[Dict[Tuple[str, str, str], pd.DataFrame]] = None
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Full-history counterpart of ``get_combined_signals`` for vectorizable strategies.
+        
+        Returns, per symbol, a frame aligned to its bars with the combined ``signal``
+        (NaN where no strategy emitted), ``confidence``, ``weighted_value``,
+        ``component_signals`` and ``first_source`` (registration index of the first
+        strategy that emitted, which fixes the symbol order of the per-bar dict).
+        
+        Per-strategy series do not depend on weights, so callers re-running the
+        same ``data`` with different weights can pass a ``series_cache`` dict to
+        compute each (strategy, params, symbol) series only once.
+        
+        Raises:
+            ValueError: If any registered strategy is not vectorizable (strategies
+                on their own timeframe are not)
+        """
+        self._load_all()
+        not_vectorizable = [
+            name for name, strategy in self._strategies.items()
+            if not strategy.vectorizable or strategy.timeframe is not None
+        ]
+        if not_vectorizable:
+            raise ValueError(f"Strategies cannot be vectorized: {', '.join(not_vectorizable)}")
+        
+        combined: Dict[str, pd.DataFrame] = {}
+        for symbol, df in data.items():
+            if not isinstance(df, pd.DataFrame) or df.empty:
+                continue
+            
+            n = len(df)
+            total_weight = np.zeros(n)
+            weighted_sum = np.zeros(n)
+            confidence_sum = np.zeros(n)
+            components = np.zeros(n, dtype=np.int64)
+            first_source = np.full(n, -1, dtype=np.int64)
+            
+            # Accumulate in registration order so the sums match get_combined_signals
+            for index, (name, strategy) in enumerate(self._strategies.items()):
+                weight = self._weights[name]
+                if series_cache is None:
+                    series = strategy.generate_signal_series(df)
+                else:
+                    key = (name, repr(getattr(strategy, 'params', None)), symbol)
+                    series = series_cache.get(key)
+                    if series is None:
+                        series = strategy.generate_signal_series(df)
+                        series_cache[key] = series
+                values = series['signal'].to_numpy(dtype=np.float64)
+                emitted = ~np.isnan(values)
+                
+                total_weight = total_weight + np.where(emitted, weight, 0.0)
+                weighted_sum = weighted_sum + np.where(emitted, values * weight, 0.0)
+                confidence_sum = confidence_sum + np.where(
+                    emitted, series['confidence'].to_numpy(dtype=np.float64) * weight, 0.0
+                )
+                first_source = np.where((first_source < 0) & emitted, index, first_source)
+                components += emitted
+            
+            valid = (components > 0) & (total_weight != 0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                weighted_value = np.where(valid, weighted_sum / total_weight, np.nan)
+                confidence = np.where(valid, confidence_sum / total_weight, np.nan)
+            
+            signal = np.where(
+                weighted_value > 0.3, SignalType.BUY.value,
+                np.where(weighted_value < -0.3, SignalType.SELL.value, SignalType.HOLD.value)
+            ).astype(np.float64)
+            signal[~valid] = np.nan
+            
+            combined[symbol] = pd.DataFrame({
+                "signal": signal,
+                "confidence": confidence,
+                "weighted_value": weighted_value,
+                "component_signals": components,
+                "first_source": first_source
+            }, index=df.index)
+        
+        return combined
+
+
+class StrategyWatcher:
+    """
+    Hot-reloads a strategy package into a registry when its files change.
+    
+    ``poll`` compares the modules' modification times with the previous poll
+    and reloads the changed ones (see ``StrategyRegistry.reload_module``);
+    strategies in new modules are discovered lazily. A module that fails to
+    reload keeps its loaded version.
+    """
+    
+    def __init__(self, registry: StrategyRegistry, package: str = "strategies", default_weight: float = 1.0):
+        self.registry = registry
+        self.package = package
+        self.default_weight = default_weight
+        self._mtimes = self._scan()
+    
+    def _scan(self) -> Dict[str, int]:
+        return {module_name: os.stat(path).st_mtime_ns for module_name, path in package_modules(self.package)}
+    
+    def poll(self) -> List[str]:
+        """Reload modules changed since the last poll; returns the names of swapped strategies"""
+        mtimes = self._scan()
+        changed = [module_name for module_name, mtime in mtimes.items() if self._mtimes.get(module_name) != mtime]
+        added = any(module_name not in self._mtimes for module_name in mtimes)
+        self._mtimes = mtimes
+        
+        swapped = []
+        for module_name in changed:
+            try:
+                swapped.extend(self.registry.reload_module(module_name))
+            except Exception as e:
+                print(f"[StrategyWatcher] Could not reload {module_name}: {str(e)}")
+        if added:
+            self.registry.auto_discover_and_register(self.package, self.default_weight)
+        return swapped
+    
+    async def run(self, interval: float = 2.0) -> None:
+        """Poll every ``interval`` seconds until cancelled"""
+        while True:
+            self.poll()
+            await asyncio.sleep(interval)
 
 
 # Example technical strategies
 class MovingAverageCrossStrategy(TechnicalStrategy):
     """Moving average crossover strategy"""
     
+    vectorizable = True
+    batchable = True
+    
     def __init__(self, short_window: int = 20, long_window: int = 50):
         super().__init__({"short_window": short_window, "long_window": long_window})
         self.short_window = short_window
@@ -197,13 +830,14 @@ class MovingAverageCrossStrategy(TechnicalStrategy):
             if not isinstance(df, pd.DataFrame):
                 continue
                 
-            # Calculate indicators
-            df = df.copy()
-            df['short_ma'] = df['close'].rolling(window=self.short_window, min_periods=1).mean()
-            df['long_ma'] = df['close'].rolling(window=self.long_window, min_periods=1).mean()
+            # Update moving averages with bars not seen yet
+            short_ma = self.indicator(symbol, df, "rolling", self.short_window).last_row
+            long_ma = self.indicator(symbol, df, "rolling", self.long_window).last_row
+            if short_ma is None:
+                continue
             
             # Generate signal based on last row
-            last_row = df.iloc[-1]
+            last_row = {"short_ma": short_ma["mean"], "long_ma": long_ma["mean"]}
             
             if last_row['short_ma'] > last_row['long_ma']:
                 signal_type = SignalType.BUY
@@ -229,11 +863,39 @@ class MovingAverageCrossStrategy(TechnicalStrategy):
             ))
         
         return signals
+    
+    @property
+    def signal_lookback(self) -> int:
+        return max(self.short_window, self.long_window)
+    
+    def generate_signal_series(self, df: pd.DataFrame) -> pd.DataFrame:
+        short_ma = df['close'].rolling(window=self.short_window, min_periods=1).mean().to_numpy()
+        long_ma = df['close'].rolling(window=self.long_window, min_periods=1).mean().to_numpy()
+        signal, confidence = self._signals(short_ma, long_ma)
+        return pd.DataFrame({"signal": signal, "confidence": confidence}, index=df.index)
+    
+    def generate_signal_matrix(self, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        return self._signals(window_mean(close, self.short_window), window_mean(close, self.long_window))
+    
+    def _signals(self, short_ma: np.ndarray, long_ma: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Signal values and confidences from the moving averages"""
+        above = short_ma > long_ma
+        below = short_ma < long_ma
+        with np.errstate(divide='ignore', invalid='ignore'):
+            confidence = np.where(
+                above, np.minimum(0.9, (short_ma / long_ma - 1) * 10),
+                np.where(below, np.minimum(0.9, (long_ma / short_ma - 1) * 10), 0.5)
+            )
+        signal = np.where(above, SignalType.BUY.value, np.where(below, SignalType.SELL.value, SignalType.HOLD.value))
+        return signal.astype(np.float64), confidence
 
 
 class RSIStrategy(TechnicalStrategy):
     """Relative Strength Index strategy"""
     
+    vectorizable = True
+    batchable = True
+    
     def __init__(self, period: int = 14, overbought: float = 70, oversold: float = 30):
         super().__init__({"period": period, "overbought": overbought, "oversold": oversold})
         self.period = period
@@ -246,16 +908,12 @@ class RSIStrategy(TechnicalStrategy):
             if not isinstance(df, pd.DataFrame):
                 continue
                 
-            # Calculate RSI
-            df = df.copy()
-            delta = df['close'].diff()
-            gain = delta.clip(lower=0).rolling(window=self.period, min_periods=1).mean()
-            loss = -delta.clip(upper=0).rolling(window=self.period, min_periods=1).mean()
-            rs = gain / (loss + 1e-9)  # Add small value to avoid division by zero
-            df['rsi'] = 100 - (100 / (1 + rs))
+            # Update RSI with bars not seen yet
+            last_row = self.indicator(symbol, df, "rsi", self.period).last_row
+            if last_row is None:
+                continue
             
             # Generate signal based on last row
-            last_row = df.iloc[-1]
             rsi = last_row['rsi']
             
             if rsi < self.oversold:
@@ -283,3 +941,41 @@ class RSIStrategy(TechnicalStrategy):
             ))
         
         return signals
+    
+    @property
+    def signal_lookback(self) -> int:
+        # One more close than changes in the window
+        return self.period + 1
+    
+    def generate_signal_series(self, df: pd.DataFrame) -> pd.DataFrame:
+        delta = df['close'].diff()
+        gain = delta.clip(lower=0).rolling(window=self.period, min_periods=1).mean()
+        loss = -delta.clip(upper=0).rolling(window=self.period, min_periods=1).mean()
+        rs = gain / (loss + 1e-9)
+        signal, confidence = self._signals((100 - (100 / (1 + rs))).to_numpy())
+        return pd.DataFrame({"signal": signal, "confidence": confidence}, index=df.index)
+    
+    def generate_signal_matrix(self, close: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        tail = close[-(self.period + 1):]
+        # The first close of a history has no change, as in ``diff``
+        delta = np.diff(np.vstack((np.full((1, tail.shape[1]), np.nan), tail)), axis=0)[-self.period:]
+        gain = window_mean(np.clip(delta, 0, None), self.period)
+        loss = -window_mean(np.clip(delta, None, 0), self.period)
+        rs = gain / (loss + 1e-9)
+        return self._signals(100 - (100 / (1 + rs)))
+    
+    def _signals(self, rsi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Signal values and confidences from the RSI"""
+        buy = rsi < self.oversold
+        sell = rsi > self.overbought
+        mid_point = (self.overbought + self.oversold) / 2
+        range_half = (self.overbought - self.oversold) / 2
+        confidence = np.where(
+            buy, np.minimum(0.9, (self.oversold - rsi) / self.oversold),
+            np.where(
+                sell, np.minimum(0.9, (rsi - self.overbought) / (100 - self.overbought)),
+                0.3 + (0.4 * (1 - (np.abs(rsi - mid_point) / range_half)))
+            )
+        )
+        signal = np.where(buy, SignalType.BUY.value, np.where(sell, SignalType.SELL.value, SignalType.HOLD.value))
+        return signal.astype(np.float64), confidence
@@ -3,6 +3,12 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 from src.main import TradingBot
 
+
+async def execute_signals(bot, signals):
+    """Plan and execute signals through the risk and execution stages"""
+    for order in await bot._plan_trades(signals):
+        await bot._execution_stage(order)
+
 @pytest.mark.asyncio
 async def test_benchmark_providers():
     bot = TradingBot()
@@ -22,7 +28,7 @@ async def test_benchmark_providers():
     # Robinhood success
     start = time.perf_counter()
     try:
-        await bot._execute_trades(decisions)
+        await execute_signals(bot, decisions)
     except Exception:
         pass
     timings['Robinhood'] = time.perf_counter() - start
@@ -34,7 +40,7 @@ async def test_benchmark_providers():
     bot.gemini_client.sell_stock = AsyncMock(return_value={"status": "filled"})
     start = time.perf_counter()
     try:
-        await bot._execute_trades(decisions)
+        await execute_signals(bot, decisions)
     except Exception:
         pass
     timings['Gemini'] = time.perf_counter() - start
@@ -46,7 +52,7 @@ async def test_benchmark_providers():
     bot.tda_client.sell_stock = AsyncMock(return_value={"status": "filled"})
     start = time.perf_counter()
     try:
-        await bot._execute_trades(decisions)
+        await execute_signals(bot, decisions)
     except Exception:
         pass
     timings['TDA'] = time.perf_counter() - start
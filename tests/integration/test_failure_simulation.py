@@ -2,6 +2,12 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 from src.main import TradingBot
 
+
+async def execute_signals(bot, signals):
+    """Plan and execute signals through the risk and execution stages"""
+    for order in await bot._plan_trades(signals):
+        await bot._execution_stage(order)
+
 def mock_decisions():
     decision = MagicMock()
     decision.decision = "buy"
@@ -16,7 +22,7 @@ async def test_timeout_handling():
     bot.rh_client.get_account_info = AsyncMock(return_value={"account": "mock"})
     bot.rh_client.buy_stock = AsyncMock(side_effect=TimeoutError("timeout"))
     try:
-        await bot._execute_trades(mock_decisions())
+        await execute_signals(bot, mock_decisions())
     except Exception:
         pass
 
@@ -27,7 +33,7 @@ async def test_invalid_response_handling():
     bot.rh_client.get_account_info = AsyncMock(return_value={"account": "mock"})
     bot.rh_client.buy_stock = AsyncMock(return_value=None)
     try:
-        await bot._execute_trades(mock_decisions())
+        await execute_signals(bot, mock_decisions())
     except Exception:
         pass
 
@@ -38,7 +44,7 @@ async def test_auth_failure_handling():
     bot.rh_client.get_account_info = AsyncMock(return_value={"account": "mock"})
     bot.rh_client.buy_stock = AsyncMock(side_effect=PermissionError("auth failed"))
     try:
-        await bot._execute_trades(mock_decisions())
+        await execute_signals(bot, mock_decisions())
     except Exception:
         pass
 
@@ -49,6 +55,6 @@ async def test_rate_limit_handling():
     bot.rh_client.get_account_info = AsyncMock(return_value={"account": "mock"})
     bot.rh_client.buy_stock = AsyncMock(side_effect=Exception("rate limit"))
     try:
-        await bot._execute_trades(mock_decisions())
+        await execute_signals(bot, mock_decisions())
     except Exception:
         pass
\ No newline at end of file
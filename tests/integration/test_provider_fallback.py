@@ -2,6 +2,12 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 from src.main import TradingBot
 
+
+async def execute_signals(bot, signals):
+    """Plan and execute signals through the risk and execution stages"""
+    for order in await bot._plan_trades(signals):
+        await bot._execution_stage(order)
+
 def mock_decisions():
     decision = MagicMock()
     decision.decision = "buy"
@@ -16,7 +22,7 @@ async def test_robinhood_success():
     bot.rh_client.get_account_info = AsyncMock(return_value={"account": "mock"})
     bot.rh_client.buy_stock = AsyncMock(return_value={"status": "filled"})
     try:
-        await bot._execute_trades(mock_decisions())
+        await execute_signals(bot, mock_decisions())
     except Exception:
         pass
 
@@ -29,7 +35,7 @@ async def test_robinhood_fail_gemini_success():
     bot.gemini_client = MagicMock()
     bot.gemini_client.buy_stock = AsyncMock(return_value={"status": "filled"})
     try:
-        await bot._execute_trades(mock_decisions())
+        await execute_signals(bot, mock_decisions())
     except Exception:
         pass
 
@@ -44,7 +50,7 @@ async def test_robinhood_gemini_fail_tda_success():
     bot.tda_client = MagicMock()
     bot.tda_client.buy_stock = AsyncMock(return_value={"status": "filled"})
     try:
-        await bot._execute_trades(mock_decisions())
+        await execute_signals(bot, mock_decisions())
     except Exception:
         pass
 
@@ -59,6 +65,6 @@ async def test_all_providers_fail():
     bot.tda_client = MagicMock()
     bot.tda_client.buy_stock = AsyncMock(side_effect=Exception())
     try:
-        await bot._execute_trades(mock_decisions())
+        await execute_signals(bot, mock_decisions())
     except Exception:
         pass
\ No newline at end of file
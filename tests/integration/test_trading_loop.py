@@ -12,6 +12,10 @@ from src.api import (
     make_trading_decisions
 )
 
+async def analyze(bot):
+    """Fetch a cycle's data and generate its signals"""
+    return await bot._generate_signals(await bot._fetch_cycle_data())
+
 @pytest.fixture
 def trading_bot():
     return TradingBot()
@@ -56,7 +60,7 @@ async def test_market_analysis(mock_decisions, mock_market, trading_bot):
     
     try:
         decisions = await asyncio.wait_for(
-            trading_bot._analyze_and_decide(),
+            analyze(trading_bot),
             timeout=5.0
         )
         assert len(decisions) == 1
@@ -1,7 +1,36 @@
 import pytest
 import asyncio
-from unittest.mock import patch, AsyncMock
+import pandas as pd
+from unittest.mock import patch, AsyncMock, MagicMock
 from src.main import TradingBot
+from src.risk_management import PositionSizing
+from src.strategy_framework import Signal, SignalType
+
+
+def make_bot(demo_mode=False, prices=None):
+    prices = prices or {"AAPL": 100.0, "TSLA": 200.0}
+    rh_client = MagicMock()
+    rh_client.authenticate = AsyncMock(return_value=True)
+    rh_client.get_account_info = AsyncMock(return_value={"portfolio_value": 100000.0, "cash": 10000.0})
+    rh_client.get_portfolio = AsyncMock(return_value={"positions": {}})
+    rh_client.get_quotes = AsyncMock(
+        side_effect=lambda symbols: {s: {"last_price": str(prices[s])} for s in symbols}
+    )
+    return TradingBot(demo_mode=demo_mode, rh_client=rh_client)
+
+
+def make_strategy_data(symbols):
+    bars = pd.DataFrame({"close": [100.0, 101.0, 102.0]})
+    return {"market_data": {}, "portfolio": {}, **{symbol: bars for symbol in symbols}}
+
+
+def sizing(symbol, notional):
+    return PositionSizing(symbol, notional / 100.0, notional, notional / 100000.0, 0.01)
+
+
+def buy(symbol):
+    return Signal(symbol, SignalType.BUY, 0.9)
+
 
 @pytest.mark.asyncio
 async def test_trading_bot_run_demo_mode():
@@ -10,22 +39,106 @@ async def test_trading_bot_run_demo_mode():
     with patch.object(bot, '_should_run', return_value=False):
         await bot.run()
 
-@patch('src.main.TradingBot._analyze_and_decide', new_callable=AsyncMock)
-@patch('src.main.TradingBot._execute_trades', new_callable=AsyncMock)
+
 @pytest.mark.asyncio
-async def test_trading_bot_run_once(mock_execute, mock_analyze):
-    bot = TradingBot(demo_mode=False)
+async def test_trading_bot_run_passes_cycles_through_the_stages():
+    bot = make_bot()
+    strategy_data = make_strategy_data(["AAPL"])
+    signals = {"AAPL": buy("AAPL")}
+    order = {"symbol": "AAPL"}
+    record = {"symbol": "AAPL", "action": "buy"}
+    recorded = asyncio.Event()
 
-    call_count = 0
+    with patch.object(bot, '_should_run', AsyncMock(return_value=True)), \
+         patch.object(bot, '_fetch_cycle_data', AsyncMock(return_value=strategy_data)) as fetch, \
+         patch.object(bot, '_generate_signals', AsyncMock(return_value=signals)) as generate, \
+         patch.object(bot, '_plan_trades', AsyncMock(return_value=[order])) as plan, \
+         patch.object(bot, '_execute_order', AsyncMock(return_value=record)) as execute, \
+         patch.object(bot.ai_engine, 'feedback_loop', side_effect=lambda trades: recorded.set()) as feedback:
+        task = asyncio.create_task(bot.run())
+        await asyncio.wait_for(recorded.wait(), timeout=5.0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
 
-    async def limited_should_run():
-        nonlocal call_count
-        call_count += 1
-        return call_count < 2  # Run loop once
+    fetch.assert_awaited_once()
+    generate.assert_awaited_once_with(strategy_data)
+    plan.assert_awaited_once_with(signals, strategy_data)
+    execute.assert_awaited_once_with(order)
+    feedback.assert_called_once_with([record])
+    assert bot.trade_history == [record]
 
-    with patch.object(bot, '_should_run', side_effect=limited_should_run):
-        mock_analyze.return_value = {"AAPL": "BUY"}
-        await bot.run()
 
-    mock_analyze.assert_awaited()
-    mock_execute.assert_awaited()
\ No newline at end of file
+@pytest.mark.asyncio
+async def test_plan_trades_reserves_cash_and_skips_symbols_in_flight():
+    bot = make_bot()
+    bot.in_flight.claim("TSLA")  # An earlier cycle's order is still executing
+    signals = {"AAPL": buy("AAPL"), "TSLA": buy("TSLA")}
+
+    with patch.object(bot.risk_manager, 'calculate_position_size', return_value=sizing("AAPL", 4000.0)), \
+         patch.object(bot.risk_manager, 'validate_trade', return_value=(True, "")):
+        orders = await bot._plan_trades(signals, make_strategy_data(signals))
+
+    assert [order["symbol"] for order in orders] == ["AAPL"]
+    assert bot.reserved_notional == {"AAPL": 4000.0}
+
+    # A later cycle sizes against the unreserved cash, at an unchanged portfolio value
+    bot.in_flight.release("TSLA")
+    with patch.object(bot.risk_manager, 'calculate_position_size', return_value=sizing("TSLA", 4000.0)), \
+         patch.object(bot.risk_manager, 'validate_trade', return_value=(True, "")):
+        orders = await bot._plan_trades({"TSLA": buy("TSLA")}, make_strategy_data(["TSLA"]))
+
+    assert [order["symbol"] for order in orders] == ["TSLA"]
+    assert bot.risk_manager.portfolio_value == 100000.0
+    assert bot.risk_manager.cash_balance == 2000.0
+
+
+@pytest.mark.asyncio
+async def test_plan_trades_releases_rejected_orders():
+    bot = make_bot()
+    signals = {"AAPL": buy("AAPL"), "TSLA": buy("TSLA")}
+
+    def validate(signal, position_sizing, market_data):
+        return (signal.symbol == "AAPL", "Too risky")
+
+    with patch.object(bot.risk_manager, 'calculate_position_size', return_value=sizing("AAPL", 8000.0)), \
+         patch.object(bot.risk_manager, 'validate_trade', side_effect=validate):
+        orders = await bot._plan_trades(signals, make_strategy_data(signals))
+
+    # TSLA fails validation
+    assert [order["symbol"] for order in orders] == ["AAPL"]
+    assert "TSLA" not in bot.in_flight and "TSLA" not in bot.reserved_notional
+
+    # AAPL's reservation leaves too little cash for TSLA in the next cycle
+    with patch.object(bot.risk_manager, 'calculate_position_size', return_value=sizing("TSLA", 4000.0)), \
+         patch.object(bot.risk_manager, 'validate_trade', return_value=(True, "")):
+        assert await bot._plan_trades({"TSLA": buy("TSLA")}, make_strategy_data(["TSLA"])) == []
+    assert "TSLA" not in bot.in_flight and "TSLA" not in bot.reserved_notional
+
+
+@pytest.mark.asyncio
+async def test_execution_stage_drops_orders_on_price_drift_and_at_the_trade_limit():
+    prices = {"AAPL": 100.0}
+    bot = make_bot(prices=prices)
+    bot.anti_gaming = MagicMock()
+    bot.anti_gaming.execute_with_protection = AsyncMock(return_value={"success": True})
+
+    with patch.object(bot.risk_manager, 'calculate_position_size', return_value=sizing("AAPL", 4000.0)), \
+         patch.object(bot.risk_manager, 'validate_trade', return_value=(True, "")):
+        [order] = await bot._plan_trades({"AAPL": buy("AAPL")}, make_strategy_data(["AAPL"]))
+
+    # The price moves past the tolerance while the order waits to execute
+    prices["AAPL"] = 110.0
+    bot.quote_snapshot.invalidate(["AAPL"])
+    await bot._execution_stage(order)
+
+    bot.anti_gaming.execute_with_protection.assert_not_awaited()
+    assert "AAPL" not in bot.in_flight and not bot.reserved_notional
+    assert bot.trade_count == 0
+
+    with patch('src.main.MAX_TRADES_PER_DAY', 0):
+        bot.in_flight.claim("AAPL")
+        await bot._execution_stage(dict(order, price=110.0))
+
+    bot.anti_gaming.execute_with_protection.assert_not_awaited()
+    assert "AAPL" not in bot.in_flight
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtest_metrics import calculate_metrics, periods_per_year, rolling_sharpe
+
+
+def make_trades():
+    dates = pd.date_range("2023-01-02", periods=6, freq="B")
+    return [
+        {"pnl": 50.0, "quantity": 10, "entry_price": 100.0, "exit_price": 105.0,
+         "entry_date": dates[1], "exit_date": dates[3]},
+        {"pnl": -20.0, "quantity": 5, "entry_price": 100.0, "exit_price": 96.0,
+         "entry_date": dates[3], "exit_date": dates[4]},
+    ], dates
+
+
+def test_metrics_extended_set():
+    trades, dates = make_trades()
+    equity = [1000.0, 1000.0, 1020.0, 1050.0, 1030.0, 1030.0]
+    metrics = calculate_metrics(equity, trades, dates=dates, risk_free_rate=0.0)
+
+    returns = np.diff(equity) / equity[:-1]
+    downside = np.sqrt(np.mean(np.minimum(returns, 0) ** 2))
+    assert metrics["sharpe_ratio"] == pytest.approx(returns.mean() / returns.std() * np.sqrt(252))
+    assert metrics["sortino_ratio"] == pytest.approx(returns.mean() / downside * np.sqrt(252))
+    assert metrics["max_drawdown"] == pytest.approx(20 / 1050)
+    assert metrics["calmar_ratio"] == pytest.approx(metrics["annualized_return"] / (20 / 1050))
+    assert metrics["win_rate"] == 0.5
+    # Positions are open at the end of bars 2, 3 and 4 of 5
+    assert metrics["exposure"] == pytest.approx(3 / 5)
+    assert metrics["turnover"] == pytest.approx((2050 + 980) / np.mean(equity) / (5 / 252))
+
+
+def test_data_frequency_changes_annualization():
+    trades, _ = make_trades()
+    equity = [1000.0, 1010.0, 1005.0, 1020.0]
+    daily = calculate_metrics(equity, trades, risk_free_rate=0.0)
+    hourly = calculate_metrics(equity, trades, data_frequency="hourly", risk_free_rate=0.0)
+
+    assert hourly["sharpe_ratio"] == pytest.approx(daily["sharpe_ratio"] * np.sqrt(6.5))
+    with pytest.raises(ValueError, match="Unknown data frequency"):
+        periods_per_year("fortnightly")
+
+
+def test_rolling_sharpe_matches_pandas():
+    returns = np.random.default_rng(0).normal(0.001, 0.01, 300)
+    expected = pd.Series(returns).rolling(20)
+    expected = (expected.mean() / expected.std(ddof=0) * np.sqrt(252)).to_numpy()
+
+    np.testing.assert_allclose(rolling_sharpe(returns, 20, risk_free_rate=0.0), expected, rtol=1e-8)
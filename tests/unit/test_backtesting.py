@@ -0,0 +1,377 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting import BacktestEngine, BacktestParameters
+from src.price_cube import PriceCube
+from src.strategy_framework import AIStrategy, StrategyRegistry, MovingAverageCrossStrategy, RSIStrategy
+
+
+def make_data(symbols=("AAA", "BBB", "CCC"), periods=120, seed=7):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2022-01-03", periods=periods, freq="B")
+    data = {}
+    for i, symbol in enumerate(symbols):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, periods)))
+        df = pd.DataFrame({
+            "date": dates,
+            "open": close * (1 + rng.normal(0, 0.002, periods)),
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": rng.integers(1_000, 10_000, periods).astype(float),
+        })
+        # Stagger listings so the cube has to align ragged histories
+        data[symbol] = df.iloc[i * 5:].reset_index(drop=True)
+    return data
+
+
+def make_registry():
+    registry = StrategyRegistry()
+    registry.register(MovingAverageCrossStrategy(short_window=5, long_window=20))
+    registry.register(RSIStrategy(period=14))
+    return registry
+
+
+def test_price_cube_as_of_lookups():
+    data = make_data()
+    cube = PriceCube.from_frames(data)
+
+    assert cube.symbols == ["AAA", "BBB", "CCC"]
+    assert len(cube) == 120
+
+    # Before its first bar a symbol has no price
+    assert cube.price("CCC", 0) is None
+    assert cube.price("CCC", 10) == pytest.approx(data["CCC"]["close"].iloc[0])
+
+    # History is the symbol's own bars up to the row
+    row = 50
+    expected = data["BBB"][data["BBB"]["date"] <= cube.date_at(row)]["close"].to_numpy()
+    np.testing.assert_allclose(cube.closes("BBB", row), expected)
+    np.testing.assert_allclose(cube.closes("BBB", row, lookback=10), expected[-10:])
+
+    frame = cube.frame("AAA", row)
+    assert list(frame.columns) == ["open", "high", "low", "close", "volume"]
+    assert frame.index[-1] == cube.date_at(row)
+
+
+def test_price_cube_row_for_between_dates():
+    cube = PriceCube.from_frames(make_data())
+    saturday = cube.date_at(4) + pd.Timedelta(days=1)
+    assert cube.row_for(saturday) == 4
+    assert cube.row_for(cube.date_at(0) - pd.Timedelta(days=1)) == -1
+
+
+def test_backtest_runs_on_cube():
+    engine = BacktestEngine(make_registry(), BacktestParameters(initial_capital=100000.0))
+    results = engine.run(make_data())
+
+    assert len(results.equity_curve) == len(engine.cube) + 1
+    assert len(results.dates) == len(results.drawdowns)
+    assert not engine.positions
+    for trade in results.trades:
+        assert trade["exit_date"] >= trade["entry_date"]
+
+
+def test_volatility_is_annualized_at_the_data_frequency():
+    cube = PriceCube.from_frames(make_data())
+    volatility = {}
+    for frequency in ("daily", "hourly"):
+        engine = BacktestEngine(make_registry(), BacktestParameters(data_frequency=frequency))
+        engine.cube = cube
+        volatility[frequency] = engine._calculate_volatility("AAA", len(cube) - 1)
+
+    assert volatility["hourly"] == pytest.approx(volatility["daily"] * np.sqrt(6.5))
+
+
+def make_full_registry():
+    from src.strategies import BollingerBandsStrategy, MACDStrategy
+
+    registry = make_registry()
+    registry.register(MACDStrategy(), weight=0.5)
+    registry.register(BollingerBandsStrategy(window=10), weight=0.8)
+    return registry
+
+
+def test_vectorized_run_matches_event_driven():
+    data = make_data(periods=200)
+    event = BacktestEngine(make_full_registry()).run(data)
+    vectorized = BacktestEngine(make_full_registry()).run(data, vectorized=True)
+
+    # Streaming indicators may differ from the full-series pandas ones in the last ulp
+    assert event.trades
+    assert vectorized.equity_curve == pytest.approx(event.equity_curve, rel=1e-9)
+    assert [(t["symbol"], t["entry_date"], t["exit_date"], t["reason"]) for t in vectorized.trades] == \
+        [(t["symbol"], t["entry_date"], t["exit_date"], t["reason"]) for t in event.trades]
+    assert [(s["date"], s["symbol"], s["signal_type"]) for s in vectorized.signals_history] == \
+        [(s["date"], s["symbol"], s["signal_type"]) for s in event.signals_history]
+
+
+def test_vectorized_run_rejects_stateful_strategies():
+    from src.strategy_framework import Strategy
+
+    class Stateful(Strategy):
+        def generate_signals(self, data):
+            return []
+
+    registry = make_registry()
+    registry.register(Stateful())
+    with pytest.raises(ValueError, match="Stateful"):
+        BacktestEngine(registry).run(make_data(), vectorized=True)
+
+
+def test_saved_cube_loads_as_read_only_memory_map(tmp_path):
+    cube = PriceCube.from_frames(make_data())
+    cube.save(str(tmp_path))
+    loaded = PriceCube.load(str(tmp_path))
+
+    assert loaded.symbols == cube.symbols
+    assert isinstance(loaded.values, np.memmap)
+    assert not loaded.values.flags.writeable
+    np.testing.assert_array_equal(loaded.bar_count, cube.bar_count)
+    np.testing.assert_allclose(loaded.closes("BBB", 50), cube.closes("BBB", 50))
+
+
+def test_parallel_backtests_match_serial_runs():
+    from src.backtesting import run_parallel_backtests
+
+    data = make_data()
+    param_sets = [BacktestParameters(initial_capital=c) for c in (50000.0, 100000.0)]
+    results = run_parallel_backtests(make_registry(), data, param_sets, max_workers=2)
+
+    for params, result in zip(param_sets, results):
+        expected = BacktestEngine(make_registry(), params).run(data)
+        assert result.equity_curve == pytest.approx(expected.equity_curve)
+
+
+def test_load_data_reuses_binary_cache(tmp_path, monkeypatch):
+    import os
+    from src.backtesting import load_data
+
+    df = make_data(symbols=("AAA",))["AAA"]
+    df["exchange"] = "NYSE"
+    csv_path = tmp_path / "aaa.csv"
+    df.iloc[::-1].to_csv(csv_path, index=False)
+
+    parsed = load_data(str(tmp_path))["AAA"]
+    with monkeypatch.context() as m:
+        m.setattr(pd, "read_csv", lambda *a, **k: pytest.fail("cache was not used"))
+        cached = load_data(str(tmp_path))["AAA"]
+    pd.testing.assert_frame_equal(cached, parsed, check_dtype=False, check_index_type=False)
+
+    # A changed source file invalidates its cache entry
+    df.iloc[:10].to_csv(csv_path, index=False)
+    os.utime(csv_path, ns=(0, 0))
+    assert len(load_data(str(tmp_path))["AAA"]) == 10
+
+
+def test_results_are_columnar_and_save_compactly(tmp_path):
+    import json
+
+    results = BacktestEngine(make_registry()).run(make_data())
+
+    assert results.bars.dtype.names == ("date", "equity", "cash", "drawdown")
+    assert results.trades and len(results.trade_records) == len(results.trades)
+    assert all(event["action"] in ("open", "close") for event in results.positions_history)
+
+    path = tmp_path / "results.json"
+    results.save_results(str(path))
+    saved = json.loads(path.read_text())
+    assert saved["bars"]["equity"] == pytest.approx(results.equity_curve.tolist())
+    assert saved["trades"]["symbol"] == [t["symbol"] for t in results.trades]
+
+
+def test_results_spill_to_parquet_in_chunks(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    data = make_data()
+    in_memory = BacktestEngine(make_registry()).run(data)
+    params = BacktestParameters(results_spill_dir=str(tmp_path), results_chunk_size=16)
+    engine = BacktestEngine(make_registry(), params)
+    # Another run spilling to the same directory must not touch this one's parts
+    other = BacktestEngine(make_registry(), params)
+    spilled = engine.run(data)
+    other.run({symbol: df.iloc[:60] for symbol, df in data.items()})
+
+    assert len(list(tmp_path.glob("*/bars-*.parquet"))) > 2
+    assert all(len(buffer) == 0 for buffer in spilled._buffers.values())
+    np.testing.assert_allclose(spilled.equity_curve, in_memory.equity_curve)
+    assert spilled.trades == in_memory.trades
+    assert spilled.metrics == pytest.approx(in_memory.metrics)
+
+
+def test_ohlc_fill_model_uses_intrabar_range_and_gaps():
+    from src.backtesting import EXIT_NONE, EXIT_STOPPED, EXIT_TARGET
+
+    bars = pd.DataFrame({
+        "date": pd.to_datetime(["2024-01-02", "2024-01-03"]),
+        "open": [100.0, 100.0], "high": [101.0, 110.0], "low": [99.0, 90.0],
+        "close": [100.0, 105.0], "volume": [1.0, 1.0],
+    })
+    engine = BacktestEngine(make_registry(), BacktestParameters(fill_model="ohlc"))
+    engine.cube = PriceCube.from_frames({"AAA": bars})
+
+    n = 6
+    columns = np.zeros(n, dtype=int)
+    direction = np.array([1, 1, -1, 1, 1, 1], dtype=float)
+    stop = np.array([95, 101, np.nan, 92, np.nan, np.nan])
+    target = np.array([np.nan, np.nan, 95, 108, 99, np.nan])
+    fill, reason = engine._exit_fills(1, columns, engine.cube.values[1, columns], direction, stop, target)
+
+    assert reason.tolist() == [EXIT_STOPPED, EXIT_STOPPED, EXIT_TARGET, EXIT_STOPPED, EXIT_TARGET, EXIT_NONE]
+    assert fill[:5].tolist() == [95, 100, 95, 92, 100]
+
+    # The close-only model only sees the 105 close
+    engine.parameters.fill_model = "close"
+    _, reason = engine._exit_fills(1, columns, engine.cube.values[1, columns], direction, stop, target)
+    assert reason.tolist() == [EXIT_NONE, EXIT_NONE, EXIT_NONE, EXIT_NONE, EXIT_TARGET, EXIT_NONE]
+
+
+def test_cost_models_scale_with_participation():
+    from src.cost_models import (
+        FlatCostModel, SquareRootImpactCostModel, VolumeParticipationCostModel, high_low_spread
+    )
+
+    cube = PriceCube.from_frames(make_data())
+    rows = np.array([60, 60])
+    columns = np.array([0, 0])
+    adv = np.mean(cube.bars[cube.offsets[0]:cube.offsets[1], 4][41:61])
+
+    linear = VolumeParticipationCostModel(impact=0.1)
+    linear.prepare(cube)
+    half_spread = linear.features["spread"][60, 0] / 2
+    np.testing.assert_allclose(
+        linear.slippage(rows, columns, np.array([0.0, adv]), 100.0), [half_spread, half_spread + 0.1]
+    )
+
+    sqrt = SquareRootImpactCostModel()
+    sqrt.prepare(cube)
+    small, large = sqrt.slippage(rows, columns, np.array([adv / 100, adv]), 100.0)
+    assert large - half_spread == pytest.approx(10 * (small - half_spread))
+
+    # Spread estimate is zero for bars without range and NaN for the first bar
+    spread = high_low_spread(np.array([1.0, 1.0, 1.0]), np.array([1.0, 1.0, 1.0]))
+    assert np.isnan(spread[0]) and spread[1:].tolist() == [0.0, 0.0]
+    assert FlatCostModel(0.002).slippage(rows, columns, np.array([1.0, 2.0]), 100.0).tolist() == [0.002, 0.002]
+
+
+def test_impact_cost_model_makes_backtest_costlier():
+    data = make_data()
+    flat = BacktestEngine(make_registry(), BacktestParameters(slippage_pct=0.0)).run(data)
+    impact = BacktestEngine(
+        make_registry(), BacktestParameters(slippage_pct=0.0, cost_model="volume")
+    ).run(data)
+
+    assert impact.trades
+    assert impact.equity_curve[-1] < flat.equity_curve[-1]
+    with pytest.raises(ValueError, match="Unknown cost model"):
+        BacktestEngine(make_registry(), BacktestParameters(cost_model="free"))
+
+
+def test_stepwise_run_matches_single_run():
+    data = make_data()
+    expected = BacktestEngine(make_registry()).run(data)
+
+    engine = BacktestEngine(make_registry())
+    assert engine.begin(data)
+    assert engine.advance(engine.cube.date_at(40)) == 41
+    assert engine.advance(engine.cube.date_at(40)) == 0
+    engine.advance()
+    assert engine.finished and engine.bars_simulated == len(engine.cube)
+
+    np.testing.assert_array_equal(engine.finish().equity_curve, expected.equity_curve)
+
+
+def test_signal_matrix_matches_generate_signals():
+    from src.strategies import BollingerBandsStrategy, MACDStrategy
+    from src.strategy_framework import close_matrix
+
+    data = make_data(periods=80)
+    strategies = (
+        MovingAverageCrossStrategy(short_window=5, long_window=20), RSIStrategy(period=14),
+        MACDStrategy(), BollingerBandsStrategy(window=10)
+    )
+    for end in (1, 12, 30, 80):
+        # Ragged histories, some shorter than the lookbacks
+        window = {symbol: df.iloc[:end] for symbol, df in data.items()}
+        for strategy in strategies:
+            expected = {s.symbol: s for s in type(strategy)(**strategy.params).generate_signals(window)}
+            symbols, close = close_matrix(window, strategy.signal_lookback)
+            values, confidence = strategy.generate_signal_matrix(close)
+
+            emitted = {symbol for symbol, value in zip(symbols, values) if not np.isnan(value)}
+            assert emitted == set(expected)
+            for symbol, value, conf in zip(symbols, values, confidence):
+                if symbol in expected:
+                    assert value == expected[symbol].signal_type.value
+                    assert conf == pytest.approx(expected[symbol].confidence, nan_ok=True)
+
+
+def test_combined_signals_batch_matches_per_symbol_path():
+    data = make_data(periods=150)
+    batched, per_symbol = make_full_registry(), make_full_registry()
+    for name in per_symbol.list_strategies():
+        per_symbol.get_strategy(name).batchable = False
+
+    for end in (20, 60, 150):
+        window = {symbol: df.iloc[:end] for symbol, df in data.items()}
+        expected = per_symbol.get_combined_signals(window)
+        combined = batched.get_combined_signals(window)
+
+        assert list(combined) == list(expected)
+        for symbol, signal in combined.items():
+            assert not signal.is_hold
+            assert signal.signal_type == expected[symbol].signal_type
+            assert signal.confidence == pytest.approx(expected[symbol].confidence)
+            assert signal.metadata["strategy_sources"] == expected[symbol].metadata["strategy_sources"]
+
+
+class SlowAIStrategy(AIStrategy):
+    """Async strategy standing in for an AI model call"""
+
+    def __init__(self, delay, signal_type):
+        super().__init__()
+        self.delay = delay
+        self.signal_type = signal_type
+
+    @property
+    def name(self):
+        return f"SlowAI{self.delay}"
+
+    def get_required_data(self):
+        return ["symbol", "close"]
+
+    async def generate_signals(self, data):
+        import asyncio
+        from src.strategy_framework import Signal
+
+        await asyncio.sleep(self.delay)
+        return [Signal(symbol, self.signal_type, 0.9, source=self.name) for symbol in data]
+
+
+@pytest.mark.asyncio
+async def test_async_combination_awaits_ai_and_drops_late_strategies():
+    from concurrent.futures import ThreadPoolExecutor
+    from src.strategy_framework import SignalType
+
+    data = {symbol: df.iloc[:60] for symbol, df in make_data().items()}
+    registry = make_full_registry()
+    expected = registry.get_combined_signals(data)
+
+    registry.register(SlowAIStrategy(0.0, SignalType.SELL), weight=100.0)
+    registry.register(SlowAIStrategy(5.0, SignalType.BUY), weight=100.0, deadline=0.2)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        combined = await registry.get_combined_signals_async(data, deadline=2.0, executor=executor)
+
+    # The fast AI strategy outweighs the technical ones; the slow one misses its deadline
+    assert registry.last_dropped == ["SlowAI5.0"]
+    assert set(combined) == set(data)
+    assert all(signal.is_sell for signal in combined.values())
+    assert "SlowAI0.0" in combined["AAA"].metadata["strategy_sources"]
+
+    # Without AI strategies both paths combine the same signals
+    registry.unregister("SlowAI0.0")
+    registry.unregister("SlowAI5.0")
+    combined = await registry.get_combined_signals_async(data)
+    assert {s: (v.signal_type, v.confidence) for s, v in combined.items()} == \
+        {s: (v.signal_type, v.confidence) for s, v in expected.items()}
@@ -0,0 +1,61 @@
+import pytest
+
+optuna = pytest.importorskip("optuna")
+
+from src.backtesting import BacktestEngine
+from src.optimization import BayesianOptimizer
+from src.strategies import MACDStrategy
+from tests.unit.test_backtesting import make_data, make_registry
+
+
+def make_macd_registry():
+    registry = make_registry()
+    registry.register(MACDStrategy(), weight=0.5)
+    return registry
+
+
+def test_tunes_weights_and_params_and_resumes(tmp_path):
+    registry = make_macd_registry()
+    space = {"MACDStrategy": {"fast_period": (5, 12), "slow_period": (20, 30)}}
+    storage = str(tmp_path / "study.db")
+    optimizer = BayesianOptimizer(registry, BacktestEngine(registry), param_space=space, storage=storage, seed=1)
+
+    result = optimizer.optimize(make_data(periods=150), n_trials=6)
+
+    assert len(result.iteration_history) == 6
+    assert sum(result.weights.values()) == pytest.approx(1.0)
+    assert set(result.params["MACDStrategy"]) == {"fast_period", "slow_period"}
+    assert 5 <= result.params["MACDStrategy"]["fast_period"] <= 12
+
+    # The same study name on the same storage continues the study
+    resumed = BayesianOptimizer(registry, BacktestEngine(registry), param_space=space, storage=storage, seed=2)
+    assert len(resumed.optimize(make_data(periods=150), n_trials=2).iteration_history) == 8
+
+
+def test_reports_interim_metrics_for_pruning():
+    registry = make_registry()
+    optimizer = BayesianOptimizer(registry, BacktestEngine(registry), pruner="median", checkpoints=4, seed=0)
+
+    result = optimizer.optimize(make_data(periods=150), n_trials=8)
+
+    trials = optimizer.study.trials
+    assert all(len(trial.intermediate_values) == 3 for trial in trials if trial.state.name == "COMPLETE")
+    assert len(result.iteration_history) == 8
+
+
+def test_parallel_trials_share_sqlite_study(tmp_path):
+    registry = make_registry()
+    optimizer = BayesianOptimizer(
+        registry, BacktestEngine(registry), n_jobs=2, storage=str(tmp_path / "study.db"), seed=0
+    )
+
+    result = optimizer.optimize(make_data(), n_trials=4)
+
+    assert len(result.iteration_history) == 4
+    assert result.weights
+
+
+def test_rejects_unknown_params():
+    registry = make_registry()
+    with pytest.raises(ValueError, match="no parameters"):
+        BayesianOptimizer(registry, BacktestEngine(registry), param_space={"RSIStrategy": {"window": (2, 5)}})
@@ -0,0 +1,85 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.blocking_calls import BlockingCallRunner, RateLimiter
+from src.exceptions import RobinhoodAPIError
+from src.metrics import API_CALLS, API_LATENCY
+
+
+def call_count(endpoint, status):
+    return API_CALLS.labels(endpoint=endpoint, status=status)._value.get()
+
+
+@pytest.mark.asyncio
+async def test_blocking_calls_leave_the_event_loop_free():
+    runner = BlockingCallRunner(max_workers=2, timeout=5.0)
+    ticks = 0
+
+    async def heartbeat():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    beat = asyncio.create_task(heartbeat())
+    before = call_count("test_profile", "success")
+    results = await asyncio.gather(*(
+        runner.call("test_profile", time.sleep, 0.2) for _ in range(4)
+    ))
+    beat.cancel()
+
+    # Four 0.2s calls on two threads while the loop kept ticking
+    assert results == [None] * 4
+    assert ticks >= 20
+    assert call_count("test_profile", "success") == before + 4
+    assert API_LATENCY.labels(endpoint="test_profile")._sum.get() > 0
+    runner.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeout_raises_and_frees_waiting_callers():
+    runner = BlockingCallRunner(max_workers=1, timeout=5.0)
+    release = threading.Event()
+    started = []
+
+    def slow():
+        started.append(True)
+        release.wait(5)
+
+    with pytest.raises(RobinhoodAPIError, match="504"):
+        await runner.call("test_slow", slow, timeout=0.05)
+    # A call waiting for the busy thread times out without ever running
+    with pytest.raises(RobinhoodAPIError):
+        await runner.call("test_slow", slow, timeout=0.05)
+    assert len(started) == 1
+    assert call_count("test_slow", "timeout") >= 2
+
+    release.set()
+    with pytest.raises(ZeroDivisionError):
+        await runner.call("test_error", lambda: 1 / 0)
+    assert call_count("test_error", "error") >= 1
+    runner.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_paces_bursts_and_backs_off():
+    limiter = RateLimiter(rate=20.0, burst=2)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    for _ in range(4):
+        await limiter.acquire()
+    # Two calls from the burst, then two spaced 0.05s apart
+    assert 0.08 <= loop.time() - start < 0.5
+
+    assert limiter.backoff() == pytest.approx(0.05)
+    assert limiter.backoff() == pytest.approx(0.1)
+    start = loop.time()
+    await limiter.acquire()
+    assert loop.time() - start >= 0.09
+
+    limiter.success()
+    assert limiter.backoff(retry_after=0.01) == pytest.approx(0.01)
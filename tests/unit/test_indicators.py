@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.indicators import (
+    BollingerBands, EWMA, IndicatorStream, MACD, RollingRSI, RollingWindow, WilderRSI
+)
+
+
+@pytest.fixture
+def closes():
+    rng = np.random.default_rng(11)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 500))))
+
+
+def stream(indicator, values):
+    out = []
+    for value in values:
+        indicator.update(value)
+        out.append((indicator.mean, indicator.std))
+    return np.array(out)
+
+
+def test_rolling_window_matches_pandas(closes):
+    result = stream(RollingWindow(20), closes)
+    np.testing.assert_allclose(result[:, 0], closes.rolling(20).mean(), rtol=1e-10)
+    np.testing.assert_allclose(result[:, 1], closes.rolling(20).std(), rtol=1e-8)
+
+    result = stream(RollingWindow(20, min_periods=1), closes)
+    np.testing.assert_allclose(result[:, 0], closes.rolling(20, min_periods=1).mean(), rtol=1e-10)
+
+
+def test_ewma_and_macd_match_pandas(closes):
+    ewma = EWMA(12)
+    np.testing.assert_allclose([ewma.update(c) for c in closes], closes.ewm(span=12, adjust=False).mean())
+
+    macd = MACD(12, 26, 9)
+    rows = pd.DataFrame([macd.update(c) for c in closes])
+    expected = closes.ewm(span=12, adjust=False).mean() - closes.ewm(span=26, adjust=False).mean()
+    np.testing.assert_allclose(rows["macd"], expected, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(rows["signal_line"], expected.ewm(span=9, adjust=False).mean(), rtol=1e-9, atol=1e-12)
+
+
+def test_rsi_variants(closes):
+    delta = closes.diff()
+    gain = delta.clip(lower=0).rolling(window=14, min_periods=1).mean()
+    loss = -delta.clip(upper=0).rolling(window=14, min_periods=1).mean()
+    expected = 100 - (100 / (1 + gain / (loss + 1e-9)))
+
+    rsi = RollingRSI(14)
+    np.testing.assert_allclose([rsi.update(c) for c in closes], expected, rtol=1e-9)
+
+    wilder = WilderRSI(14)
+    values = np.array([wilder.update(c) for c in closes])
+    assert np.isnan(values[:14]).all()
+    assert ((values[14:] >= 0) & (values[14:] <= 100)).all()
+
+
+def test_bollinger_bands_match_pandas(closes):
+    bands = BollingerBands(20, 2.0)
+    rows = pd.DataFrame([bands.update(c) for c in closes])
+    middle = closes.rolling(20).mean()
+    upper = middle + closes.rolling(20).std() * 2.0
+    np.testing.assert_allclose(rows["middle_band"], middle, rtol=1e-10)
+    np.testing.assert_allclose(rows["upper_band"], upper, rtol=1e-10)
+
+
+def test_indicator_stream_feeds_only_new_bars(closes):
+    df = pd.DataFrame({"date": pd.date_range("2024-01-01", periods=len(closes), freq="5min"), "close": closes})
+    calls = []
+
+    def step(window, close):
+        calls.append(close)
+        window.update(close)
+        return {"mean": window.mean}
+
+    stream = IndicatorStream(lambda: RollingWindow(10), step)
+    assert stream.consume(df.iloc[:100]) == 100
+
+    # A sliding live window only feeds the bars appended since the last call
+    assert stream.consume(df.iloc[50:103]) == 3
+    assert stream.last_row["mean"] == pytest.approx(closes.iloc[93:103].mean())
+
+    # A history that no longer lines up rebuilds the state
+    assert stream.consume(df.iloc[:20]) == 20
+    assert stream.bars_seen == 20
+    assert len(calls) == 123
+
+
+def test_registry_shares_indicator_cache():
+    from src.strategy_framework import StrategyRegistry, MovingAverageCrossStrategy
+    from src.strategies import BollingerBandsStrategy
+
+    registry = StrategyRegistry()
+    registry.register(MovingAverageCrossStrategy(short_window=20, long_window=50))
+    registry.register(BollingerBandsStrategy(window=20))
+
+    rng = np.random.default_rng(5)
+    dates = pd.date_range("2024-01-01", periods=80, freq="D")
+    df = pd.DataFrame({"date": dates, "close": 100 + np.cumsum(rng.normal(0, 1, 80))})
+
+    def generate_signals(data):
+        # Per-symbol path (get_combined_signals batches these strategies instead)
+        for name in registry.list_strategies():
+            registry.get_strategy(name).generate_signals(data)
+
+    generate_signals({"AAA": df.iloc[:60]})
+    # rolling(20) is computed once for MA and served from cache for Bollinger
+    assert registry.indicator_cache.stats() == {"entries": 2, "hits": 1, "misses": 2, "hit_rate": pytest.approx(1 / 3)}
+
+    generate_signals({"AAA": df.iloc[:61]})
+    assert registry.indicator_cache.misses == 4
+    assert registry.indicator_cache.hits == 2
+
+
+def test_registry_with_indicator_state_pickles():
+    import pickle
+    from src.strategy_framework import StrategyRegistry
+    from src.strategies import MACDStrategy
+
+    registry = StrategyRegistry()
+    registry.register(MACDStrategy())
+
+    rng = np.random.default_rng(3)
+    dates = pd.date_range("2024-01-01", periods=80, freq="D")
+    df = pd.DataFrame({"date": dates, "close": 100 + np.cumsum(rng.normal(0, 1, 80))})
+    registry.get_combined_signals({"AAA": df})
+    assert registry.indicator_cache.stats()["entries"] > 0
+
+    # Spawned worker processes receive the registry by pickling
+    restored = pickle.loads(pickle.dumps(registry))
+    assert restored.get_combined_signals({"AAA": df}) == registry.get_combined_signals({"AAA": df})
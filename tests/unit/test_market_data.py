@@ -0,0 +1,166 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.indicators import IndicatorCache
+from src.market_data import BarCache, CycleFetcher, QuoteSnapshot
+
+
+class FakeHistoryAPI:
+    """Async history endpoint with a fixed latency that records concurrency"""
+
+    def __init__(self, latency=0.05, failing=()):
+        self.latency = latency
+        self.failing = set(failing)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_historical_data(self, symbol):
+        self.calls.append(symbol)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if symbol in self.failing:
+                raise ConnectionError("timeout")
+            return [{"close": 1.0, "symbol": symbol}]
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.mark.asyncio
+async def test_fan_out_is_bounded_and_deduplicated():
+    api = FakeHistoryAPI(failing={"BAD"})
+    fetcher = CycleFetcher(api.get_historical_data, max_concurrency=10)
+    symbols = [f"S{i}" for i in range(100)]
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    # Analysis and execution ask for overlapping symbols at the same time
+    analysis, execution = await asyncio.gather(
+        fetcher.get_many(symbols + ["BAD", "S0"]), fetcher.get_many(["S5", "S99", "BAD"])
+    )
+    elapsed = loop.time() - started
+
+    assert list(analysis) == symbols
+    assert list(execution) == ["S5", "S99"]
+    assert execution["S5"] is analysis["S5"]
+    assert sorted(api.calls) == sorted(symbols + ["BAD"])
+    assert api.max_in_flight == 10
+    # 101 requests at 10 in flight: about 11 round trips rather than 101
+    assert elapsed < 50 * api.latency
+
+    # Later lookups in the cycle are served from memory; a new cycle refetches
+    await fetcher.get("S1")
+    assert len(api.calls) == 101
+    fetcher.start_cycle()
+    await fetcher.get("S1")
+    assert len(api.calls) == 102
+
+
+def _historicals(start, count, offset=0.0):
+    """robin_stocks-style 5-minute records"""
+    dates = pd.date_range(start, periods=count, freq="5min")
+    return [
+        {
+            "begins_at": date.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "open_price": str(100.0 + i + offset),
+            "high_price": str(101.0 + i + offset),
+            "low_price": str(99.0 + i + offset),
+            "close_price": str(100.5 + i + offset),
+            "volume": 1000 + i,
+            "interpolated": False,
+        }
+        for i, date in enumerate(dates)
+    ]
+
+
+def test_bar_cache_appends_only_new_bars_and_persists(tmp_path):
+    cache = BarCache(str(tmp_path))
+    assert cache.fetch_span("AAPL", "5minute", "week") == "week"
+
+    week = _historicals("2024-01-08 14:30", 60)
+    frame = cache.update("AAPL", "5minute", week)
+    assert len(frame) == 60
+    assert cache.fetch_span("AAPL", "5minute", "week", now=pd.Timestamp("2024-01-08 20:00")) == "day"
+    assert cache.fetch_span("AAPL", "5minute", "week", now=pd.Timestamp("2024-01-12 20:00")) == "week"
+
+    # Nothing new: the very same frame comes back
+    assert cache.update("AAPL", "5minute", week[-5:]) is frame
+
+    # A later fetch overlapping the cache only appends the newer bars
+    day = _historicals("2024-01-08 14:30", 63)[50:]
+    extended = cache.update("AAPL", "5minute", day)
+    assert len(extended) == 63
+    assert extended.index.is_monotonic_increasing
+    np.testing.assert_array_equal(extended["close"].to_numpy()[:60], frame["close"].to_numpy())
+
+    # A revised last bar replaces the cached one
+    revised = _historicals("2024-01-08 14:30", 63, offset=0.25)[-1:]
+    assert cache.update("AAPL", "5minute", revised)["close"].iloc[-1] == 100.5 + 62 + 0.25
+
+    # A new cache over the same directory resumes from disk
+    restored = BarCache(str(tmp_path)).history("AAPL", "5minute").frame()
+    pd.testing.assert_frame_equal(restored, cache.history("AAPL", "5minute").frame())
+
+    # After an outage longer than the span the history starts over, so no gap is left
+    assert cache.fetch_span("AAPL", "5minute", "week", now=pd.Timestamp("2024-01-20 20:00")) == "week"
+    assert len(cache.history("AAPL", "5minute")) == 0
+    later = cache.update("AAPL", "5minute", _historicals("2024-01-19 14:30", 10))
+    assert len(later) == 10
+    assert len(BarCache(str(tmp_path)).history("AAPL", "5minute")) == 10
+
+
+def test_bar_cache_frames_advance_indicator_streams_incrementally():
+    cache = BarCache()
+    indicators = IndicatorCache()
+    records = _historicals("2024-01-08 14:30", 80)
+
+    frame = cache.update("AAPL", "5minute", records[:60])
+    stream = indicators.get("AAPL", frame, "rolling", 20)
+    assert stream.bars_seen == 60
+
+    indicators.get("AAPL", cache.update("AAPL", "5minute", records[55:60]), "rolling", 20)
+    assert indicators.hits == 1
+
+    frame = cache.update("AAPL", "5minute", records[55:])
+    stream = indicators.get("AAPL", frame, "rolling", 20)
+    # Only the 20 new bars were fed, and the result matches a full recompute
+    assert stream.bars_seen == 80
+    expected = frame["close"].rolling(20, min_periods=1).mean().iloc[-1]
+    assert stream.last_row["mean"] == pytest.approx(expected)
+
+
+@pytest.mark.asyncio
+async def test_quote_snapshot_batches_and_expires():
+    now = [0.0]
+    requests = []
+
+    async def get_quotes(symbols):
+        requests.append(list(symbols))
+        await asyncio.sleep(0.01)
+        return {symbol: {"last_price": 10.0 + now[0]} for symbol in symbols if symbol != "ZZZZ"}
+
+    quotes = QuoteSnapshot(get_quotes, ttl=5.0, clock=lambda: now[0])
+
+    # Sizing and execution ask at once: one batched request serves both
+    first, second = await asyncio.gather(
+        quotes.get_many(["AAPL", "MSFT", "ZZZZ"]), quotes.get_many(["MSFT", "AAPL"])
+    )
+    assert requests == [["AAPL", "MSFT", "ZZZZ"]]
+    assert list(first) == ["AAPL", "MSFT"]
+    assert second == {"MSFT": first["MSFT"], "AAPL": first["AAPL"]}
+
+    # Within the TTL only missing symbols are fetched; afterwards all are
+    now[0] = 3.0
+    assert (await quotes.get("GOOG"))["last_price"] == 13.0
+    now[0] = 6.0
+    await quotes.get_many(["AAPL", "GOOG"])
+    assert requests[1:] == [["GOOG"], ["AAPL"]]
+
+    quotes.invalidate(["GOOG"])
+    await quotes.get_many(["AAPL", "GOOG"])
+    assert requests[-1] == ["GOOG"]
@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+
+from src.pipeline import InFlightSymbols, Pipeline, Stage
+
+
+@pytest.mark.asyncio
+async def test_next_cycle_is_analyzed_while_orders_execute_without_double_trading():
+    events = []
+    in_flight = InFlightSymbols()
+    executed = []
+
+    async def signals(cycle):
+        events.append(("signals", cycle))
+        return [(cycle, ["AAPL", "MSFT"] if cycle == 1 else ["AAPL", "TSLA"])]
+
+    async def risk(item):
+        cycle, symbols = item
+        return [(cycle, symbol) for symbol in symbols if in_flight.claim(symbol)]
+
+    async def execute(order):
+        cycle, symbol = order
+        try:
+            # A slow TWAP-style execution
+            await asyncio.sleep(0.2 if symbol == "AAPL" else 0.01)
+            executed.append(order)
+        finally:
+            in_flight.release(symbol)
+
+    pipeline = Pipeline([
+        Stage("signals", signals),
+        Stage("risk", risk),
+        Stage("execute", execute, workers=2, queue_size=2),
+    ])
+    pipeline.start()
+    await pipeline.put(1)
+    await asyncio.sleep(0.05)
+    # Cycle 1's AAPL order is still executing when cycle 2 is analyzed
+    await pipeline.put(2)
+    await asyncio.sleep(0.05)
+    assert ("signals", 2) in events
+    assert "AAPL" in in_flight
+
+    await pipeline.join()
+    await pipeline.stop()
+    assert sorted(executed) == [(1, "AAPL"), (1, "MSFT"), (2, "TSLA")]
+    assert len(in_flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_stage_errors_are_handled_or_stop_the_pipeline():
+    errors = []
+
+    async def check(item):
+        if item == "bad":
+            raise ValueError("bad item")
+        if item == "fatal":
+            raise KeyError(item)
+        return [item]
+
+    async def sink(item):
+        return None
+
+    def on_error(stage, item, error):
+        errors.append((stage, item))
+        if isinstance(error, KeyError):
+            raise error
+
+    pipeline = Pipeline([Stage("check", check), Stage("sink", sink)], on_error=on_error)
+    pipeline.start()
+    await pipeline.put("bad")
+    await pipeline.put("ok")
+    await pipeline.join()
+    assert errors == [("check", "bad")]
+
+    await pipeline.put("fatal")
+    with pytest.raises(KeyError):
+        await pipeline.wait(1.0)
+    with pytest.raises(KeyError):
+        await pipeline.put("ok")
+    await pipeline.stop()
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting import BacktestEngine, BacktestParameters
+from src.resampling import IncrementalResampler, ResampleCache, period_starts, resample_bars
+from src.strategy_framework import MovingAverageCrossStrategy, StrategyRegistry
+
+
+def make_minute_bars(periods=600, start="2024-01-02 14:30", seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, periods)))
+    return pd.DataFrame({
+        "date": pd.date_range(start, periods=periods, freq="min"),
+        "open": close * (1 + rng.normal(0, 0.0005, periods)),
+        "high": close * 1.001,
+        "low": close * 0.999,
+        "close": close,
+        "volume": rng.integers(1, 100, periods).astype(float),
+    })
+
+
+def test_resample_matches_pandas():
+    bars = make_minute_bars()
+    expected = bars.set_index("date").resample("15min").agg(
+        {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+    )
+
+    result = resample_bars(bars, "15m")
+
+    np.testing.assert_array_equal(result.index.values, expected.index.values)
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy())
+
+
+def test_incremental_updates_match_one_pass():
+    bars = make_minute_bars()
+    resampler = IncrementalResampler("1h")
+
+    # Grow the history bar by bar in uneven steps, as the live loop would
+    for stop in (7, 61, 62, 300, 599, 600):
+        resampler.update(bars.iloc[:stop])
+        pd.testing.assert_frame_equal(resampler.frame(), resample_bars(bars.iloc[:stop], "1h"))
+
+    # The forming bar is excluded on request
+    assert len(resampler.frame(include_partial=False)) == len(resampler.frame()) - 1
+
+
+def test_resample_cache_rebuilds_on_revised_history():
+    bars = make_minute_bars()
+    cache = ResampleCache()
+    cache.get("AAA", bars.iloc[:100], "5m")
+
+    # History that no longer contains the last bar seen is resampled from scratch
+    revised = bars.iloc[:200].assign(date=bars["date"].iloc[:200] + pd.Timedelta(seconds=30))
+    pd.testing.assert_frame_equal(cache.get("AAA", revised, "5m"), resample_bars(revised, "5m"))
+
+
+def test_revised_last_bar_refolds_forming_bucket():
+    bars = make_minute_bars()
+    resampler = IncrementalResampler("15m")
+    resampler.update(bars.iloc[:100])
+
+    # The live source bar is revised in place under the same timestamp
+    revised = bars.iloc[:100].copy()
+    revised.loc[99, ["close", "high", "volume"]] = [500.0, 501.0, 1e6]
+    resampler.update(revised)
+    pd.testing.assert_frame_equal(resampler.frame(), resample_bars(revised, "15m"))
+
+    # ... and later bars keep folding in incrementally
+    grown = pd.concat([revised, bars.iloc[100:130]])
+    resampler.update(grown)
+    pd.testing.assert_frame_equal(resampler.frame(), resample_bars(grown, "15m"))
+
+
+def test_period_starts_marks_first_bar_of_each_week():
+    dates = pd.date_range("2024-01-01", periods=15, freq="B").values
+    starts = period_starts(dates, "weekly")
+
+    assert starts.tolist() == [True] + [False] * 4 + [True] + [False] * 4 + [True] + [False] * 4
+    with pytest.raises(ValueError, match="fortnightly"):
+        period_starts(dates, "fortnightly")
+
+
+class HourlyMovingAverage(MovingAverageCrossStrategy):
+    def get_required_data(self):
+        return super().get_required_data() + ["timeframe:1h"]
+
+
+def test_strategy_sees_declared_timeframe():
+    bars = make_minute_bars()
+    registry = StrategyRegistry()
+    strategy = HourlyMovingAverage(short_window=2, long_window=4)
+    registry.register(strategy)
+
+    seen = []
+    original = strategy.generate_signals
+    strategy.generate_signals = lambda data: seen.append(data["AAA"]) or original(data)
+    signals = registry.get_combined_signals({"AAA": bars})
+
+    assert "AAA" in signals
+    pd.testing.assert_frame_equal(seen[0], resample_bars(bars, "1h"))
+    with pytest.raises(ValueError, match="HourlyMovingAverage"):
+        registry.get_combined_signal_series({"AAA": bars})
+
+
+def test_weekly_rebalance_skips_non_rebalance_bars():
+    dates = pd.date_range("2024-01-01", periods=60, freq="B")
+    close = np.linspace(100, 130, 60)
+    data = {"AAA": pd.DataFrame({
+        "date": dates, "open": close, "high": close, "low": close, "close": close, "volume": 1.0
+    })}
+    registry = StrategyRegistry()
+    registry.register(MovingAverageCrossStrategy(short_window=2, long_window=5))
+
+    params = BacktestParameters(rebalance_frequency="weekly")
+    results = BacktestEngine(registry, params).run(data)
+
+    # The first Monday's single bar combines to HOLD, which is not recorded
+    signal_dates = pd.DatetimeIndex(results.signal_records["date"])
+    assert len(signal_dates) == 11
+    assert (signal_dates.dayofweek == 0).all()
+    assert len(results.equity_curve) == 61
+
+
+def test_minute_bars_are_resampled_to_data_frequency():
+    bars = make_minute_bars(periods=3 * 1440, start="2024-01-02")
+    engine = BacktestEngine(StrategyRegistry(), BacktestParameters(data_frequency="daily"))
+    engine.run({"AAA": bars})
+
+    assert len(engine.cube) == 3
+    assert engine.cube.price("AAA", 0) == pytest.approx(bars["close"].iloc[1439])
+
+
+def test_parallel_backtests_resample_to_each_data_frequency():
+    from src.backtesting import run_parallel_backtests
+
+    bars = {"AAA": make_minute_bars(periods=2 * 1440, start="2024-01-02")}
+    registry = StrategyRegistry()
+    registry.register(MovingAverageCrossStrategy(short_window=2, long_window=5))
+    param_sets = [BacktestParameters(data_frequency=f) for f in ("hourly", "minute", "hourly")]
+
+    results = run_parallel_backtests(registry, bars, param_sets, max_workers=2)
+    for params, result in zip(param_sets, results):
+        expected = BacktestEngine(registry, params).run(bars)
+        assert len(result.equity_curve) == len(expected.equity_curve)
+        assert result.equity_curve == pytest.approx(expected.equity_curve)
+    assert len(results[0].equity_curve) < len(results[1].equity_curve)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from src.backtesting import BacktestEngine
+from src.robustness import MonteCarloEngine, path_metrics
+from tests.unit.test_backtesting import make_data, make_registry
+
+
+@pytest.fixture(scope="module")
+def results():
+    return BacktestEngine(make_registry()).run(make_data(periods=200))
+
+
+def test_path_metrics_match_direct_computation():
+    equity = np.array([[100.0, 110.0, 99.0, 121.0]])
+    metrics = path_metrics(equity, periods_per_year=252, years=1.0)
+
+    returns = equity[0, 1:] / equity[0, :-1] - 1
+    assert metrics["sharpe_ratio"][0] == pytest.approx(returns.mean() / returns.std() * np.sqrt(252))
+    assert metrics["max_drawdown"][0] == pytest.approx(0.1)
+    assert metrics["cagr"][0] == pytest.approx(0.21)
+
+
+def test_trade_shuffle_keeps_final_equity(results):
+    report = MonteCarloEngine(results, seed=1).trade_shuffle(n_paths=500)
+
+    assert report.n_paths == 500
+    # Reordering trades changes the path but not where it ends
+    assert np.ptp(report.cagr) == pytest.approx(0.0, abs=1e-12)
+    low, high = report.confidence_interval("max_drawdown")
+    assert 0 <= low <= high
+
+
+def test_batches_are_reproducible_across_jobs(results):
+    serial = MonteCarloEngine(results, batch_size=300, seed=5).block_bootstrap(n_paths=1000)
+    parallel = MonteCarloEngine(results, batch_size=300, seed=5, n_jobs=2).block_bootstrap(n_paths=1000)
+
+    np.testing.assert_array_equal(serial.sharpe_ratio, parallel.sharpe_ratio)
+    assert list(serial.summary().index) == ["sharpe_ratio", "max_drawdown", "cagr"]
+
+
+def test_parameter_jitter_spreads_outcomes(results):
+    report = MonteCarloEngine(results, seed=2).parameter_jitter(n_paths=500)
+    assert np.ptp(report.cagr) > 0
+
+
+def test_sharpe_is_annualized_like_the_backtest(results, monkeypatch):
+    engine = MonteCarloEngine(results)
+    assert engine.periods_per_year == 252
+    assert engine.risk_free_rate == results.risk_free_rate
+
+    monkeypatch.setattr(results, "data_frequency", "hourly")
+    assert MonteCarloEngine(results).periods_per_year == 252 * 6.5
+    assert MonteCarloEngine(results, periods_per_year=12, risk_free_rate=0.0).periods_per_year == 12
+
+
+def test_long_series_get_smaller_batches(results, monkeypatch):
+    import src.robustness as robustness
+
+    sizes = []
+    simulate = robustness._simulate_batch
+
+    def record(method, inputs, n_paths, seed):
+        sizes.append(n_paths)
+        return simulate(method, inputs, n_paths, seed)
+
+    monkeypatch.setattr(robustness, "_simulate_batch", record)
+    monkeypatch.setattr(robustness, "MAX_BATCH_CELLS", 1000)
+    report = MonteCarloEngine(results, seed=3).block_bootstrap(n_paths=20)
+
+    assert report.n_paths == 20
+    assert max(sizes) * (len(results.equity_curve) - 1) <= 1000
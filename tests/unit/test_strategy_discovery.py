@@ -0,0 +1,118 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.strategy_framework import LazyStrategy, StrategyRegistry, StrategyWatcher
+
+
+STRATEGY_SOURCE = '''
+from src.strategy_framework import MovingAverageCrossStrategy, Signal, SignalType
+
+
+class PluginStrategy(MovingAverageCrossStrategy):
+    def __init__(self, short_window=3, long_window=10):
+        super().__init__(short_window, long_window)
+
+    def generate_signals(self, data):
+        signals = []
+        for symbol, df in data.items():
+            ma = self.indicator(symbol, df, "rolling", self.short_window).last_row
+            signals.append(Signal(symbol, SignalType.{signal}, 0.7, source=self.name, metadata=ma))
+        return signals
+
+
+class DerivedStrategy(PluginStrategy):
+    pass
+'''
+
+
+def write_plugin(root, signal):
+    path = root / "plugins" / "plugin_strategy.py"
+    path.write_text(STRATEGY_SOURCE.replace("{signal}", signal))
+    # Make the edit visible even on filesystems with coarse timestamps
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+
+
+def make_plugin_package(tmp_path, monkeypatch):
+    (tmp_path / "plugins").mkdir()
+    (tmp_path / "plugins" / "__init__.py").write_text("")
+    write_plugin(tmp_path, "BUY")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in [name for name in sys.modules if name.startswith("plugins")]:
+        monkeypatch.delitem(sys.modules, name)
+
+
+def make_bars(periods=30):
+    close = 100 + np.cumsum(np.random.default_rng(1).normal(0, 1, periods))
+    return pd.DataFrame({"date": pd.date_range("2024-01-01", periods=periods, freq="D"), "close": close})
+
+
+def test_lazy_discovery_imports_on_first_use(tmp_path, monkeypatch):
+    make_plugin_package(tmp_path, monkeypatch)
+    registry = StrategyRegistry()
+    registry.auto_discover_and_register("plugins", default_weight=0.5)
+
+    assert registry.list_strategies() == ["PluginStrategy", "DerivedStrategy"]
+    assert "plugins.plugin_strategy" not in sys.modules
+
+    signals = registry.get_combined_signals({"AAA": make_bars()})
+    assert "plugins.plugin_strategy" in sys.modules
+    assert signals["AAA"].is_buy
+    assert not any(isinstance(registry.get_strategy(name), LazyStrategy) for name in registry.list_strategies())
+
+
+def test_watcher_hot_reloads_and_keeps_indicator_state(tmp_path, monkeypatch):
+    make_plugin_package(tmp_path, monkeypatch)
+    registry = StrategyRegistry()
+    registry.auto_discover_and_register("plugins")
+    watcher = StrategyWatcher(registry, "plugins")
+    bars = make_bars()
+
+    registry.get_combined_signals({"AAA": bars.iloc[:20]})
+    old = registry.get_strategy("PluginStrategy")
+    assert watcher.poll() == []
+
+    write_plugin(tmp_path, "SELL")
+    assert watcher.poll() == ["PluginStrategy", "DerivedStrategy"]
+    new = registry.get_strategy("PluginStrategy")
+    assert new is not old and new.params == old.params
+
+    # Same parameters: the shared indicator stream only consumes the new bar
+    misses = registry.indicator_cache.misses
+    signals = registry.get_combined_signals({"AAA": bars.iloc[:21]})
+    assert signals["AAA"].is_sell
+    assert registry.indicator_cache.stats()["entries"] == 1
+    assert registry.indicator_cache.misses == misses + 1
+
+
+def test_reload_keeps_tuned_strategy_when_parameters_no_longer_fit(tmp_path, monkeypatch):
+    make_plugin_package(tmp_path, monkeypatch)
+    registry = StrategyRegistry()
+    registry.auto_discover_and_register("plugins")
+    watcher = StrategyWatcher(registry, "plugins")
+    watcher.poll()
+
+    registry.get_strategy("PluginStrategy")
+    module = sys.modules["plugins.plugin_strategy"]
+    registry.register(module.PluginStrategy(5, 12), weight=0.9)
+
+    # Edits keeping the constructor rebuild the strategy with its tuned parameters
+    write_plugin(tmp_path, "SELL")
+    assert "PluginStrategy" in watcher.poll()
+    assert registry.get_strategy("PluginStrategy").params == {"short_window": 5, "long_window": 12}
+
+    # A renamed parameter keeps the loaded version instead of falling back to defaults
+    path = tmp_path / "plugins" / "plugin_strategy.py"
+    source = path.read_text().replace(
+        "def __init__(self, short_window=3, long_window=10):\n        super().__init__(short_window, long_window)",
+        "def __init__(self, short_window=3, slow_window=10):\n        super().__init__(short_window, slow_window)"
+    )
+    loaded = registry.get_strategy("PluginStrategy")
+    path.write_text(source)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 20_000_000))
+    assert "PluginStrategy" not in watcher.poll()
+    assert registry.get_strategy("PluginStrategy") is loaded
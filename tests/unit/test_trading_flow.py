@@ -1,18 +1,40 @@
 import pytest
 import asyncio
-from unittest.mock import patch, AsyncMock
+import pandas as pd
+from unittest.mock import patch, AsyncMock, MagicMock
 from src.main import TradingBot
+from src.risk_management import PositionSizing
+from src.strategy_framework import Signal, SignalType
 
 @pytest.mark.asyncio
 async def test_full_trading_flow():
-    bot = TradingBot(demo_mode=True)
+    rh_client = MagicMock()
+    rh_client.get_account_info = AsyncMock(return_value={"portfolio_value": 100000.0, "cash": 10000.0})
+    rh_client.get_portfolio = AsyncMock(return_value={"positions": {}})
+    rh_client.get_quotes = AsyncMock(return_value={"AAPL": {"last_price": "100.0"}, "TSLA": {"last_price": "200.0"}})
+    bot = TradingBot(demo_mode=True, rh_client=rh_client)
+    bot.anti_gaming = MagicMock()
+    bot.anti_gaming.execute_with_protection = AsyncMock(return_value={"success": True, "strategy": "simple"})
 
-    with patch.object(bot, '_should_run', side_effect=[True, False]), \
-         patch.object(bot, '_analyze_and_decide', new_callable=AsyncMock) as mock_analyze, \
-         patch.object(bot, '_execute_trades', new_callable=AsyncMock) as mock_execute:
+    bars = pd.DataFrame({"close": [100.0, 101.0, 102.0]})
+    strategy_data = {"market_data": {}, "portfolio": {}, "AAPL": bars, "TSLA": bars}
+    signals = {"AAPL": Signal("AAPL", SignalType.BUY, 0.9), "TSLA": Signal("TSLA", SignalType.SELL, 0.8)}
 
-        mock_analyze.return_value = {"AAPL": "BUY", "TSLA": "SELL"}
-        await bot.run()
+    with patch.object(bot, '_fetch_cycle_data', AsyncMock(return_value=strategy_data)), \
+         patch.object(bot, '_generate_signals', AsyncMock(return_value=signals)) as mock_generate, \
+         patch.object(bot.risk_manager, 'calculate_position_size',
+                      side_effect=lambda signal, price, *a: PositionSizing(signal.symbol, 10.0, 10 * price, 0.01, 0.01)), \
+         patch.object(bot.risk_manager, 'validate_trade', return_value=(True, "")), \
+         patch.object(bot.ai_engine, 'feedback_loop'):
+        # Each stage's outputs are the next stage's inputs
+        [data] = await bot._fetch_stage(1)
+        [item] = await bot._signal_stage(data)
+        orders = await bot._risk_stage(item)
+        for order in orders:
+            await bot._execution_stage(order)
 
-        mock_analyze.assert_awaited_once()
-        mock_execute.assert_awaited_once_with({"AAPL": "BUY", "TSLA": "SELL"})
\ No newline at end of file
+    mock_generate.assert_awaited_once_with(strategy_data)
+    assert [order["symbol"] for order in orders] == ["AAPL", "TSLA"]
+    assert [(t["symbol"], t["action"]) for t in bot.trade_history] == [("AAPL", "buy"), ("TSLA", "sell")]
+    assert bot.trade_count == 2
+    assert len(bot.in_flight) == 0 and not bot.reserved_notional
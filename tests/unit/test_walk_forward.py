@@ -0,0 +1,45 @@
+import pytest
+
+from src.backtesting import BacktestEngine
+from src.optimization import WalkForwardOptimizer
+from src.price_cube import PriceCube
+from tests.unit.test_backtesting import make_data, make_full_registry
+
+
+def make_optimizer(**kwargs):
+    registry = make_full_registry()
+    return WalkForwardOptimizer(
+        registry, BacktestEngine(registry), train_size=60, test_size=30,
+        iterations=3, seed=11, **kwargs
+    )
+
+
+def test_windows_roll_forward_without_overlap_between_tests():
+    cube = PriceCube.from_frames(make_data(periods=200))
+    windows = make_optimizer().windows(cube)
+
+    assert len(windows) == 5
+    for previous, window in zip(windows, windows[1:]):
+        assert window.train_start > previous.train_start
+        assert window.test_start > previous.test_end
+    assert windows[-1].test_end == cube.date_at(len(cube) - 1)
+
+
+def test_walk_forward_evaluates_each_window_out_of_sample():
+    result = make_optimizer(vectorized=True).run(make_data(periods=200), metric="total_return")
+
+    assert len(result.windows) == 5
+    for window in result.windows:
+        assert sum(window.weights.values()) == pytest.approx(1.0)
+        assert window.out_of_sample.dates[0] == window.test_start
+    assert len(result.out_of_sample_metrics()) == 5
+
+
+def test_parallel_walk_forward_matches_serial():
+    data = make_data(periods=200)
+    serial = make_optimizer().run(data, metric="total_return")
+    parallel = make_optimizer(n_jobs=2).run(data, metric="total_return")
+
+    assert [w.weights for w in parallel.windows] == [w.weights for w in serial.windows]
+    assert [w.out_of_sample.equity_curve.tolist() for w in parallel.windows] == \
+        [w.out_of_sample.equity_curve.tolist() for w in serial.windows]
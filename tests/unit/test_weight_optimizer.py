@@ -0,0 +1,154 @@
+import random
+
+import pytest
+
+from src.backtesting import BacktestEngine
+from src.optimization import WeightOptimizer
+from tests.unit.test_backtesting import make_data, make_registry
+
+
+def test_evaluation_does_not_touch_registry_weights():
+    registry = make_registry()
+    before = dict(registry._weights)
+    optimizer = WeightOptimizer(registry, BacktestEngine(registry))
+
+    optimizer.optimize_random_search(make_data(), iterations=3)
+
+    assert registry._weights == before
+
+
+def test_parallel_search_matches_serial():
+    data = make_data(periods=150)
+    registry = make_registry()
+
+    random.seed(3)
+    serial = WeightOptimizer(registry, BacktestEngine(registry)).optimize_genetic_algorithm(
+        data, population_size=6, generations=2, metric="total_return"
+    )
+    random.seed(3)
+    parallel = WeightOptimizer(registry, BacktestEngine(registry), n_jobs=2).optimize_genetic_algorithm(
+        data, population_size=6, generations=2, metric="total_return"
+    )
+
+    assert len(parallel.iteration_history) == 12
+    assert [h["performance"] for h in parallel.iteration_history] == \
+        pytest.approx([h["performance"] for h in serial.iteration_history])
+    assert parallel.weights == serial.weights
+
+
+def test_fitness_cache_reuses_evaluations_across_runs(tmp_path, monkeypatch):
+    from src.optimization import FitnessCache
+    from src.optimization.weight_optimizer import EvaluationContext
+
+    data = make_data(periods=150)
+    registry = make_registry()
+    path = str(tmp_path / "fitness.sqlite")
+
+    first = WeightOptimizer(registry, BacktestEngine(registry), fitness_cache=FitnessCache(path=path))
+    result = first.optimize_grid_search(data, steps=3)
+    evaluated = first.fitness_cache.misses
+    assert 0 < evaluated < len(result.iteration_history)  # (1, 1) and (0.5, 0.5) normalize alike
+
+    # A fresh cache on the same file answers everything from disk
+    monkeypatch.setattr(EvaluationContext, "evaluate", lambda *a: pytest.fail("evaluated again"))
+    second = WeightOptimizer(registry, BacktestEngine(registry), fitness_cache=FitnessCache(path=path))
+    repeated = second.optimize_grid_search(data, steps=3)
+
+    assert second.fitness_cache.hits == evaluated and second.fitness_cache.misses == 0
+    assert repeated.weights == result.weights
+
+
+def test_fitness_cache_reports_the_weights_it_scored():
+    from src.optimization import FitnessCache
+
+    data = make_data(periods=150)
+    registry = make_registry()
+    optimizer = WeightOptimizer(registry, BacktestEngine(registry), fitness_cache=FitnessCache(decimals=1))
+
+    random.seed(5)
+    result = optimizer.optimize_random_search(data, iterations=4, metric="total_return")
+
+    for h in result.iteration_history:
+        assert all(round(w, 1) == w for w in h["weights"].values())
+        assert optimizer._evaluation_context(data).evaluate(h["weights"], "total_return") == \
+            pytest.approx(h["performance"])
+    assert result.weights in [h["weights"] for h in result.iteration_history]
+
+
+def test_fitness_cache_key_depends_on_data_up_to_end_date():
+    from src.optimization.fitness_cache import data_fingerprint
+    from src.price_cube import PriceCube
+
+    longer = make_data(periods=150)
+    cutoff = longer["AAA"]["date"].iloc[120]
+    data = {symbol: df[df["date"] <= cutoff] for symbol, df in longer.items()}
+    cube, longer_cube = PriceCube.from_frames(data), PriceCube.from_frames(longer)
+    end = cube.date_at(80)
+
+    assert data_fingerprint(cube, end) == data_fingerprint(longer_cube, end)
+    assert data_fingerprint(cube) != data_fingerprint(longer_cube)
+
+
+def test_successive_halving_extends_only_survivors():
+    data = make_data(periods=150)
+    registry = make_registry()
+    optimizer = WeightOptimizer(registry, BacktestEngine(registry))
+
+    full = optimizer.optimize_grid_search(data, steps=4)
+    halved = optimizer.optimize_grid_search(data, steps=4, successive_halving=True, eta=3, min_fraction=1 / 9)
+
+    fidelities = [h["fidelity"] for h in halved.iteration_history]
+    assert fidelities.count(1.0) == 2  # 15 candidates -> 5 -> 2
+    assert halved.evaluation_cost["fraction"] < 0.6
+    assert halved.evaluation_cost["full_bars"] == 15 * 150
+
+    # Survivors resume their engines, so their full-period scores match full runs
+    full_scores = {tuple(h["weights"].values()): h["performance"] for h in full.iteration_history}
+    for h in halved.iteration_history:
+        if h["fidelity"] == 1.0:
+            assert h["performance"] == pytest.approx(full_scores[tuple(h["weights"].values())])
+    assert halved.weights in [h["weights"] for h in halved.iteration_history if h["fidelity"] == 1.0]
+
+
+def test_successive_halving_uses_the_fitness_cache(monkeypatch):
+    from src.optimization import FitnessCache
+    from src.optimization.weight_optimizer import EvaluationContext
+
+    data = make_data(periods=150)
+    registry = make_registry()
+    optimizer = WeightOptimizer(registry, BacktestEngine(registry), fitness_cache=FitnessCache())
+
+    # Full-period scores of the survivors are cached...
+    halved = optimizer.optimize_grid_search(data, steps=4, successive_halving=True)
+    survivors = {tuple(h["weights"].values()) for h in halved.iteration_history if h["fidelity"] == 1.0}
+    full = optimizer.optimize_grid_search(data, steps=4)
+    assert optimizer.fitness_cache.hits == len(survivors)
+
+    # ...and cached candidates skip the rungs altogether
+    monkeypatch.setattr(EvaluationContext, "begin", lambda *a: pytest.fail("simulated again"))
+    again = optimizer.optimize_grid_search(data, steps=4, successive_halving=True)
+    assert all(h["fidelity"] == 1.0 for h in again.iteration_history)
+    assert again.weights == full.weights
+
+
+def test_later_optimizations_see_registry_and_parameter_changes():
+    from src.strategy_framework import RSIStrategy
+
+    data = make_data(periods=150)
+    registry = make_registry()
+    backtester = BacktestEngine(registry)
+    optimizer = WeightOptimizer(registry, backtester)
+    first = optimizer._evaluation_context(data)
+
+    class FastRSI(RSIStrategy):
+        pass
+
+    registry.register(FastRSI(period=7), weight=0.2)
+    backtester.parameters.initial_capital *= 2
+    second = optimizer._evaluation_context(data)
+
+    assert second.cube is first.cube
+    assert len(second.strategies) == len(first.strategies) + 1
+    assert second.cache_key() != first.cache_key()
+    result = optimizer.optimize_random_search(data, iterations=2)
+    assert all(len(h["weights"]) == len(second.strategies) for h in result.iteration_history)